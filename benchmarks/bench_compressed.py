@@ -0,0 +1,98 @@
+"""Measure decompression throughput of the file_utils readers per codec.
+
+Usage:
+    python benchmarks/bench_compressed.py --size-mb 32
+    python benchmarks/bench_compressed.py --size-mb 8 --files 8 --workers 4
+"""
+
+import argparse
+import bz2
+import gzip
+import logging
+import lzma
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from my_project.file_utils import (  # noqa: E402
+    iter_file_chunks,
+    iter_file_lines,
+    read_file_content,
+    read_many_files,
+)
+
+CODECS = {
+    "none": lambda data: data,
+    "gzip": lambda data: gzip.compress(data, compresslevel=6),
+    "bz2": lambda data: bz2.compress(data, compresslevel=9),
+    "xz": lambda data: lzma.compress(data, preset=6),
+}
+
+
+def timed(function):
+    """Return the wall time of one call of ``function``."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark and print MiB/s of decompressed text per reader."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=32, help="Text per file")
+    parser.add_argument("--files", type=int, default=4, help="Files for bulk reads")
+    parser.add_argument("--workers", type=int, default=None, help="Bulk workers")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    line_count = args.size_mb * 1024 * 1024 // 48
+    data = b"".join(
+        b"%010d level=%d user=%06x took %5dms\n" % (i, i % 5, i * 7919, i % 997)
+        for i in range(line_count)
+    )
+    mib = len(data) / (1024 * 1024)
+
+    print(f"{mib:.0f} MiB of text per file; MiB/s of decompressed text")
+    columns = ("ratio", "whole", "chunks", "lines", "threads", "procs")
+    print("codec  " + " ".join(f"{column:>8s}" for column in columns))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, compress in CODECS.items():
+            payload = compress(data)
+            paths = []
+            for i in range(args.files):
+                path = os.path.join(tmpdir, f"{name}{i}")
+                with open(path, "wb") as f:
+                    f.write(payload)
+                paths.append(path)
+
+            path = paths[0]
+            whole = timed(lambda: read_file_content(path, decompress=True))
+            chunks = timed(
+                lambda: sum(1 for _ in iter_file_chunks(path, decompress=True))
+            )
+            lines = timed(
+                lambda: sum(1 for _ in iter_file_lines(path, decompress=True))
+            )
+            bulk = {}
+            for processes in (False, True):
+                bulk[processes] = timed(
+                    lambda: read_many_files(
+                        paths, args.workers, decompress=True, processes=processes
+                    )
+                )
+
+            print(
+                f"{name:6s} {len(data) / len(payload):8.1f} {mib / whole:8.0f}"
+                f" {mib / chunks:8.0f} {mib / lines:8.0f}"
+                f" {mib * args.files / bulk[False]:8.0f}"
+                f" {mib * args.files / bulk[True]:8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
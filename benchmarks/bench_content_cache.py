@@ -0,0 +1,55 @@
+"""Compare uncached reads against ContentCache hits (stat-only revalidation).
+
+Usage:
+    python benchmarks/bench_content_cache.py --size-kb 64 --reads 20000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from my_project.content_cache import ContentCache  # noqa: E402
+from my_project.file_utils import read_file_content  # noqa: E402
+
+
+def main() -> None:
+    """Run the benchmark and print per-read latencies."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-kb", type=int, default=64, help="File size in KiB")
+    parser.add_argument("--reads", type=int, default=20_000, help="Reads per mode")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "template.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("x" * (args.size_kb * 1024))
+
+        start = time.perf_counter()
+        for _ in range(args.reads):
+            read_file_content(path)
+        uncached = (time.perf_counter() - start) / args.reads
+
+        cache = ContentCache()
+        cache.read_file_content(path)
+        start = time.perf_counter()
+        for _ in range(args.reads):
+            cache.read_file_content(path)
+        cached = (time.perf_counter() - start) / args.reads
+
+    print(f"file: {args.size_kb} KiB, {args.reads} reads per mode")
+    print(f"read_file_content        {uncached * 1e6:8.2f} us/read")
+    print(f"ContentCache (hit)       {cached * 1e6:8.2f} us/read")
+    print(f"speedup                  {uncached / cached:8.2f}x")
+    print(cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare find_duplicate_files with hashing every file read in full.
+
+Usage:
+    python benchmarks/bench_duplicates.py --files 400 --size-kb 256 --dupes 20
+    python benchmarks/bench_duplicates.py --worst-case
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from my_project.file_utils import find_duplicate_files  # noqa: E402
+from my_project.file_utils import read_file_content  # noqa: E402
+
+
+def naive_duplicates(paths):
+    """Group files by the digest of their full decoded content."""
+    groups = {}
+    for path in paths:
+        digest = hashlib.sha256(read_file_content(path).encode("utf-8")).hexdigest()
+        groups.setdefault(digest, []).append(path)
+    return [sorted(group) for group in groups.values() if len(group) > 1]
+
+
+def main() -> None:
+    """Run the benchmark and print the time of each approach."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=400, help="Distinct files")
+    parser.add_argument("--size-kb", type=int, default=256, help="File size in KiB")
+    parser.add_argument("--dupes", type=int, default=20, help="Files to duplicate")
+    parser.add_argument("--workers", type=int, default=None, help="Hashing threads")
+    parser.add_argument(
+        "--worst-case",
+        action="store_true",
+        help="Give every file the same size and edges so all need a full hash",
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for i in range(args.files):
+            # In the worst case only the middle differs, so neither the size
+            # nor the partial-hash pass can rule a file out.
+            size = args.size_kb * 1024
+            if args.worst_case:
+                body = bytearray(b"a" * size)
+            else:
+                body = bytearray(os.urandom(size // 2).hex().encode("ascii"))
+            body[len(body) // 2 : len(body) // 2 + 8] = b"%08d" % i
+            path = os.path.join(tmpdir, f"f{i}.txt")
+            with open(path, "wb") as f:
+                f.write(body)
+            paths.append(path)
+            if i < args.dupes:
+                copy = os.path.join(tmpdir, f"f{i}.copy.txt")
+                with open(copy, "wb") as f:
+                    f.write(body)
+                paths.append(copy)
+
+        start = time.perf_counter()
+        expected = sorted(naive_duplicates(paths))
+        naive = time.perf_counter() - start
+
+        for algorithm in ("sha256", "crc32"):
+            start = time.perf_counter()
+            groups = find_duplicate_files(paths, algorithm, max_workers=args.workers)
+            elapsed = time.perf_counter() - start
+            assert groups == expected
+            print(f"find_duplicate_files {algorithm:7s} {elapsed * 1e3:9.1f} ms")
+
+    print(f"naive full read + sha256     {naive * 1e3:9.1f} ms")
+    print(f"{len(paths)} files x {args.size_kb} KiB, {len(expected)} duplicate groups")
+
+
+if __name__ == "__main__":
+    main()
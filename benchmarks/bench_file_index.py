@@ -0,0 +1,64 @@
+"""Compare a full FileIndex build against an incremental re-index.
+
+Usage:
+    python benchmarks/bench_file_index.py --files 2000 --size-kb 16 --changed 20
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from my_project.file_index import FileIndex  # noqa: E402
+
+
+def main() -> None:
+    """Run the benchmark and print the time of each pass."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000, help="Files in the tree")
+    parser.add_argument("--size-kb", type=int, default=16, help="File size in KiB")
+    parser.add_argument("--changed", type=int, default=20, help="Files to modify")
+    parser.add_argument("--workers", type=int, default=None, help="Hashing threads")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = os.path.join(tmpdir, "tree")
+        for i in range(args.files):
+            directory = os.path.join(root, f"d{i % 32:02d}")
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, f"f{i}.txt"), "wb") as f:
+                f.write(os.urandom(args.size_kb * 1024))
+
+        index_path = os.path.join(tmpdir, "index.db")
+        with FileIndex(root, index_path) as index:
+            start = time.perf_counter()
+            index.update(max_workers=args.workers)
+            full = time.perf_counter() - start
+
+            start = time.perf_counter()
+            index.update(max_workers=args.workers)
+            noop = time.perf_counter() - start
+
+            for i in range(args.changed):
+                path = os.path.join(root, f"d{i % 32:02d}", f"f{i}.txt")
+                with open(path, "ab") as f:
+                    f.write(b"changed")
+            start = time.perf_counter()
+            update = index.update(max_workers=args.workers)
+            incremental = time.perf_counter() - start
+
+    print(f"tree: {args.files} files x {args.size_kb} KiB")
+    print(f"full build               {full * 1e3:9.1f} ms")
+    print(f"re-index, no changes     {noop * 1e3:9.1f} ms")
+    print(f"re-index, {len(update.modified):4d} modified  {incremental * 1e3:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
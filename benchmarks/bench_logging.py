@@ -0,0 +1,72 @@
+"""Measure read_file_content calls/sec under different logging setups.
+
+Records are written to a temporary file so terminal speed does not skew the
+results.
+
+Usage:
+    python benchmarks/bench_logging.py --calls 20000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from my_project.file_utils import read_file_content  # noqa: E402
+from my_project.logging_utils import (  # noqa: E402
+    configure_hot_path_logging,
+    configure_logging,
+    stop_logging,
+)
+
+
+def calls_per_second(path: str, calls: int) -> float:
+    """Time ``calls`` reads of ``path`` and return the rate."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        read_file_content(path)
+    return calls / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Run each logging mode and print its throughput."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20_000, help="Calls per mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "input.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("x" * 256)
+
+        results = {}
+        with open(os.path.join(tmpdir, "log.txt"), "w", encoding="utf-8") as log:
+            configure_logging(stream=log, force=True)
+            results["sync handler"] = calls_per_second(path, args.calls)
+
+            configure_logging(stream=log, non_blocking=True, force=True)
+            results["queue handler"] = calls_per_second(path, args.calls)
+            stop_logging()
+
+            configure_logging(stream=log, force=True)
+            configure_hot_path_logging(sample_every=100)
+            results["sync, 1% sampled"] = calls_per_second(path, args.calls)
+
+            configure_hot_path_logging(level=logging.WARNING)
+            results["hot path silenced"] = calls_per_second(path, args.calls)
+            configure_hot_path_logging()
+
+            logging.disable(logging.CRITICAL)
+            results["logging disabled"] = calls_per_second(path, args.calls)
+
+    for mode, rate in results.items():
+        print(f"{mode:<20} {rate:>10,.0f} calls/s")
+
+
+if __name__ == "__main__":
+    main()
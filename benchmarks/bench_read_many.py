@@ -0,0 +1,61 @@
+"""Compare a serial read_file_content loop against read_many_files.
+
+Usage:
+    python benchmarks/bench_read_many.py --files 10000 --workers 16
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from my_project.file_utils import read_file_content, read_many_files  # noqa: E402
+
+
+def make_files(directory: str, count: int, size: int) -> list:
+    """Create ``count`` files of ``size`` bytes and return their paths."""
+    payload = "x" * size
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"file_{i:06d}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        paths.append(path)
+    return paths
+
+
+def main() -> None:
+    """Run the benchmark and print timings for both approaches."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=10_000, help="Number of files")
+    parser.add_argument("--size", type=int, default=512, help="Bytes per file")
+    parser.add_argument("--workers", type=int, default=None, help="Thread count")
+    args = parser.parse_args()
+
+    # Per-file log records would dominate both timings.
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = make_files(tmpdir, args.files, args.size)
+
+        start = time.perf_counter()
+        serial = [read_file_content(path) for path in paths]
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = read_many_files(paths, max_workers=args.workers)
+        bulk_time = time.perf_counter() - start
+
+    assert [r.content for r in results] == serial
+    print(f"files: {args.files} x {args.size} B")
+    print(f"serial loop     {serial_time:8.3f} s")
+    print(f"read_many_files {bulk_time:8.3f} s  ({serial_time / bulk_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compare search_files with a read-decode-search loop over the same tree.
+
+Usage:
+    python benchmarks/bench_search.py --files 64 --size-mb 4
+    python benchmarks/bench_search.py --regex
+"""
+
+import argparse
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from my_project.file_utils import read_file_content, search_files  # noqa: E402
+
+NEEDLE = "needle-4242"
+
+
+def naive_search(paths, pattern):
+    """Decode every file with read_file_content and search line by line."""
+    matches = 0
+    for path in paths:
+        for line in read_file_content(path).splitlines():
+            if isinstance(pattern, str):
+                matches += line.count(pattern)
+            else:
+                matches += len(pattern.findall(line))
+    return matches
+
+
+def main() -> None:
+    """Run the benchmark and print the time of each approach."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=64, help="Files in the tree")
+    parser.add_argument("--size-mb", type=int, default=4, help="File size in MiB")
+    parser.add_argument("--workers", type=int, default=None, help="Search workers")
+    parser.add_argument("--regex", action="store_true", help="Search a regex")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        line_count = args.size_mb * 1024 * 1024 // 40
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(tmpdir, f"f{i}.log")
+            with open(path, "w", encoding="utf-8") as f:
+                for n in range(line_count):
+                    word = NEEDLE if n % 100_000 == i else "haystack"
+                    f.write(f"{n:010d} {word} value={n % 977:05d}\n")
+            paths.append(path)
+
+        if args.regex:
+            str_pattern = re.compile(r"needle-\d+")
+            bytes_pattern = re.compile(rb"needle-\d+")
+        else:
+            str_pattern, bytes_pattern = NEEDLE, NEEDLE.encode("utf-8")
+
+        start = time.perf_counter()
+        expected = naive_search(paths, str_pattern)
+        naive = time.perf_counter() - start
+        print(f"{'read + decode + search':27s} {naive * 1e3:9.1f} ms")
+
+        for processes in (False, True):
+            start = time.perf_counter()
+            found = sum(
+                1
+                for _ in search_files(
+                    bytes_pattern, tmpdir, args.workers, processes=processes
+                )
+            )
+            elapsed = time.perf_counter() - start
+            assert found == expected, (found, expected)
+            label = "search_files, " + ("processes" if processes else "threads")
+            print(f"{label:27s} {elapsed * 1e3:9.1f} ms")
+
+    print(f"{args.files} files x {args.size_mb} MiB, {expected} matches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Compare peak RSS of read_file_content against the streaming readers.
+
+Each reader runs in a fresh interpreter so that its peak resident set size is
+measured in isolation.
+
+Usage:
+    python benchmarks/bench_streaming_memory.py --size-mb 512
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC_PATH = Path(__file__).resolve().parent.parent / "src"
+
+READERS = {
+    "read_file_content": "n = len(file_utils.read_file_content(path))",
+    "iter_file_chunks": "n = sum(map(len, file_utils.iter_file_chunks(path)))",
+    "iter_file_lines": "n = sum(map(len, file_utils.iter_file_lines(path)))",
+}
+
+CHILD_TEMPLATE = """
+import resource, sys
+sys.path.insert(0, {src!r})
+from my_project import file_utils
+path = {path!r}
+{body}
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def write_sample_file(path: str, size_mb: int) -> None:
+    """Write ``size_mb`` MiB of multibyte UTF-8 text lines to ``path``."""
+    line = ("Hello, 世界! " * 8 + "\n").encode("utf-8")
+    block = line * ((1 << 20) // len(line) + 1)
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(block[: 1 << 20])
+
+
+def measure_peak_rss_kb(path: str, body: str) -> int:
+    """Run ``body`` in a child interpreter and return its peak RSS in KiB."""
+    code = CHILD_TEMPLATE.format(src=str(SRC_PATH), path=path, body=body)
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return int(output.split()[-1])
+
+
+def main() -> None:
+    """Run the benchmark and print a peak-RSS table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=256, help="File size in MiB")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "sample.txt")
+        write_sample_file(path, args.size_mb)
+        baseline = measure_peak_rss_kb(path, "n = 0")
+
+        print(f"file size: {args.size_mb} MiB, interpreter baseline: {baseline} KiB")
+        for name, body in READERS.items():
+            peak = measure_peak_rss_kb(path, body)
+            print(f"{name:<20} peak RSS {peak:>10} KiB  (+{peak - baseline} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Local load generator for ``my-project serve``.
+
+Opens several connections, keeps a fixed number of pipelined requests in
+flight on each, and reports throughput and p50/p99 latency. By default it
+starts its own server on a free port.
+
+Usage:
+    python benchmarks/load_generator.py --connections 8 --requests 20000
+    python benchmarks/load_generator.py --port 8765 --no-spawn --op read --path f
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+SRC_PATH = Path(__file__).resolve().parent.parent / "src"
+
+
+def free_port() -> int:
+    """Return a TCP port that is currently free on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def open_connection(args: argparse.Namespace):
+    """Connect to the server, retrying while it starts up."""
+    for _ in range(100):
+        try:
+            if args.unix:
+                return await asyncio.open_unix_connection(args.unix)
+            return await asyncio.open_connection(args.host, args.port)
+        except OSError:
+            await asyncio.sleep(0.05)
+    raise RuntimeError("Server did not come up")
+
+
+async def wait_until_ready(args: argparse.Namespace) -> None:
+    """Block until the server accepts connections."""
+    _, writer = await open_connection(args)
+    writer.close()
+
+
+async def run_connection(
+    args: argparse.Namespace, count: int, latencies: List[float]
+) -> None:
+    """Send ``count`` requests with ``args.pipeline`` of them in flight."""
+    reader, writer = await open_connection(args)
+    if args.op == "read":
+        payload = {"op": "read", "path": args.path}
+    else:
+        payload = {"op": "greet", "name": "LoadTest"}
+    line = json.dumps(payload).encode() + b"\n"
+
+    sent_at: List[float] = []
+    sent = received = 0
+    while received < count:
+        while sent < count and sent - received < args.pipeline:
+            writer.write(line)
+            sent_at.append(time.perf_counter())
+            sent += 1
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - sent_at[received])
+        if not response["ok"]:
+            raise RuntimeError(f"Request failed: {response['error']}")
+        received += 1
+    writer.close()
+
+
+async def run_load(args: argparse.Namespace) -> List[float]:
+    """Run every connection concurrently and return all latencies."""
+    latencies: List[float] = []
+    per_connection = args.requests // args.connections
+    await asyncio.gather(
+        *(
+            run_connection(args, per_connection, latencies)
+            for _ in range(args.connections)
+        )
+    )
+    return latencies
+
+
+def start_server(args: argparse.Namespace) -> Optional[subprocess.Popen]:
+    """Start ``my-project serve`` in a subprocess unless --no-spawn is given."""
+    if args.no_spawn:
+        return None
+    # Serve the directory of the read target, wherever this runs from.
+    args.path = str(Path(args.path).resolve())
+    command = [sys.executable, "-m", "my_project.main", "serve"]
+    command += ["--root", str(Path(args.path).parent)]
+    if args.unix:
+        command += ["--unix", args.unix]
+    else:
+        args.port = args.port or free_port()
+        command += ["--host", args.host, "--port", str(args.port)]
+    env = dict(os.environ, PYTHONPATH=str(SRC_PATH))
+    return subprocess.Popen(command, env=env, stderr=subprocess.DEVNULL)
+
+
+def main() -> None:
+    """Parse options, run the load and print the summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--unix", metavar="PATH")
+    parser.add_argument("--no-spawn", action="store_true")
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--pipeline", type=int, default=16)
+    parser.add_argument("--op", choices=["greet", "read"], default="greet")
+    parser.add_argument("--path", default=__file__, help="File for --op read")
+    args = parser.parse_args()
+
+    server = start_server(args)
+    try:
+        asyncio.run(wait_until_ready(args))
+        start = time.perf_counter()
+        latencies = asyncio.run(run_load(args))
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"requests: {len(latencies)} over {args.connections} connections")
+    print(f"pipeline depth: {args.pipeline}, op: {args.op}")
+    print(f"throughput: {len(latencies) / elapsed:,.0f} req/s")
+    print(f"p50 latency: {quantiles[49] * 1e3:.3f} ms")
+    print(f"p99 latency: {quantiles[98] * 1e3:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Benchmark suite with stored baselines and regression gating.
+
+Runs each case several times, writes the median and minimum per-operation
+times as JSON, and optionally compares them with a stored baseline. The
+exit status is 1 if any case is slower than its baseline by more than the
+threshold, so the script can gate CI.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --large-gb 2 --only read_large
+
+Baselines are machine specific: regenerate them with --save-baseline on the
+machine that runs the comparison.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from my_project.file_utils import read_file_content  # noqa: E402
+from my_project.main import sample_function, sample_function_batch  # noqa: E402
+
+#: Default allowed slowdown relative to the baseline (0.25 = 25%).
+DEFAULT_THRESHOLD = 0.25
+
+#: A benchmark case: (setup run before every round, operation timed, ops/round).
+Case = Tuple[Callable[[], None], Callable[[], object], int]
+
+
+def write_file(path: str, size: int) -> str:
+    """Write ``size`` bytes of ASCII text to ``path`` in 1 MiB blocks."""
+    block = (b"x" * 127 + b"\n") * 8192
+    with open(path, "wb") as f:
+        remaining = size
+        while remaining > 0:
+            f.write(block[: min(remaining, len(block))])
+            remaining -= len(block)
+    return path
+
+
+def drop_page_cache(path: str) -> None:
+    """Ask the kernel to evict ``path`` from the page cache (best effort)."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def no_setup() -> None:
+    """Setup step for warm cases."""
+
+
+def build_cases(workdir: str, large_gb: float) -> Dict[str, Case]:
+    """Create the input files and return every benchmark case by name."""
+    small = write_file(os.path.join(workdir, "small.txt"), 4 * 1024)
+    medium = write_file(os.path.join(workdir, "medium.txt"), 16 * 1024 * 1024)
+    names = [f"name{i}" for i in range(100_000)]
+
+    cases: Dict[str, Case] = {
+        "read_small_warm": (no_setup, lambda: read_file_content(small), 1),
+        "read_medium_warm": (no_setup, lambda: read_file_content(medium), 1),
+        "read_medium_cold": (
+            lambda: drop_page_cache(medium),
+            lambda: read_file_content(medium),
+            1,
+        ),
+        "greet_single": (
+            no_setup,
+            lambda: [sample_function(name) for name in names],
+            len(names),
+        ),
+        "greet_batch": (no_setup, lambda: sample_function_batch(names), len(names)),
+    }
+    if large_gb > 0:
+        large = write_file(os.path.join(workdir, "large.txt"), int(large_gb * 2**30))
+        cases["read_large_warm"] = (no_setup, lambda: read_file_content(large), 1)
+        cases["read_large_cold"] = (
+            lambda: drop_page_cache(large),
+            lambda: read_file_content(large),
+            1,
+        )
+    return cases
+
+
+def run_case(case: Case, rounds: int) -> Dict[str, float]:
+    """Time ``rounds`` runs of a case and summarize per-operation seconds."""
+    setup, operation, ops = case
+    timings: List[float] = []
+    for _ in range(rounds):
+        setup()
+        start = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - start) / ops)
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "rounds": rounds,
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """Return a message for every case that regressed beyond ``threshold``."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        ratio = result["median_s"] / reference["median_s"]
+        status = "REGRESSION" if ratio > 1 + threshold else "ok"
+        print(f"{name:<20} {ratio:6.2f}x baseline  {status}")
+        if status != "ok":
+            regressions.append(f"{name} is {ratio:.2f}x its baseline median")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the suite and return the process exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=7, help="Runs per case")
+    parser.add_argument("--only", nargs="*", help="Run only cases with these prefixes")
+    parser.add_argument(
+        "--large-gb", type=float, default=0, help="Add multi-GB cases of this size"
+    )
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--baseline", help="Compare against this results JSON")
+    parser.add_argument("--save-baseline", help="Write results as a new baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed median slowdown, e.g. 0.25 for 25%% (default)",
+    )
+    args = parser.parse_args(argv)
+
+    # Per-call log records would be measured along with the work.
+    logging.disable(logging.CRITICAL)
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, case in build_cases(workdir, args.large_gb).items():
+            if args.only and not any(name.startswith(p) for p in args.only):
+                continue
+            results[name] = run_case(case, args.rounds)
+            print(f"{name:<20} median {results[name]['median_s'] * 1e6:12.2f} us/op")
+
+    document = {
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "benchmarks": results,
+    }
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["benchmarks"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\n".join(["", "Performance regressions:"] + regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,6 @@ import argparse
 import logging
 import sys
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
-
 def sample_function(name: str) -> str:
     """
     Sample function to demonstrate modularity.
@@ -35,6 +29,10 @@ def main():
     """
     Main function to run the script.
     """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
     args = parse_args()
 
     try:
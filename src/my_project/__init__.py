@@ -2,3 +2,32 @@
 
 __version__ = "0.1.0"
 __author__ = "Your Name <you@example.com>"
+
+# Submodules are imported on first attribute access (PEP 562) so that
+# ``import my_project`` stays cheap for short-lived command-line runs.
+_SUBMODULES = frozenset(
+    {
+        "content_cache",
+        "disk_cache",
+        "file_index",
+        "file_utils",
+        "logging_utils",
+        "main",
+        "metrics",
+        "pipeline",
+        "profiling",
+        "server",
+    }
+)
+
+
+def __getattr__(name: str) -> object:
+    if name in _SUBMODULES:
+        import importlib
+
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | _SUBMODULES)
@@ -0,0 +1,175 @@
+"""In-process LRU cache for file contents with stat-based invalidation."""
+
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from my_project.file_utils import read_file_content
+
+logger = logging.getLogger(__name__)
+
+#: Default memory budget of a ContentCache, in bytes.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+#: Stat fields that identify one version of a file: (mtime_ns, size, inode).
+Signature = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Point-in-time counters of a ContentCache.
+
+    Attributes:
+        hits (int): Lookups served from the cache.
+        misses (int): Lookups that had to read the file.
+        evictions (int): Entries dropped to stay within the byte budget.
+        entries (int): Entries currently cached.
+        current_bytes (int): Memory charged to the cached entries.
+        max_bytes (int): The byte budget.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    current_bytes: int
+    max_bytes: int
+
+
+def _signature(st: os.stat_result) -> Signature:
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class ContentCache:
+    """
+    Opt-in, thread-safe LRU cache in front of read_file_content.
+
+    Every lookup stats the file and compares ``(st_mtime_ns, st_size,
+    st_ino)`` with the signature stored alongside the cached content, so a
+    rewritten or replaced file is read again. The signature is taken before
+    the file is read: if the file changes during the read, the next lookup
+    sees a different signature and reloads, so stale content is never served.
+    Entries are evicted least recently used first once the cached strings
+    exceed ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Creates an empty cache.
+
+        Args:
+            max_bytes (int): Memory budget for cached contents, in bytes.
+
+        Raises:
+            ValueError: If max_bytes is negative.
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Signature, str, int]]" = OrderedDict()
+        self._current_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def read_file_content(self, filepath: str) -> Optional[str]:
+        """
+        Returns the content of a file, reading it only if it changed.
+
+        Args:
+            filepath (str): The path to the file to be read.
+
+        Returns:
+            Optional[str]: The content of the file as a string, or None if an
+                unexpected error occurs.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            PermissionError: If the user does not have permissions to read the file.
+            IsADirectoryError: If the filepath points to a directory instead of a file.
+            UnicodeDecodeError: If the file is not UTF-8 encoded or contains invalid characters.
+        """
+        key = os.path.abspath(filepath)
+        try:
+            signature: Optional[Signature] = _signature(os.stat(key))
+        except OSError:
+            # Let read_file_content log and raise the error consistently.
+            signature = None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+            if entry is not None:
+                self._discard(key)
+
+        content = read_file_content(filepath)
+        if signature is not None and content is not None:
+            self._store(key, signature, content)
+        return content
+
+    def _store(self, key: str, signature: Signature, content: str) -> None:
+        size = sys.getsizeof(content)
+        with self._lock:
+            self._discard(key)
+            if size > self._max_bytes:
+                logger.debug("Not caching %s: %d bytes exceeds budget", key, size)
+                return
+            self._entries[key] = (signature, content, size)
+            self._current_bytes += size
+            while self._current_bytes > self._max_bytes:
+                evicted, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_size
+                self._evictions += 1
+                logger.debug("Evicted cached file: %s", evicted)
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._current_bytes -= entry[2]
+
+    def invalidate(self, filepath: str) -> None:
+        """
+        Drops the cached content of one file, if any.
+
+        Args:
+            filepath (str): The path whose entry should be removed.
+        """
+        with self._lock:
+            self._discard(os.path.abspath(filepath))
+
+    def clear(self) -> None:
+        """Drops every cached entry. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def stats(self) -> CacheStats:
+        """
+        Returns a snapshot of the cache counters.
+
+        Returns:
+            CacheStats: The current counters.
+        """
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                current_bytes=self._current_bytes,
+                max_bytes=self._max_bytes,
+            )
@@ -0,0 +1,384 @@
+"""Persistent, cross-process cache of decoded file contents.
+
+Unlike ContentCache, which lives and dies with one process, a DiskCache
+keeps its entries in a local directory so later processes start warm::
+
+    cache = DiskCache()
+    text = cache.read_file_content("reference/data.csv.gz")
+
+The directory holds two kinds of files:
+
+* ``blobs/<xx>/<digest>``: the UTF-8 text of a file exactly as
+  read_file_content returns it (decompressed, newlines translated), named
+  by its SHA-256. Identical contents share one blob, and a blob can be
+  memory-mapped and used without decoding or copying it.
+* ``keys/<xx>/<digest>``: one small file per (absolute path, decompress
+  flag), named by the SHA-256 of that pair and holding the stat signature
+  the content was read with and the digest of the matching blob. A key
+  whose signature no longer matches the file is a miss, so stale content is
+  never served, and storing the new content replaces the key in place, so
+  touching or rewriting a file does not leave old keys behind.
+
+Every file is written to a temporary name in its final directory and moved
+into place with os.replace(), so concurrent writers, in this process or
+others, never expose a partial file; the last rename wins, and both
+contents are correct for the key. Temporary files that a crashed writer
+leaves behind are removed once they are an hour old. A hit sets the blob's
+modification time to now, which makes the blobs' mtimes a
+least-recently-used order that all processes share. Once the blobs exceed
+``max_bytes`` the oldest are removed, along with the keys that point at
+them. On POSIX systems a blob removed while another process has it mapped
+stays readable until that mapping is closed.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Iterator, List, Optional, Set, Tuple
+
+from my_project.content_cache import CacheStats
+from my_project.file_utils import MappedFile, read_file_content
+
+logger = logging.getLogger(__name__)
+
+#: Default disk budget of a DiskCache, in bytes.
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+#: Prefix of files still being written; never treated as entries.
+_TEMP_PREFIX = ".tmp-"
+
+#: Seconds after which a temporary file is assumed left by a crashed writer.
+_TEMP_MAX_AGE = 60 * 60
+
+
+def default_cache_dir() -> str:
+    """
+    Returns the default cache directory.
+
+    Returns:
+        str: ``$XDG_CACHE_HOME/my_project``, or ``~/.cache/my_project`` when
+            XDG_CACHE_HOME is not set.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "my_project")
+
+
+def _fan_out(directory: str, digest: str) -> str:
+    return os.path.join(directory, digest[:2], digest)
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Writes ``data`` to ``path`` so readers see either nothing or all of it."""
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=parent, prefix=_TEMP_PREFIX)
+    try:
+        with open(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _iter_entries(directory: str, temporary: bool = False) -> Iterator[os.DirEntry]:
+    """Yields the entry (or temporary) files below a fanned-out directory."""
+    try:
+        buckets = list(os.scandir(directory))
+    except FileNotFoundError:
+        return
+    for bucket in buckets:
+        if not bucket.is_dir(follow_symlinks=False):
+            continue
+        try:
+            with os.scandir(bucket.path) as entries:
+                for entry in entries:
+                    if entry.name.startswith(_TEMP_PREFIX) == temporary:
+                        yield entry
+        except FileNotFoundError:  # Removed by another process.
+            continue
+
+
+class DiskCache:
+    """
+    Thread- and process-safe, size-bounded cache of file contents on disk.
+
+    Lookups stat the source file, so the cost of a hit is a stat, two small
+    file opens and a memory mapping instead of reading, decompressing and
+    newline-translating the source. The size of the blob directory is
+    tracked per process and re-measured whenever it seems to exceed
+    ``max_bytes``, so writes from other processes can overshoot the budget
+    until this process next stores an entry. The blob stored last is never
+    evicted by its own store, so an entry larger than the budget is still
+    usable until the next eviction.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        decompress: bool = False,
+    ) -> None:
+        """
+        Opens, creating it if needed, a cache directory.
+
+        Args:
+            directory (Optional[str]): The cache directory, or None for
+                default_cache_dir().
+            max_bytes (int): Disk budget for cached contents, in bytes.
+            decompress (bool): Transparently decompress gzip, bz2 and xz
+                sources, as read_file_content does; the decompressed text is
+                what gets cached.
+
+        Raises:
+            ValueError: If max_bytes is negative.
+            OSError: If the directory cannot be created.
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self.directory = os.path.abspath(directory or default_cache_dir())
+        self.decompress = decompress
+        self._max_bytes = max_bytes
+        self._blobs = os.path.join(self.directory, "blobs")
+        self._keys = os.path.join(self.directory, "keys")
+        os.makedirs(self._blobs, exist_ok=True)
+        os.makedirs(self._keys, exist_ok=True)
+        self._approx_bytes: Optional[int] = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def _key_path(self, path: str) -> str:
+        key = f"{path}\0{'1' if self.decompress else '0'}"
+        digest = hashlib.sha256(key.encode("utf-8", "surrogateescape")).hexdigest()
+        return _fan_out(self._keys, digest)
+
+    def _lookup(self, key_path: str, signature: str) -> Optional[MappedFile]:
+        """Maps the blob a key points at, or returns None on a miss."""
+        try:
+            with open(key_path, "rb") as f:
+                stored, _, digest = f.read().decode("ascii").rpartition(" ")
+            if stored != signature:
+                return None  # The file changed since the key was written.
+            blob_path = _fan_out(self._blobs, digest)
+            # Touching the blob both records the use for LRU eviction and
+            # checks that it was not evicted since the key was written.
+            os.utime(blob_path)
+        except FileNotFoundError:
+            return None
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning("Ignoring unreadable cache key %s: %s", key_path, e)
+            return None
+        try:
+            return MappedFile(blob_path)
+        except FileNotFoundError:  # Evicted between the touch and the map.
+            return None
+
+    def _load(self, filepath: str) -> Tuple[Optional[MappedFile], Optional[str]]:
+        """
+        Returns the mapped blob for ``filepath``, reading and storing it first
+        on a miss. On a miss the freshly read text is returned as well.
+        """
+        path = os.path.abspath(filepath)
+        key_path = self._key_path(path)
+        try:
+            st = os.stat(path)
+            signature: Optional[str] = f"{st.st_mtime_ns} {st.st_size} {st.st_ino}"
+        except OSError:
+            # Let read_file_content log and raise the error consistently.
+            signature = None
+
+        mapped = self._lookup(key_path, signature) if signature is not None else None
+        with self._lock:
+            if mapped is not None:
+                self._hits += 1
+            else:
+                self._misses += 1
+        if mapped is not None:
+            return mapped, None
+
+        # The signature was taken before the read: if the file changes while
+        # it is read, the next lookup has a different key and reads it again.
+        content = read_file_content(filepath, decompress=self.decompress)
+        if signature is None or content is None:
+            return None, content
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = _fan_out(self._blobs, digest)
+        try:
+            self._store(key_path, signature, blob_path, data)
+            return MappedFile(blob_path), content
+        except OSError as e:
+            logger.warning("Could not cache %s: %s", filepath, e)
+            return None, content
+
+    def _store(
+        self, key_path: str, signature: str, blob_path: str, data: bytes
+    ) -> None:
+        try:
+            os.utime(blob_path)
+            stored = 0
+        except FileNotFoundError:
+            _write_atomic(blob_path, data)
+            stored = len(data)
+        digest = os.path.basename(blob_path)
+        _write_atomic(key_path, f"{signature} {digest}".encode("ascii"))
+
+        with self._lock:
+            if self._approx_bytes is None:
+                self._sweep_temp_files()
+                self._approx_bytes = sum(size for _, size, _ in self._scan_blobs())
+            else:
+                self._approx_bytes += stored
+            if self._approx_bytes > self._max_bytes:
+                self._evict(keep=blob_path)
+
+    def _scan_blobs(self) -> List[Tuple[str, int, int]]:
+        """Returns ``(path, size, mtime_ns)`` of every blob."""
+        blobs = []
+        for entry in _iter_entries(self._blobs):
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            blobs.append((entry.path, st.st_size, st.st_mtime_ns))
+        return blobs
+
+    def _evict(self, keep: str) -> None:
+        """Removes least recently used blobs until they fit in the budget."""
+        self._sweep_temp_files()
+        blobs = self._scan_blobs()
+        total = sum(size for _, size, _ in blobs)
+        evicted = 0
+        for path, size, _ in sorted(blobs, key=lambda blob: blob[2]):
+            if total <= self._max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+            except FileNotFoundError:  # Evicted by another process.
+                pass
+            total -= size
+            evicted += 1
+            logger.debug("Evicted cached blob: %s", path)
+        self._approx_bytes = total
+        self._evictions += evicted
+        if evicted:
+            self._prune_keys({os.path.basename(path) for path, _, _ in blobs})
+
+    def _sweep_temp_files(self) -> None:
+        """Removes temporary files abandoned by writers that crashed."""
+        # Writes in progress keep their temporary file's mtime fresh.
+        cutoff = time.time() - _TEMP_MAX_AGE
+        for directory in (self._keys, self._blobs):
+            for entry in _iter_entries(directory, temporary=True):
+                try:
+                    if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        logger.debug("Removed stale temporary file: %s", entry.path)
+                except FileNotFoundError:  # Finished or swept by another process.
+                    continue
+
+    def _prune_keys(self, known: Set[str]) -> None:
+        """Removes keys whose blob no longer exists."""
+        for entry in _iter_entries(self._keys):
+            try:
+                with open(entry.path, "rb") as f:
+                    digest = f.read().decode("ascii").rpartition(" ")[2]
+                if digest in known and os.path.exists(_fan_out(self._blobs, digest)):
+                    continue
+                os.unlink(entry.path)
+            except (OSError, UnicodeDecodeError):
+                continue
+
+    def map_file(self, filepath: str) -> Optional[MappedFile]:
+        """
+        Returns the cached text of a file as a zero-copy memory mapping.
+
+        The mapping holds the UTF-8 encoding of what read_file_content
+        returns, so it is always valid UTF-8 with ``"\\n"`` line endings.
+
+        Args:
+            filepath (str): The path to the file to be read.
+
+        Returns:
+            Optional[MappedFile]: The mapping; use it as a context manager to
+                release it. None if an unexpected error occurs, or if the
+                content could not be written to the cache directory.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            PermissionError: If the user does not have permissions to read the file.
+            IsADirectoryError: If the filepath points to a directory instead of a file.
+            UnicodeDecodeError: If the file is not UTF-8 encoded or contains invalid characters.
+        """
+        mapped, _ = self._load(filepath)
+        return mapped
+
+    def read_file_content(self, filepath: str) -> Optional[str]:
+        """
+        Returns the content of a file, from the cache directory if it has not
+        changed since any process last read it.
+
+        Args:
+            filepath (str): The path to the file to be read.
+
+        Returns:
+            Optional[str]: The content of the file as a string, or None if an
+                unexpected error occurs.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            PermissionError: If the user does not have permissions to read the file.
+            IsADirectoryError: If the filepath points to a directory instead of a file.
+            UnicodeDecodeError: If the file is not UTF-8 encoded or contains invalid characters.
+        """
+        mapped, content = self._load(filepath)
+        if mapped is None or content is not None:
+            if mapped is not None:
+                mapped.close()
+            return content
+        with mapped:
+            # Blobs are written already translated, so decoding straight from
+            # the mapping is all that is left to do.
+            return mapped.read_text()
+
+    def clear(self) -> None:
+        """Removes every entry from the cache directory. Counters are kept."""
+        with self._lock:
+            for directory in (self._keys, self._blobs):
+                for entry in _iter_entries(directory):
+                    try:
+                        os.unlink(entry.path)
+                    except FileNotFoundError:
+                        pass
+            self._approx_bytes = 0
+
+    def stats(self) -> CacheStats:
+        """
+        Returns this process's counters and the current size of the directory.
+
+        Returns:
+            CacheStats: The counters. ``entries`` and ``current_bytes`` count
+                blobs on disk, including those written by other processes.
+        """
+        blobs = self._scan_blobs()
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(blobs),
+                current_bytes=sum(size for _, size, _ in blobs),
+                max_bytes=self._max_bytes,
+            )
@@ -0,0 +1,262 @@
+"""Incremental, persistent index of the files under a directory tree."""
+
+import logging
+import os
+import sqlite3
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from types import TracebackType
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+from my_project.file_utils import hash_file, new_hasher
+
+logger = logging.getLogger(__name__)
+
+#: Default digest algorithm of a FileIndex.
+DEFAULT_ALGORITHM = "sha256"
+
+#: Bytes read per hashing step.
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    digest TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class IndexEntry(namedtuple("IndexEntry", ["path", "size", "mtime_ns", "digest"])):
+    """
+    One indexed file.
+
+    Attributes:
+        path (str): Path relative to the index root, with ``/`` separators.
+        size (int): File size in bytes.
+        mtime_ns (int): Modification time in nanoseconds.
+        digest (str): Hex digest of the file's bytes.
+    """
+
+    __slots__ = ()
+
+
+class IndexUpdate(
+    namedtuple("IndexUpdate", ["added", "modified", "removed", "unchanged", "errors"])
+):
+    """
+    Outcome of FileIndex.update().
+
+    Attributes:
+        added (List[str]): Paths that were not indexed before.
+        modified (List[str]): Paths whose stat changed and were re-hashed.
+        removed (List[str]): Indexed paths that no longer exist.
+        unchanged (int): Number of files skipped because their stat matched.
+        errors (Dict[str, OSError]): Files that could not be read, by path.
+    """
+
+    __slots__ = ()
+
+
+def scan_directory(root: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Walks ``root`` with os.scandir, yielding every regular file.
+
+    Symbolic links are not followed. Directories that cannot be listed are
+    logged and skipped.
+
+    Args:
+        root (str): The directory to walk.
+
+    Yields:
+        Tuple[str, os.stat_result]: Each file's path and its stat result.
+
+    Raises:
+        FileNotFoundError: If root does not exist.
+        NotADirectoryError: If root is not a directory.
+    """
+    stack = [root]
+    first = True
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError as e:
+            if first:
+                raise
+            logger.warning("Cannot scan directory %s: %s", directory, e)
+            continue
+        first = False
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry.path, entry.stat(follow_symlinks=False)
+                except OSError as e:
+                    # The entry vanished or became unreadable mid-scan.
+                    logger.warning("Cannot stat %s: %s", entry.path, e)
+
+
+def _hash_file(filepath: str, algorithm: str) -> str:
+    """Digests one file for FileIndex.update()."""
+    return hash_file(filepath, algorithm, chunk_size=HASH_CHUNK_SIZE)
+
+
+class FileIndex:
+    """
+    Index of path, size, mtime and content digest for every file under a root.
+
+    The index is persisted in an SQLite database. update() walks the tree,
+    compares each file's ``(size, mtime_ns, inode)`` with the stored values
+    and only re-reads files whose stat changed. Hashing runs on a thread pool:
+    file reads and hashlib both release the GIL for large buffers, so hashing
+    scales across cores.
+    """
+
+    def __init__(
+        self, root: str, index_path: str, algorithm: str = DEFAULT_ALGORITHM
+    ) -> None:
+        """
+        Opens (or creates) the index stored at ``index_path``.
+
+        Args:
+            root (str): The directory to index.
+            index_path (str): The SQLite database file. It may live inside
+                root; it is never indexed itself.
+            algorithm (str): The digest algorithm: any hashlib name, or
+                ``"crc32"`` for a fast checksum. Changing it discards the
+                stored digests.
+
+        Raises:
+            ValueError: If algorithm is not supported.
+            sqlite3.Error: If the index file cannot be opened.
+        """
+        new_hasher(algorithm)  # Fail early on unknown algorithms.
+        self.root = os.path.abspath(root)
+        self.index_path = os.path.abspath(index_path)
+        self.algorithm = algorithm
+        self._db = sqlite3.connect(self.index_path)
+        self._db.executescript(_SCHEMA)
+        row = self._db.execute(
+            "SELECT value FROM meta WHERE key = 'algorithm'"
+        ).fetchone()
+        if row is None or row[0] != algorithm:
+            with self._db:
+                self._db.execute("DELETE FROM files")
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('algorithm', ?)", (algorithm,)
+                )
+
+    def __enter__(self) -> "FileIndex":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return int(self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0])
+
+    def __iter__(self) -> Iterator[IndexEntry]:
+        rows = self._db.execute(
+            "SELECT path, size, mtime_ns, digest FROM files ORDER BY path"
+        )
+        return (IndexEntry(*row) for row in rows)
+
+    def get(self, path: str) -> Optional[IndexEntry]:
+        """
+        Looks up one file.
+
+        Args:
+            path (str): Path relative to the root, with ``/`` separators.
+
+        Returns:
+            Optional[IndexEntry]: The entry, or None if the path is not indexed.
+        """
+        row = self._db.execute(
+            "SELECT path, size, mtime_ns, digest FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        return IndexEntry(*row) if row is not None else None
+
+    def update(self, max_workers: Optional[int] = None) -> IndexUpdate:
+        """
+        Brings the index up to date with the files under the root.
+
+        Args:
+            max_workers (Optional[int]): Number of hashing threads. Defaults to
+                the ThreadPoolExecutor default.
+
+        Returns:
+            IndexUpdate: What changed since the previous update.
+
+        Raises:
+            FileNotFoundError: If the root does not exist.
+            NotADirectoryError: If the root is not a directory.
+            ValueError: If max_workers is not a positive integer.
+        """
+        known: Dict[str, Tuple[int, int, int]] = {
+            path: (size, mtime_ns, ino)
+            for path, size, mtime_ns, ino in self._db.execute(
+                "SELECT path, size, mtime_ns, ino FROM files"
+            )
+        }
+        added: List[str] = []
+        modified: List[str] = []
+        unchanged = 0
+        errors: Dict[str, OSError] = {}
+        pending: List[Tuple[str, str, Tuple[int, int, int]]] = []
+        seen = set()
+
+        for filepath, st in scan_directory(self.root):
+            if filepath == self.index_path or filepath.startswith(
+                self.index_path + "-"
+            ):
+                continue  # The database and its journal files.
+            key = os.path.relpath(filepath, self.root).replace(os.sep, "/")
+            seen.add(key)
+            stat_key = (st.st_size, st.st_mtime_ns, st.st_ino)
+            if known.get(key) == stat_key:
+                unchanged += 1
+            else:
+                pending.append((key, filepath, stat_key))
+
+        rows = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_hash_file, filepath, self.algorithm)
+                for _, filepath, _ in pending
+            ]
+            for (key, filepath, stat_key), future in zip(pending, futures):
+                try:
+                    digest = future.result()
+                except OSError as e:
+                    logger.warning("Cannot index %s: %s", filepath, e)
+                    errors[key] = e
+                    continue
+                (added if key not in known else modified).append(key)
+                rows.append((key, *stat_key, digest))
+
+        # Files that failed to read keep no stale entry behind.
+        removed = sorted(set(known) - seen)
+        stale = removed + [key for key in errors if key in known]
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._db.executemany(
+                "DELETE FROM files WHERE path = ?", [(key,) for key in stale]
+            )
+        return IndexUpdate(added, modified, removed, unchanged, errors)
+
+    def close(self) -> None:
+        """Closes the underlying database. Safe to call more than once."""
+        self._db.close()
@@ -1,17 +1,140 @@
 """File utility functions with robust error handling."""
 
+from __future__ import annotations
+
+import codecs
+import errno
+import io
 import logging
-from typing import Optional
+import mmap
+import os
+import stat
+import sys
+import threading
+import weakref
+from array import array
+from collections import namedtuple
+
+from my_project.logging_utils import get_hot_path_logger
+from my_project.metrics import file_io_metrics
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import asyncio
+    import bz2
+    import gzip
+    import lzma
+    from concurrent.futures import Executor, Future
+
+    from my_project.metrics import CallObserver
+    from types import TracebackType
+    from typing import (
+        AsyncGenerator,
+        AsyncIterator,
+        BinaryIO,
+        Callable,
+        Dict,
+        Generator,
+        Iterable,
+        Iterator,
+        List,
+        MutableMapping,
+        Optional,
+        Pattern,
+        Protocol,
+        Set,
+        Tuple,
+        Type,
+        Union,
+    )
+
+    class Hasher(Protocol):
+        def update(self, data: Union[bytes, memoryview], /) -> None:
+            ...
+
+        def hexdigest(self) -> str:
+            ...
+
 
 logger = logging.getLogger(__name__)
+hot_path_logger = get_hot_path_logger()
+
+#: Default number of bytes read per chunk by the streaming readers.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+#: Default cap on files held open at once by an AsyncFileReader.
+DEFAULT_MAX_OPEN_FILES = 64
+
+#: Leading bytes of the compressed formats read when ``decompress=True``.
+COMPRESSION_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+}
+
+
+def detect_compression(header: bytes) -> Optional[str]:
+    """
+    Identifies a compressed format from a file's leading bytes.
+
+    Args:
+        header (bytes): At least the first six bytes of the file, if it has
+            that many.
+
+    Returns:
+        Optional[str]: ``"gzip"``, ``"bz2"`` or ``"xz"``, or None for data
+        that is not compressed in a supported format.
+    """
+    for name, magic in COMPRESSION_MAGIC.items():
+        if header.startswith(magic):
+            return name
+    return None
+
+
+def _decompressing_reader(
+    f: io.BufferedReader,
+) -> Union[io.BufferedReader, gzip.GzipFile, bz2.BZ2File, lzma.LZMAFile]:
+    """
+    Wraps ``f`` in a streaming decompressor if its content is compressed.
+
+    The magic bytes are peeked without consuming them, so uncompressed files
+    are returned unchanged. Closing the wrapper does not close ``f``.
+    """
+    codec = detect_compression(f.peek(6)[:6])
+    if codec == "gzip":
+        import gzip
+
+        return gzip.GzipFile(fileobj=f, mode="rb")
+    if codec == "bz2":
+        import bz2
 
+        return bz2.BZ2File(f, mode="rb")
+    if codec == "xz":
+        import lzma
 
-def read_file_content(filepath: str) -> Optional[str]:
+        return lzma.LZMAFile(f, mode="rb")
+    return f
+
+
+def _read_text(filepath: str, call: CallObserver, decompress: bool = False) -> str:
+    """Reads a whole, optionally decompressed, file as newline-translated text."""
+    with open(filepath, "rb") as f:
+        call.files_opened = 1
+        source = _decompressing_reader(f) if decompress else f
+        with io.TextIOWrapper(source, encoding="utf-8") as text:
+            content = text.read()
+            call.bytes_read = f.tell()
+    return content
+
+
+def read_file_content(filepath: str, decompress: bool = False) -> Optional[str]:
     """
     Reads the content of a file as a string.
 
     Args:
         filepath (str): The path to the file to be read.
+        decompress (bool): Transparently decompress gzip, bz2 and xz files,
+            detected by their magic bytes. Other files are read as usual.
 
     Returns:
         Optional[str]: The content of the file as a string, or None if an unexpected error occurs.
@@ -23,10 +146,10 @@ def read_file_content(filepath: str) -> Optional[str]:
         UnicodeDecodeError: If the file is not UTF-8 encoded or contains invalid characters.
     """
     try:
-        logger.info("Attempting to read file: %s", filepath)
-        with open(filepath, "r", encoding="utf-8") as f:
-            content = f.read()
-        logger.info("Successfully read file: %s", filepath)
+        hot_path_logger.info("Attempting to read file: %s", filepath)
+        with file_io_metrics.observe("read_file_content") as call:
+            content = _read_text(filepath, call, decompress)
+        hot_path_logger.info("Successfully read file: %s", filepath)
         return content
 
     except FileNotFoundError:
@@ -55,3 +178,1886 @@ def read_file_content(filepath: str) -> Optional[str]:
             str(e),
         )
         return None  # Return None as a fallback.
+
+
+def _log_read_error(filepath: str, error: BaseException) -> None:
+    """
+    Log a read failure using the same messages as read_file_content.
+
+    Args:
+        filepath (str): The path that failed to be read.
+        error (BaseException): The exception raised while reading.
+    """
+    if isinstance(error, FileNotFoundError):
+        logger.error("File not found: %s", filepath)
+    elif isinstance(error, PermissionError):
+        logger.error("Permission denied for file: %s", filepath)
+    elif isinstance(error, IsADirectoryError):
+        logger.error("Expected a file but found a directory: %s", filepath)
+    elif isinstance(error, UnicodeDecodeError):
+        logger.error(
+            "File at %s is not UTF-8 encoded or contains invalid characters.", filepath
+        )
+    else:
+        logger.error(
+            "An unexpected error occurred while reading the file at %s: %s",
+            filepath,
+            str(error),
+            exc_info=error,
+        )
+
+
+def iter_file_chunks(
+    filepath: str, chunk_size: int = DEFAULT_CHUNK_SIZE, decompress: bool = False
+) -> Generator[str, None, None]:
+    """
+    Lazily reads a UTF-8 file as a sequence of decoded text chunks.
+
+    At most ``chunk_size`` bytes are held in memory at a time. An incremental
+    decoder carries multibyte characters (and CRLF pairs) that are split
+    across chunk boundaries over to the next chunk, so ``"".join(chunks)`` is
+    equal to what read_file_content returns for the same file.
+
+    Args:
+        filepath (str): The path to the file to be read.
+        chunk_size (int): Maximum number of bytes to read per chunk. With
+            ``decompress``, this bounds the decompressed bytes per chunk.
+        decompress (bool): Transparently decompress gzip, bz2 and xz files,
+            detected by their magic bytes. Other files are read as usual.
+
+    Yields:
+        str: Decoded, newline-translated text. Empty chunks are never yielded.
+
+    Raises:
+        ValueError: If chunk_size is not a positive integer.
+        FileNotFoundError: If the file does not exist.
+        PermissionError: If the user does not have permissions to read the file.
+        IsADirectoryError: If the filepath points to a directory instead of a file.
+        UnicodeDecodeError: If the file is not UTF-8 encoded or contains invalid characters.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder("utf-8")(errors="strict"), translate=True
+    )
+    try:
+        hot_path_logger.info("Attempting to read file: %s", filepath)
+        with file_io_metrics.observe("iter_file_chunks") as call:
+            with open(filepath, "rb") as f:
+                call.files_opened = 1
+                source = _decompressing_reader(f) if decompress else f
+                try:
+                    while True:
+                        data = source.read(chunk_size)
+                        if not data:
+                            break
+                        text = decoder.decode(data)
+                        if text:
+                            yield text
+                finally:
+                    call.bytes_read = f.tell()
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+        hot_path_logger.info("Successfully read file: %s", filepath)
+
+    except GeneratorExit:
+        raise  # The consumer stopped early; this is not a read failure.
+
+    except Exception as e:
+        # Unlike read_file_content there is no None fallback: the caller may
+        # already hold part of the content, so every failure is re-raised.
+        _log_read_error(filepath, e)
+        raise
+
+
+def iter_file_lines(filepath: str, decompress: bool = False) -> Iterator[str]:
+    """
+    Lazily reads a UTF-8 file line by line.
+
+    Only the current line is held in memory. Line endings are translated to
+    ``"\\n"`` and kept on each line, matching the text returned by
+    read_file_content.
+
+    Args:
+        filepath (str): The path to the file to be read.
+        decompress (bool): Transparently decompress gzip, bz2 and xz files,
+            detected by their magic bytes. Other files are read as usual.
+
+    Yields:
+        str: Each line of the file, including its trailing newline if present.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        PermissionError: If the user does not have permissions to read the file.
+        IsADirectoryError: If the filepath points to a directory instead of a file.
+        UnicodeDecodeError: If the file is not UTF-8 encoded or contains invalid characters.
+    """
+    try:
+        hot_path_logger.info("Attempting to read file: %s", filepath)
+        with file_io_metrics.observe("iter_file_lines") as call:
+            with open(filepath, "rb") as f:
+                call.files_opened = 1
+                source = _decompressing_reader(f) if decompress else f
+                lines = io.TextIOWrapper(source, encoding="utf-8")
+                try:
+                    yield from lines
+                finally:
+                    call.bytes_read = f.tell()
+        hot_path_logger.info("Successfully read file: %s", filepath)
+
+    except GeneratorExit:
+        raise  # The consumer stopped early; this is not a read failure.
+
+    except Exception as e:
+        _log_read_error(filepath, e)
+        raise
+
+
+def read_file_bytes(filepath: str, decompress: bool = False) -> bytes:
+    """
+    Reads the raw content of a file without decoding it.
+
+    Pair with decode_text() or LazyText to choose how the bytes are decoded,
+    and to retry with another error handler without reading the file again.
+
+    Args:
+        filepath (str): The path to the file to be read.
+        decompress (bool): Transparently decompress gzip, bz2 and xz files,
+            detected by their magic bytes. Other files are read as usual.
+
+    Returns:
+        bytes: The file content.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        PermissionError: If the user does not have permissions to read the file.
+        IsADirectoryError: If the filepath points to a directory instead of a file.
+    """
+    try:
+        hot_path_logger.info("Attempting to read file: %s", filepath)
+        with file_io_metrics.observe("read_file_bytes") as call:
+            with open(filepath, "rb") as f:
+                call.files_opened = 1
+                source = _decompressing_reader(f) if decompress else f
+                data = source.read()
+                call.bytes_read = f.tell()
+        hot_path_logger.info("Successfully read file: %s", filepath)
+        return data
+
+    except Exception as e:
+        _log_read_error(filepath, e)
+        raise
+
+
+def _translate_newlines(text: str) -> str:
+    if "\r" in text:
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def decode_text(data: Union[bytes, memoryview], errors: str = "strict") -> str:
+    """
+    Decodes UTF-8 bytes the way read_file_content does, with a choice of
+    error handling.
+
+    Args:
+        data (Union[bytes, memoryview]): The bytes to decode, such as a
+            slice of a memory-mapped file.
+        errors (str): ``"strict"`` raises on invalid bytes, ``"replace"``
+            substitutes U+FFFD, and ``"surrogateescape"`` keeps them as lone
+            surrogates so ``text.encode("utf-8", "surrogateescape")``
+            restores the original bytes. Any registered codec error handler
+            is accepted.
+
+    Returns:
+        str: The text, with ``"\\r\\n"`` and ``"\\r"`` translated to ``"\\n"``.
+
+    Raises:
+        UnicodeDecodeError: If errors is "strict" and data is not valid UTF-8.
+        LookupError: If errors is not a registered error handler.
+    """
+    return _translate_newlines(str(data, "utf-8", errors))
+
+
+class LazyText:
+    """
+    UTF-8 bytes that are decoded only as far as they are used.
+
+    Pure-ASCII content without carriage returns has one character per byte,
+    so ``len()`` and slicing work on the bytes directly and decode only the
+    selected range. Other content is decoded in full on first use and
+    cached. iter_chunks() decodes incrementally without building the whole
+    string.
+
+    Attributes:
+        data (bytes): The undecoded content.
+        errors (str): The codec error handler, as for decode_text().
+    """
+
+    __slots__ = ("data", "errors", "_direct", "_text")
+
+    def __init__(self, data: bytes, errors: str = "strict") -> None:
+        """
+        Wraps ``data`` without decoding it.
+
+        Args:
+            data (bytes): The UTF-8 content.
+            errors (str): The codec error handler, as for decode_text().
+        """
+        self.data = data
+        self.errors = errors
+        self._direct: Optional[bool] = None
+        self._text: Optional[str] = None
+
+    @property
+    def ascii_only(self) -> bool:
+        """bool: True if the bytes can be indexed as characters directly."""
+        if self._direct is None:
+            self._direct = self.data.isascii() and b"\r" not in self.data
+        return self._direct
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = decode_text(self.data, self.errors)
+        return self._text
+
+    def __len__(self) -> int:
+        return len(self.data) if self.ascii_only else len(str(self))
+
+    def __getitem__(self, key: Union[int, slice]) -> str:
+        if self.ascii_only:
+            if isinstance(key, int):
+                return chr(self.data[key])
+            return str(self.data[key], "ascii")
+        return str(self)[key]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyText):
+            other = str(other)
+        if not isinstance(other, str):
+            return NotImplemented
+        return str(self) == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Decodes the content incrementally.
+
+        Args:
+            chunk_size (int): Bytes decoded per step.
+
+        Yields:
+            str: Newline-translated text; ``"".join()`` equals ``str(self)``.
+
+        Raises:
+            ValueError: If chunk_size is not a positive integer.
+            UnicodeDecodeError: If errors is "strict" and the content is not
+                valid UTF-8.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        if self._text is not None:
+            text = self._text
+            for start in range(0, len(text), chunk_size):
+                yield text[start : start + chunk_size]
+            return
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(errors=self.errors), translate=True
+        )
+        view = memoryview(self.data)
+        for start in range(0, len(view), chunk_size):
+            text = decoder.decode(view[start : start + chunk_size])
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+
+class MappedFile:
+    """
+    Read-only, memory-mapped view of a file's bytes.
+
+    Slices are returned as ``memoryview`` objects over the mapping, so no data
+    is copied until a caller decodes or converts a range. Use instances as
+    context managers (or call close()) to release the mapping; any views a
+    caller still holds must be released first.
+
+    Attributes:
+        filepath (str): The path of the mapped file.
+    """
+
+    def __init__(self, filepath: str) -> None:
+        """
+        Maps ``filepath`` into memory for reading.
+
+        Args:
+            filepath (str): The path to the file to be mapped.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            PermissionError: If the user does not have permissions to read the file.
+            IsADirectoryError: If the filepath points to a directory instead of a file.
+        """
+        self.filepath = filepath
+        self._mmap: Optional[mmap.mmap] = None
+        try:
+            hot_path_logger.info("Attempting to map file: %s", filepath)
+            with file_io_metrics.observe("map_file") as call:
+                with open(filepath, "rb") as f:
+                    call.files_opened = 1
+                    if os.fstat(f.fileno()).st_size:
+                        self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view: Optional[memoryview] = (
+                memoryview(self._mmap) if self._mmap is not None else memoryview(b"")
+            )
+            hot_path_logger.info("Successfully mapped file: %s", filepath)
+
+        except Exception as e:
+            _log_read_error(filepath, e)
+            raise
+
+    def __enter__(self) -> "MappedFile":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    @property
+    def closed(self) -> bool:
+        """bool: True once the mapping has been released."""
+        return self._view is None
+
+    @property
+    def view(self) -> memoryview:
+        """
+        memoryview: A read-only view over the whole file.
+
+        Raises:
+            ValueError: If the mapping has been closed.
+        """
+        if self._view is None:
+            raise ValueError("I/O operation on closed mapped file")
+        return self._view
+
+    def read_bytes(self, start: int = 0, end: Optional[int] = None) -> memoryview:
+        """
+        Returns a zero-copy view of the bytes in ``[start, end)``.
+
+        Args:
+            start (int): Offset of the first byte.
+            end (Optional[int]): Offset one past the last byte, or None for
+                the end of the file.
+
+        Returns:
+            memoryview: A read-only view over the requested range.
+        """
+        return self.view[start:end]
+
+    def read_text(self, start: int = 0, end: Optional[int] = None) -> str:
+        """
+        Decodes the bytes in ``[start, end)`` as UTF-8.
+
+        Unlike read_file_content, line endings are returned as stored.
+
+        Args:
+            start (int): Offset of the first byte.
+            end (Optional[int]): Offset one past the last byte, or None for
+                the end of the file.
+
+        Returns:
+            str: The decoded text of the requested range.
+
+        Raises:
+            UnicodeDecodeError: If the range is not valid UTF-8, including when
+                it starts or ends inside a multibyte character.
+        """
+        try:
+            return codecs.decode(self.read_bytes(start, end), "utf-8")
+        except UnicodeDecodeError as e:
+            _log_read_error(self.filepath, e)
+            raise
+
+    def close(self) -> None:
+        """
+        Releases the mapping. Calling close() more than once is allowed.
+
+        Raises:
+            BufferError: If views returned by read_bytes() are still alive.
+        """
+        if self._view is None:
+            return
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._view = None
+
+
+def map_file(filepath: str) -> MappedFile:
+    """
+    Opens a file as a read-only, zero-copy memory mapping.
+
+    Args:
+        filepath (str): The path to the file to be mapped.
+
+    Returns:
+        MappedFile: The mapping; use it as a context manager to release it.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        PermissionError: If the user does not have permissions to read the file.
+        IsADirectoryError: If the filepath points to a directory instead of a file.
+    """
+    return MappedFile(filepath)
+
+
+#: Errors from copy_file_range/sendfile meaning "not supported for these
+#: files", after which copy_file falls back to the next strategy.
+_KERNEL_COPY_UNSUPPORTED = frozenset(
+    {
+        errno.EBADF,
+        errno.EINVAL,
+        errno.ENOSYS,
+        errno.ENOTSUP,
+        errno.EOPNOTSUPP,
+        errno.EXDEV,
+    }
+)
+
+
+def _pread(f: BinaryIO, length: int, offset: int) -> bytes:
+    """Reads ``length`` bytes at ``offset`` without moving the file position."""
+    if hasattr(os, "pread"):
+        return os.pread(f.fileno(), length, offset)
+    f.seek(offset)
+    return f.read(length)
+
+
+def read_file_range(filepath: str, offset: int, length: int) -> bytes:
+    """
+    Reads a byte range of a file without reading the rest of it.
+
+    Uses ``os.pread`` where available, so no more than ``length`` bytes are
+    read from the kernel.
+
+    Args:
+        filepath (str): The path to the file to be read.
+        offset (int): Byte offset of the first byte to read.
+        length (int): Maximum number of bytes to read.
+
+    Returns:
+        bytes: The range; shorter than ``length`` if it runs past the end of
+        the file, and empty if ``offset`` is at or beyond the end.
+
+    Raises:
+        ValueError: If offset or length is negative.
+        FileNotFoundError: If the file does not exist.
+        PermissionError: If the user does not have permissions to read the file.
+        IsADirectoryError: If the filepath points to a directory instead of a file.
+    """
+    if offset < 0 or length < 0:
+        raise ValueError("offset and length must not be negative")
+    try:
+        with file_io_metrics.observe("read_file_range") as call:
+            with open(filepath, "rb", buffering=0) as f:
+                call.files_opened = 1
+                parts = []
+                remaining = length
+                while remaining:
+                    # A single pread may return less than asked for very
+                    # large ranges; an empty read means end of file.
+                    data = _pread(f, remaining, offset + length - remaining)
+                    if not data:
+                        break
+                    parts.append(data)
+                    remaining -= len(data)
+                call.bytes_read = length - remaining
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+
+    except Exception as e:
+        _log_read_error(filepath, e)
+        raise
+
+
+def _kernel_copy(
+    copy: Callable[[int, int, int], int], infd: int, outfd: int, block: int
+) -> Optional[int]:
+    """
+    Copies ``infd`` to ``outfd`` from their current positions with a syscall.
+
+    Returns:
+        Optional[int]: Bytes copied, or None if the syscall is not supported
+        for these files and nothing was copied yet.
+    """
+    copied = 0
+    while True:
+        try:
+            n = copy(infd, outfd, block)
+        except OSError as e:
+            if not copied and e.errno in _KERNEL_COPY_UNSUPPORTED:
+                return None
+            raise
+        if not n:
+            return copied
+        copied += n
+
+
+def _check_not_same_file(src_stat: os.stat_result, src: str, dst: str) -> None:
+    """Raises before ``dst`` is truncated if it is the file being copied."""
+    try:
+        dst_stat = os.stat(dst)
+    except OSError:
+        return  # Missing (or unreadable) destinations are handled by open().
+    if (dst_stat.st_dev, dst_stat.st_ino) == (src_stat.st_dev, src_stat.st_ino):
+        import shutil
+
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+
+
+def _copy_fds(
+    fsrc: io.BufferedReader, fdst: io.BufferedWriter, size: int, chunk_size: int
+) -> int:
+    """Copies fsrc to fdst with the fastest strategy that works."""
+    infd, outfd = fsrc.fileno(), fdst.fileno()
+    # Large blocks keep syscalls few; 1 GiB keeps counts in range.
+    block = min(max(size, 8 * 1024 * 1024), 1 << 30)
+    copied = None
+    if hasattr(os, "copy_file_range"):
+        copied = _kernel_copy(os.copy_file_range, infd, outfd, block)
+    if copied is None and hasattr(os, "sendfile"):
+        copied = _kernel_copy(
+            lambda i, o, n: os.sendfile(o, i, None, n), infd, outfd, block
+        )
+    if copied is None:
+        copied = 0
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        while True:
+            n = fsrc.readinto(buffer)
+            if not n:
+                break
+            fdst.write(view[:n])
+            copied += n
+    return copied
+
+
+def copy_file(src: str, dst: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Copies a file's bytes without passing them through Python where possible.
+
+    Tries ``os.copy_file_range`` (in-kernel, and reflinks on filesystems
+    that support them), then ``os.sendfile``, and finally falls back to a
+    buffered copy through one reused ``chunk_size`` buffer. ``dst`` is
+    created or truncated; metadata is not copied, and a partially written
+    ``dst`` is left behind if the copy fails.
+
+    Args:
+        src (str): The path of the file to be copied.
+        dst (str): The path of the copy.
+        chunk_size (int): Buffer size of the fallback copy.
+
+    Returns:
+        int: Number of bytes copied.
+
+    Raises:
+        ValueError: If chunk_size is not a positive integer.
+        FileNotFoundError: If src, or the directory of dst, does not exist.
+        PermissionError: If src cannot be read or dst cannot be written.
+        IsADirectoryError: If src or dst is a directory.
+        shutil.SameFileError: If src and dst are the same file, including
+            through a hard or symbolic link; dst is left untouched.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+    try:
+        with file_io_metrics.observe("copy_file") as call:
+            with open(src, "rb") as fsrc:
+                src_stat = os.fstat(fsrc.fileno())
+                _check_not_same_file(src_stat, src, dst)
+                with open(dst, "wb") as fdst:
+                    call.files_opened = 2
+                    copied = _copy_fds(fsrc, fdst, src_stat.st_size, chunk_size)
+                call.bytes_read = copied
+        return copied
+
+    except Exception as e:
+        # Report the path that actually failed, which may be the destination.
+        _log_read_error(getattr(e, "filename", None) or src, e)
+        raise
+
+
+#: Suffix of the sidecar file written by build_line_index(..., sidecar=True).
+LINE_INDEX_SUFFIX = ".lineidx"
+
+#: Sidecar layout: magic, mtime_ns, size, line count, then the offsets as
+#: little-endian uint64 values.
+_LINE_INDEX_MAGIC = b"MPLIDX1\n"
+_LINE_INDEX_HEADER = "<8sqqQ"
+
+
+class LineIndex:
+    """
+    Byte offset of the start of every line of a file, for random access.
+
+    Offsets are kept in a compact ``array('Q')`` (8 bytes per line), so
+    fetching line N reads only that line's bytes with ``os.pread``. Lines are
+    delimited by ``"\\n"``; ``"\\r\\n"`` endings are translated to ``"\\n"``
+    like read_file_content does. Every fetch checks the file's
+    ``(mtime_ns, size)`` and rebuilds the index if the file changed. With a
+    sidecar path the offsets are also saved next to the file and reused by
+    later processes while the signature still matches.
+
+    Attributes:
+        filepath (str): The indexed file.
+        sidecar_path (Optional[str]): Where the index is persisted, if anywhere.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        sidecar_path: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """
+        Loads the index from the sidecar if it is current, otherwise builds it.
+
+        Args:
+            filepath (str): The path to the file to be indexed.
+            sidecar_path (Optional[str]): File to load the index from and save
+                it to. Unreadable or stale sidecars are rebuilt.
+            chunk_size (int): Bytes read per step while building.
+
+        Raises:
+            ValueError: If chunk_size is not a positive integer.
+            FileNotFoundError: If the file does not exist.
+            PermissionError: If the user does not have permissions to read the file.
+            IsADirectoryError: If the filepath points to a directory instead of a file.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        self.filepath = filepath
+        self.sidecar_path = sidecar_path
+        self._chunk_size = chunk_size
+        self._offsets = array("Q")
+        self._signature: Optional[Tuple[int, int]] = None
+        try:
+            with open(filepath, "rb") as f:
+                self._refresh(f)
+
+        except Exception as e:
+            _log_read_error(filepath, e)
+            raise
+
+    def __len__(self) -> int:
+        """Number of lines as of the last build or fetch."""
+        return len(self._offsets)
+
+    def get_line(self, n: int) -> str:
+        """
+        Fetches a single line.
+
+        Args:
+            n (int): Zero-based line number; negative values count from the end.
+
+        Returns:
+            str: The line, including its trailing newline if present.
+
+        Raises:
+            IndexError: If the file has no line ``n``.
+            FileNotFoundError: If the file no longer exists.
+            UnicodeDecodeError: If the line is not valid UTF-8.
+        """
+        try:
+            with open(self.filepath, "rb") as f:
+                size = self._refresh(f)
+                count = len(self._offsets)
+                if -count <= n < count:
+                    return self._read_lines(f, n % count, n % count + 1, size)[0]
+
+        except Exception as e:
+            _log_read_error(self.filepath, e)
+            raise
+        raise IndexError("line number out of range")
+
+    def get_lines(self, start: int, stop: Optional[int] = None) -> List[str]:
+        """
+        Fetches a range of lines with a single read.
+
+        Args:
+            start (int): First line, with slice semantics.
+            stop (Optional[int]): Line after the last one; None means the end.
+
+        Returns:
+            List[str]: The lines, equal to ``lines[start:stop]`` of the file.
+
+        Raises:
+            FileNotFoundError: If the file no longer exists.
+            UnicodeDecodeError: If a line is not valid UTF-8.
+        """
+        try:
+            with open(self.filepath, "rb") as f:
+                size = self._refresh(f)
+                start, stop, _ = slice(start, stop).indices(len(self._offsets))
+                return self._read_lines(f, start, stop, size)
+
+        except Exception as e:
+            _log_read_error(self.filepath, e)
+            raise
+
+    def _read_lines(self, f: BinaryIO, start: int, stop: int, size: int) -> List[str]:
+        if start >= stop:
+            return []
+        offsets = self._offsets
+        first = offsets[start]
+        end = offsets[stop] if stop < len(offsets) else size
+        with file_io_metrics.observe("line_index_read") as call:
+            call.files_opened = 1
+            data = memoryview(_pread(f, end - first, first))
+            call.bytes_read = len(data)
+        starts = [offset - first for offset in offsets[start:stop]]
+        ends = starts[1:] + [end - first]
+        return [decode_text(data[a:b]) for a, b in zip(starts, ends)]
+
+    def _refresh(self, f: BinaryIO) -> int:
+        """Rebuilds the offsets if the file's signature changed; returns its size."""
+        st = os.fstat(f.fileno())
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature == self._signature:
+            return st.st_size
+        sidecar_path = self.sidecar_path
+        if sidecar_path is None or not self._load_sidecar(sidecar_path, signature):
+            self._build(f, st.st_size)
+            if sidecar_path is not None:
+                self._save_sidecar(sidecar_path, signature)
+        self._signature = signature
+        return st.st_size
+
+    def _build(self, f: BinaryIO, size: int) -> None:
+        from itertools import accumulate, islice, repeat
+        from operator import add
+
+        offsets = array("Q", [0] if size else [])
+        position = 0
+        f.seek(0)
+        with file_io_metrics.observe("line_index_build") as call:
+            call.files_opened = 1
+            while position < size:
+                data = f.read(min(self._chunk_size, size - position))
+                if not data:
+                    break
+                parts = data.split(b"\n")
+                # Start of the next line after each newline, without a
+                # Python-level loop: position + sum(len(part) + 1).
+                line_lengths = map(add, map(len, parts[:-1]), repeat(1))
+                offsets.extend(
+                    islice(accumulate(line_lengths, initial=position), 1, None)
+                )
+                position += len(data)
+            call.bytes_read = position
+        if offsets and offsets[-1] >= position:
+            offsets.pop()  # The file ends with a newline.
+        self._offsets = offsets
+
+    def _load_sidecar(self, sidecar_path: str, signature: Tuple[int, int]) -> bool:
+        import struct
+
+        header = struct.Struct(_LINE_INDEX_HEADER)
+        try:
+            with open(sidecar_path, "rb") as f:
+                magic, mtime_ns, size, count = header.unpack(f.read(header.size))
+                if magic != _LINE_INDEX_MAGIC or (mtime_ns, size) != signature:
+                    return False
+                offsets = array("Q")
+                offsets.frombytes(f.read(count * offsets.itemsize))
+        except (OSError, ValueError, struct.error):
+            return False
+        if len(offsets) != count:
+            return False
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        self._offsets = offsets
+        return True
+
+    def _save_sidecar(self, sidecar_path: str, signature: Tuple[int, int]) -> None:
+        import struct
+
+        offsets = self._offsets
+        if sys.byteorder == "big":
+            offsets = array("Q", offsets)
+            offsets.byteswap()
+        header = struct.pack(
+            _LINE_INDEX_HEADER, _LINE_INDEX_MAGIC, *signature, len(offsets)
+        )
+        temp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(header)
+                offsets.tofile(f)
+            os.replace(temp_path, sidecar_path)
+        except OSError as e:
+            # The in-memory index is still usable; only reuse is lost.
+            logger.warning("Could not save line index %s: %s", sidecar_path, e)
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+
+def build_line_index(filepath: str, sidecar: bool = False) -> LineIndex:
+    """
+    Indexes the line offsets of a file for random access to any line.
+
+    Args:
+        filepath (str): The path to the file to be indexed.
+        sidecar (bool): Persist the index to ``filepath + LINE_INDEX_SUFFIX``
+            and reuse it while the file's mtime and size are unchanged.
+
+    Returns:
+        LineIndex: The index; keep it around to fetch lines repeatedly.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        PermissionError: If the user does not have permissions to read the file.
+        IsADirectoryError: If the filepath points to a directory instead of a file.
+    """
+    sidecar_path = filepath + LINE_INDEX_SUFFIX if sidecar else None
+    return LineIndex(filepath, sidecar_path=sidecar_path)
+
+
+#: Default seconds between polls of a FileFollower that found no new data.
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class FileFollower:
+    """
+    Incremental reader for a file that only grows, like ``tail -F``.
+
+    The follower keeps the file open and remembers its byte offset and
+    decoder state, so each poll reads and decodes only the bytes appended
+    since the previous one. A file that shrinks below the offset is treated
+    as truncated and re-read from the start. A path that now names a
+    different inode is treated as rotated: the old file is drained, then the
+    new one is read from the start. Multibyte characters and CRLF pairs split
+    across polls are decoded correctly. With strict error handling, bytes
+    that fail to decode are not skipped: every poll raises again until the
+    follower is closed or reopened with a lenient ``errors`` handler.
+
+    Attributes:
+        filepath (str): The followed path.
+        poll_interval (float): Seconds to wait after a poll that found nothing.
+        errors (str): The codec error handler, as for decode_text().
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        from_start: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        errors: str = "strict",
+    ) -> None:
+        """
+        Opens ``filepath`` for following.
+
+        Args:
+            filepath (str): The path to the file to be followed.
+            poll_interval (float): Seconds the iterators wait between polls
+                that found no new data.
+            from_start (bool): Read the existing content first; if False,
+                only content appended after opening is returned.
+            chunk_size (int): Maximum bytes read per iteration step.
+            errors (str): The codec error handler, as for decode_text().
+
+        Raises:
+            ValueError: If poll_interval or chunk_size is not positive.
+            FileNotFoundError: If the file does not exist.
+            PermissionError: If the user does not have permissions to read the file.
+            IsADirectoryError: If the filepath points to a directory instead of a file.
+        """
+        if poll_interval <= 0:
+            raise ValueError("poll_interval must be positive")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        self.filepath = filepath
+        self.poll_interval = poll_interval
+        self.errors = errors
+        self._chunk_size = chunk_size
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._file: Optional[io.FileIO] = None
+        try:
+            self._open(at_end=not from_start)
+
+        except Exception as e:
+            _log_read_error(filepath, e)
+            raise
+
+    def __enter__(self) -> "FileFollower":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        """bool: True once close() has been called."""
+        return self._file is None
+
+    @property
+    def offset(self) -> int:
+        """int: Byte offset of the next read in the current file."""
+        return self._offset
+
+    def _open(self, at_end: bool = False) -> io.FileIO:
+        f = open(self.filepath, "rb", buffering=0)
+        try:
+            st = os.fstat(f.fileno())
+            self._offset = f.seek(0, os.SEEK_END) if at_end else 0
+        except BaseException:
+            f.close()
+            raise
+        if self._file is not None:
+            self._file.close()
+        self._file = f
+        self._identity = (st.st_dev, st.st_ino)
+        self._decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(errors=self.errors), translate=True
+        )
+        return f
+
+    def _rotated(self) -> bool:
+        try:
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            return False  # Rotated away but not recreated yet; keep waiting.
+        return (st.st_dev, st.st_ino) != self._identity
+
+    def _poll(self, limit: int) -> Optional[Tuple[str, int]]:
+        """Reads up to ``limit`` new bytes; returns the text and byte count."""
+        with self._lock:
+            if self._file is None:
+                return None
+            return self._poll_locked(self._file, limit)
+
+    def _poll_locked(self, f: io.FileIO, limit: int) -> Tuple[str, int]:
+        try:
+            with file_io_metrics.observe("follow") as call:
+                if os.fstat(f.fileno()).st_size < self._offset:
+                    logger.warning("File truncated, reading from start: %s", f.name)
+                    f.seek(0)
+                    self._offset = 0
+                    self._decoder.reset()
+                data = f.read(limit)
+                text = ""
+                if not data and self._rotated():
+                    # The old file is drained; flush its decoder, then switch.
+                    text = self._decoder.decode(b"", final=True)
+                    f = self._open()
+                    call.files_opened = 1
+                    data = f.read(limit)
+                call.bytes_read = len(data)
+                try:
+                    text += self._decoder.decode(data)
+                except UnicodeDecodeError:
+                    # The decoder keeps its state on errors; rewind too, so the
+                    # bytes are read again instead of silently skipped.
+                    f.seek(self._offset)
+                    raise
+                self._offset += len(data)
+                return text, len(data)
+
+        except Exception as e:
+            _log_read_error(self.filepath, e)
+            raise
+
+    def read_new(self) -> str:
+        """
+        Returns the text appended since the previous read, without waiting.
+
+        Returns:
+            str: The new text; empty if nothing was appended.
+
+        Raises:
+            ValueError: If the follower is closed.
+            UnicodeDecodeError: If the new content is not valid UTF-8.
+        """
+        parts = []
+        while True:
+            polled = self._poll(self._chunk_size)
+            if polled is None:
+                raise ValueError("I/O operation on closed FileFollower")
+            text, count = polled
+            parts.append(text)
+            if count < self._chunk_size:
+                return "".join(parts)
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Yields new text as it is appended, blocking between polls.
+
+        Iteration stops once close() is called, including from another
+        thread, which also interrupts the wait between polls.
+
+        Yields:
+            str: Newly appended text, at most ``chunk_size`` bytes' worth.
+        """
+        while True:
+            polled = self._poll(self._chunk_size)
+            if polled is None:
+                return
+            text, count = polled
+            if text:
+                yield text
+            if not count:
+                self._stopped.wait(self.poll_interval)
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        """
+        Yields new text as it is appended, awaiting between polls.
+
+        Reads run on the event loop's default executor. Iteration stops once
+        close() is called.
+
+        Yields:
+            str: Newly appended text, at most ``chunk_size`` bytes' worth.
+        """
+        return self._follow_async()
+
+    async def _follow_async(self) -> AsyncGenerator[str, None]:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        while True:
+            polled = await loop.run_in_executor(None, self._poll, self._chunk_size)
+            if polled is None:
+                return
+            text, count = polled
+            if text:
+                yield text
+            if not count:
+                await asyncio.sleep(self.poll_interval)
+
+    def close(self) -> None:
+        """Stops any iteration and closes the file. Safe to call more than once."""
+        self._stopped.set()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class FileReadResult(
+    namedtuple(
+        "FileReadResult",
+        ["index", "filepath", "content", "error"],
+        defaults=(None, None),
+    )
+):
+    """
+    Outcome of reading one file in a bulk operation.
+
+    Attributes:
+        index (int): Position of the path in the input sequence.
+        filepath (str): The path that was read.
+        content (Optional[str]): The file content, or None if reading failed.
+        error (Optional[BaseException]): The exception raised while reading,
+            or None on success.
+    """
+
+    __slots__ = ()
+
+    @property
+    def ok(self) -> bool:
+        """bool: True if the file was read successfully."""
+        return self.error is None
+
+
+def _read_one(index: int, filepath: str, decompress: bool = False) -> FileReadResult:
+    """Reads one file for the bulk readers, capturing any error."""
+    try:
+        hot_path_logger.info("Attempting to read file: %s", filepath)
+        with file_io_metrics.observe("read_many_files") as call:
+            content = _read_text(filepath, call, decompress)
+        hot_path_logger.info("Successfully read file: %s", filepath)
+        return FileReadResult(index, filepath, content=content)
+
+    except Exception as e:
+        _log_read_error(filepath, e)
+        return FileReadResult(index, filepath, error=e)
+
+
+def read_many_files(
+    filepaths: Iterable[str],
+    max_workers: Optional[int] = None,
+    decompress: bool = False,
+    processes: bool = False,
+) -> List[FileReadResult]:
+    """
+    Reads many files concurrently on a thread or process pool.
+
+    A failure on one file is recorded in its result instead of aborting the
+    batch. zlib, bz2 and lzma release the GIL while decompressing, so threads
+    already decompress in parallel; a process pool additionally parallelises
+    the Python-level decoding, at the cost of pickling each file's content
+    back to the caller.
+
+    Args:
+        filepaths (Iterable[str]): The paths of the files to be read.
+        max_workers (Optional[int]): Number of workers. Defaults to the
+            executor's default.
+        decompress (bool): Transparently decompress gzip, bz2 and xz files,
+            detected by their magic bytes. Other files are read as usual.
+        processes (bool): Use a ProcessPoolExecutor instead of threads.
+
+    Returns:
+        List[FileReadResult]: One result per path, in input order.
+
+    Raises:
+        ValueError: If max_workers is not a positive integer.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    paths = list(filepaths)
+    results: List[Optional[FileReadResult]] = [None] * len(paths)
+    if max_workers is None:
+        cpus = os.cpu_count() or 1
+        max_workers = cpus if processes else min(32, cpus + 4)
+    executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    executor: Executor = executor_class(max_workers=max_workers)
+    with executor:
+        # Unlike executor.map(), which creates a future for every path up
+        # front, results are stored as reads finish, so peak memory is the
+        # results themselves plus a few futures per worker.
+        for result in _iter_read_results(executor, max_workers, paths, decompress):
+            results[result.index] = result
+    return results  # type: ignore[return-value]
+
+
+def _iter_read_results(
+    executor: Executor, workers: int, filepaths: Iterable[str], decompress: bool
+) -> Iterator[FileReadResult]:
+    """Runs _read_one on the executor with a few reads per worker in flight."""
+    from concurrent.futures import FIRST_COMPLETED, as_completed, wait
+
+    max_in_flight = workers * 4
+    pending: Set["Future[FileReadResult]"] = set()
+    for index, filepath in enumerate(filepaths):
+        if len(pending) >= max_in_flight:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+        pending.add(executor.submit(_read_one, index, filepath, decompress))
+    for future in as_completed(pending):
+        yield future.result()
+
+
+def iter_read_many_files(
+    filepaths: Iterable[str], max_workers: Optional[int] = None
+) -> Iterator[FileReadResult]:
+    """
+    Reads many files concurrently, yielding results as they complete.
+
+    Paths are consumed lazily and at most a few reads per worker are kept in
+    flight, so memory stays bounded for very long inputs. Use the ``index``
+    of each result to restore input order if needed.
+
+    Args:
+        filepaths (Iterable[str]): The paths of the files to be read.
+        max_workers (Optional[int]): Number of worker threads. Defaults to the
+            ThreadPoolExecutor default.
+
+    Yields:
+        FileReadResult: One result per path, in completion order.
+
+    Raises:
+        ValueError: If max_workers is not a positive integer.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from _iter_read_results(executor, max_workers, filepaths, False)
+
+
+#: Name of the fast, non-cryptographic algorithm accepted by the hash APIs.
+FAST_HASH_ALGORITHM = "crc32"
+
+
+class _Crc32:
+    """hashlib-style wrapper around zlib.crc32."""
+
+    __slots__ = ("_crc32", "_value")
+
+    name = FAST_HASH_ALGORITHM
+    digest_size = 4
+
+    def __init__(self) -> None:
+        import zlib
+
+        self._crc32 = zlib.crc32
+        self._value = 0
+
+    def update(self, data: Union[bytes, memoryview]) -> None:
+        self._value = self._crc32(data, self._value)
+
+    def hexdigest(self) -> str:
+        return f"{self._value:08x}"
+
+
+def new_hasher(algorithm: str) -> Hasher:
+    """
+    Creates an incremental hasher for ``algorithm``.
+
+    Args:
+        algorithm (str): Any hashlib algorithm name, or ``"crc32"`` for a fast
+            non-cryptographic checksum.
+
+    Returns:
+        Hasher: An object with ``update(data)`` and ``hexdigest()``.
+
+    Raises:
+        ValueError: If the algorithm is not supported.
+    """
+    if algorithm == FAST_HASH_ALGORITHM:
+        return _Crc32()
+    import hashlib
+
+    return hashlib.new(algorithm)
+
+
+def _hash_stream(f: io.FileIO, hasher: Hasher, limit: int, buffer: bytearray) -> int:
+    """Feeds up to ``limit`` bytes of ``f`` to ``hasher``; returns bytes read."""
+    view = memoryview(buffer)
+    total = 0
+    while total < limit:
+        n = f.readinto(view[: min(len(buffer), limit - total)])
+        if not n:
+            break
+        hasher.update(view[:n])
+        total += n
+    return total
+
+
+def hash_file(
+    filepath: str, algorithm: str = "sha256", chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> str:
+    """
+    Digests a file's bytes in fixed-size chunks.
+
+    Only one ``chunk_size`` buffer is held in memory, whatever the file size.
+
+    Args:
+        filepath (str): The path to the file to be hashed.
+        algorithm (str): Any hashlib algorithm name, or ``"crc32"`` for a fast
+            non-cryptographic checksum.
+        chunk_size (int): Number of bytes read per step.
+
+    Returns:
+        str: The hex digest of the file's content.
+
+    Raises:
+        ValueError: If chunk_size is not positive or the algorithm is unknown.
+        FileNotFoundError: If the file does not exist.
+        PermissionError: If the user does not have permissions to read the file.
+        IsADirectoryError: If the filepath points to a directory instead of a file.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+    hasher = new_hasher(algorithm)
+    buffer = bytearray(chunk_size)
+    try:
+        hot_path_logger.info("Attempting to hash file: %s", filepath)
+        with file_io_metrics.observe("hash_file") as call:
+            with open(filepath, "rb", buffering=0) as f:
+                call.files_opened = 1
+                call.bytes_read = _hash_stream(f, hasher, sys.maxsize, buffer)
+        hot_path_logger.info("Successfully hashed file: %s", filepath)
+        return hasher.hexdigest()
+
+    except Exception as e:
+        _log_read_error(filepath, e)
+        raise
+
+
+def _hash_edges(filepath: str, algorithm: str, block_size: int) -> str:
+    """Digests the first and last ``block_size`` bytes of a file."""
+    hasher = new_hasher(algorithm)
+    buffer = bytearray(block_size)
+    with file_io_metrics.observe("find_duplicate_files") as call:
+        with open(filepath, "rb", buffering=0) as f:
+            call.files_opened = 1
+            call.bytes_read = _hash_stream(f, hasher, block_size, buffer)
+            size = os.fstat(f.fileno()).st_size
+            if size > block_size:
+                f.seek(max(block_size, size - block_size))
+                call.bytes_read += _hash_stream(f, hasher, block_size, buffer)
+    return hasher.hexdigest()
+
+
+def _same_content(first: str, second: str, block_size: int) -> bool:
+    """Compares two files byte for byte, stopping at the first difference."""
+    with file_io_metrics.observe("find_duplicate_files") as call:
+        with open(first, "rb") as a, open(second, "rb") as b:
+            call.files_opened = 2
+            while True:
+                block = a.read(block_size)
+                other = b.read(block_size)
+                call.bytes_read += len(block) + len(other)
+                if block != other:
+                    return False
+                if not block:
+                    return True
+
+
+def _split_identical(paths: List[str], block_size: int) -> List[List[str]]:
+    """
+    Splits files whose checksums collided into groups of identical content,
+    comparing each file with one member of every group found so far.
+    """
+    groups: List[List[str]] = []
+    for path in paths:
+        try:
+            for members in groups:
+                if _same_content(members[0], path, block_size):
+                    members.append(path)
+                    break
+            else:
+                groups.append([path])
+        except Exception as e:
+            _log_read_error(getattr(e, "filename", None) or path, e)
+    return [members for members in groups if len(members) > 1]
+
+
+def _digest_or_none(
+    function: Callable[..., str], filepath: str, *args: object
+) -> Optional[str]:
+    """Runs one hashing step for find_duplicate_files, logging failures."""
+    try:
+        return function(filepath, *args)
+    except Exception as e:
+        _log_read_error(filepath, e)
+        return None
+
+
+def find_duplicate_files(
+    filepaths: Iterable[str],
+    algorithm: str = "sha256",
+    max_workers: Optional[int] = None,
+    block_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[List[str]]:
+    """
+    Finds groups of files with identical content.
+
+    Candidates are narrowed in three passes so that most files are never read
+    in full: files are grouped by size, then by a digest of their first and
+    last ``block_size`` bytes, and only files that still collide are hashed
+    in full. Both hashing passes run on a thread pool. Files that cannot be
+    read are logged and left out.
+
+    A 32-bit ``"crc32"`` checksum collides too easily to prove equality, so
+    with that algorithm every group is confirmed by comparing the files byte
+    for byte before it is returned. hashlib digests are trusted as they are.
+
+    Args:
+        filepaths (Iterable[str]): The paths of the files to compare.
+        algorithm (str): Any hashlib algorithm name, or ``"crc32"`` for a fast
+            non-cryptographic checksum.
+        max_workers (Optional[int]): Number of worker threads. Defaults to the
+            ThreadPoolExecutor default.
+        block_size (int): Bytes hashed at each end of a file in the partial
+            pass.
+
+    Returns:
+        List[List[str]]: Sorted groups of two or more paths with equal content.
+
+    Raises:
+        ValueError: If block_size or max_workers is not positive, or the
+            algorithm is unknown.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if block_size <= 0:
+        raise ValueError("block_size must be a positive integer")
+    new_hasher(algorithm)  # Fail early on unknown algorithms.
+
+    by_size: Dict[int, List[str]] = {}
+    for filepath in dict.fromkeys(filepaths):
+        try:
+            st = os.stat(filepath)
+        except OSError as e:
+            _log_read_error(filepath, e)
+            continue
+        if stat.S_ISREG(st.st_mode):
+            by_size.setdefault(st.st_size, []).append(filepath)
+
+    duplicates: List[List[str]] = []
+    candidates: List[Tuple[int, str]] = []
+    for size, paths in by_size.items():
+        if len(paths) < 2:
+            continue
+        if size == 0:
+            duplicates.append(paths)
+        else:
+            candidates.extend((size, path) for path in paths)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def group(
+            items: List[Tuple[int, str]], function: Callable[..., str], *args: object
+        ) -> List[List[Tuple[int, str]]]:
+            digests = executor.map(
+                lambda item: _digest_or_none(function, item[1], *args), items
+            )
+            groups: Dict[Tuple[int, str], List[Tuple[int, str]]] = {}
+            for item, digest in zip(items, digests):
+                if digest is not None:
+                    groups.setdefault((item[0], digest), []).append(item)
+            return [members for members in groups.values() if len(members) > 1]
+
+        full_pass: List[Tuple[int, str]] = []
+        for members in group(candidates, _hash_edges, algorithm, block_size):
+            if members[0][0] <= 2 * block_size:
+                # Both edge blocks together already covered the whole file.
+                duplicates.append([path for _, path in members])
+            else:
+                full_pass.extend(members)
+        for members in group(full_pass, hash_file, algorithm):
+            duplicates.append([path for _, path in members])
+
+        if algorithm == FAST_HASH_ALGORITHM:
+            confirmed = executor.map(
+                lambda paths: _split_identical(paths, block_size), duplicates
+            )
+            duplicates = [paths for groups in confirmed for paths in groups]
+
+    return sorted(sorted(paths) for paths in duplicates)
+
+
+#: Bytes scanned per step when counting newlines between matches.
+_NEWLINE_COUNT_WINDOW = 1024 * 1024
+
+
+class SearchMatch(
+    namedtuple("SearchMatch", ["filepath", "line_number", "offset", "line"])
+):
+    """
+    One match found by search_files.
+
+    Attributes:
+        filepath (str): The file containing the match.
+        line_number (int): One-based number of the line the match starts on.
+        offset (int): Byte offset of the start of the match in the file.
+        line (str): The matching line without its newline, decoded as UTF-8
+            with undecodable bytes replaced.
+    """
+
+    __slots__ = ()
+
+
+def _count_newlines(data: mmap.mmap, start: int, end: int) -> int:
+    """Counts ``\\n`` in ``data[start:end]`` without copying it all at once."""
+    count = 0
+    for window in range(start, end, _NEWLINE_COUNT_WINDOW):
+        count += data[window : min(window + _NEWLINE_COUNT_WINDOW, end)].count(b"\n")
+    return count
+
+
+def _iter_literal(data: mmap.mmap, needle: bytes) -> Iterator[int]:
+    """Yields the start of every non-overlapping occurrence of ``needle``."""
+    position = data.find(needle)
+    while position >= 0:
+        yield position
+        position = data.find(needle, position + len(needle))
+
+
+def _search_file(
+    filepath: str, pattern: Union[bytes, Pattern[bytes]]
+) -> List[SearchMatch]:
+    """Finds every match in one memory-mapped file, capturing read errors."""
+    matches: List[SearchMatch] = []
+    try:
+        with file_io_metrics.observe("search_files") as call:
+            with open(filepath, "rb") as f:
+                call.files_opened = 1
+                size = os.fstat(f.fileno()).st_size
+                if not size:
+                    return matches
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    if isinstance(pattern, bytes):
+                        positions = _iter_literal(data, pattern)
+                    else:
+                        positions = (m.start() for m in pattern.finditer(data))
+                    line_number, counted = 1, 0
+                    for position in positions:
+                        line_number += _count_newlines(data, counted, position)
+                        counted = position
+                        start = data.rfind(b"\n", 0, position) + 1
+                        end = data.find(b"\n", position)
+                        line = data[start : size if end < 0 else end]
+                        matches.append(
+                            SearchMatch(
+                                filepath,
+                                line_number,
+                                position,
+                                line.decode("utf-8", "replace").rstrip("\r"),
+                            )
+                        )
+                call.bytes_read = size
+    except Exception as e:
+        _log_read_error(filepath, e)
+    return matches
+
+
+def _iter_search_paths(paths: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Expands directories in ``paths`` into the files beneath them."""
+    from my_project.file_index import scan_directory
+
+    for path in [paths] if isinstance(paths, str) else paths:
+        if os.path.isdir(path):
+            for filepath, _ in scan_directory(path):
+                yield filepath
+        else:
+            yield path
+
+
+def search_files(
+    pattern: Union[str, bytes, Pattern[bytes]],
+    paths: Union[str, Iterable[str]],
+    max_workers: Optional[int] = None,
+    processes: bool = True,
+) -> Iterator[SearchMatch]:
+    """
+    Searches files for a literal or a regular expression without decoding them.
+
+    Each file is memory-mapped and scanned as bytes; only matching lines are
+    decoded. Files are searched in parallel, on a process pool by default,
+    and each file's matches are yielded as soon as that file is done, so
+    results arrive in file completion order and in offset order within a
+    file. Files that cannot be read are logged and skipped.
+
+    Args:
+        pattern (Union[str, bytes, Pattern[bytes]]): A literal (``str`` is
+            encoded as UTF-8) or a regex compiled from a bytes pattern.
+        paths (Union[str, Iterable[str]]): Files or directories to search;
+            directories are walked recursively without following symlinks.
+        max_workers (Optional[int]): Number of workers. Defaults to the
+            executor's default.
+        processes (bool): Search on a ProcessPoolExecutor; if False, on
+            threads, which suits few or small files better.
+
+    Yields:
+        SearchMatch: Each match with its file, line number and byte offset.
+
+    Raises:
+        TypeError: If a regex was compiled from a str pattern.
+        ValueError: If the literal is empty or max_workers is not positive.
+    """
+    from concurrent.futures import (
+        FIRST_COMPLETED,
+        ProcessPoolExecutor,
+        ThreadPoolExecutor,
+        as_completed,
+        wait,
+    )
+
+    if isinstance(pattern, str):
+        pattern = pattern.encode("utf-8")
+    if isinstance(pattern, bytes):
+        if not pattern:
+            raise ValueError("pattern must not be empty")
+    elif not isinstance(pattern.pattern, bytes):
+        raise TypeError("regex patterns must be compiled from bytes")
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor_class(max_workers=max_workers) as executor:
+        max_in_flight = max_workers * 4
+        pending: Set["Future[List[SearchMatch]]"] = set()
+        for filepath in _iter_search_paths(paths):
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+            pending.add(executor.submit(_search_file, filepath, pattern))
+        for future in as_completed(pending):
+            yield from future.result()
+
+
+class AsyncFileReader:
+    """
+    Runs the blocking readers on a bounded thread pool for asyncio code.
+
+    A semaphore caps how many files are open at once across all coroutines
+    using the reader on one event loop, so bursts of requests queue instead
+    of exhausting file descriptors or the pool. A reader can be shared by
+    several event loops, each of which gets its own cap; it keeps no strong
+    reference to any loop.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+    ) -> None:
+        """
+        Creates the reader and its executor.
+
+        Args:
+            max_workers (Optional[int]): Number of executor threads. Defaults
+                to the ThreadPoolExecutor default.
+            max_open_files (int): Maximum number of files open at once.
+
+        Raises:
+            ValueError: If max_workers or max_open_files is not positive.
+        """
+        if max_open_files <= 0:
+            raise ValueError("max_open_files must be a positive integer")
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="file_utils"
+        )
+        self._max_open_files = max_open_files
+        self._semaphores: MutableMapping[
+            asyncio.AbstractEventLoop, weakref.ref[asyncio.Semaphore]
+        ] = weakref.WeakKeyDictionary()
+        self._semaphores_lock = threading.Lock()
+
+    async def __aenter__(self) -> "AsyncFileReader":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def _open_files(self) -> asyncio.Semaphore:
+        import asyncio
+
+        # A semaphore binds to the loop that first waits on it and then
+        # references that loop, so only a weak reference is kept here. The
+        # coroutines holding it keep it alive; an unused one is as good as
+        # a new one.
+        loop = asyncio.get_running_loop()
+        with self._semaphores_lock:
+            ref = self._semaphores.get(loop)
+            semaphore = ref() if ref is not None else None
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self._max_open_files)
+                self._semaphores[loop] = weakref.ref(semaphore)
+        return semaphore
+
+    async def read_file_content(self, filepath: str) -> Optional[str]:
+        """
+        Awaitable equivalent of read_file_content.
+
+        Args:
+            filepath (str): The path to the file to be read.
+
+        Returns:
+            Optional[str]: The content of the file as a string, or None if an
+                unexpected error occurs.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            PermissionError: If the user does not have permissions to read the file.
+            IsADirectoryError: If the filepath points to a directory instead of a file.
+            UnicodeDecodeError: If the file is not UTF-8 encoded or contains invalid characters.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        async with self._open_files():
+            return await loop.run_in_executor(
+                self._executor, read_file_content, filepath
+            )
+
+    async def iter_file_chunks(
+        self, filepath: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncGenerator[str, None]:
+        """
+        Asynchronous equivalent of iter_file_chunks.
+
+        Each chunk is read and decoded on the executor. The file counts
+        against max_open_files until the iterator is exhausted or closed.
+
+        Args:
+            filepath (str): The path to the file to be read.
+            chunk_size (int): Maximum number of bytes to read per chunk.
+
+        Yields:
+            str: Decoded, newline-translated text.
+
+        Raises:
+            ValueError: If chunk_size is not a positive integer.
+            FileNotFoundError: If the file does not exist.
+            PermissionError: If the user does not have permissions to read the file.
+            IsADirectoryError: If the filepath points to a directory instead of a file.
+            UnicodeDecodeError: If the file is not UTF-8 encoded or contains invalid characters.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        chunks = iter_file_chunks(filepath, chunk_size)
+        pending: Optional[Future[Optional[str]]] = None
+        async with self._open_files():
+            try:
+                while True:
+                    pending = self._executor.submit(next, chunks, None)
+                    chunk = await asyncio.wrap_future(pending)
+                    if chunk is None:
+                        break
+                    yield chunk
+            finally:
+                if pending is not None and not pending.done():
+                    # Cancelled mid-read: a running generator cannot be
+                    # closed, so close it on its worker once the read returns.
+                    pending.add_done_callback(lambda _: chunks.close())
+                else:
+                    await loop.run_in_executor(self._executor, chunks.close)
+
+    async def _read_one(self, index: int, filepath: str) -> FileReadResult:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        async with self._open_files():
+            return await loop.run_in_executor(
+                self._executor, _read_one, index, filepath
+            )
+
+    async def read_many_files(self, filepaths: Iterable[str]) -> List[FileReadResult]:
+        """
+        Asynchronous equivalent of read_many_files.
+
+        Args:
+            filepaths (Iterable[str]): The paths of the files to be read.
+
+        Returns:
+            List[FileReadResult]: One result per path, in input order.
+        """
+        import asyncio
+
+        return list(
+            await asyncio.gather(
+                *(self._read_one(i, path) for i, path in enumerate(filepaths))
+            )
+        )
+
+    def close(self) -> None:
+        """Shuts down the executor, waiting for running reads to finish."""
+        self._executor.shutdown(wait=True)
+
+
+_default_async_reader_instance: Optional[AsyncFileReader] = None
+_default_async_reader_lock = threading.Lock()
+
+
+def _default_async_reader() -> AsyncFileReader:
+    """Returns the AsyncFileReader shared by every event loop."""
+    global _default_async_reader_instance
+
+    with _default_async_reader_lock:
+        if _default_async_reader_instance is None:
+            _default_async_reader_instance = AsyncFileReader()
+        return _default_async_reader_instance
+
+
+async def read_file_content_async(
+    filepath: str, reader: Optional[AsyncFileReader] = None
+) -> Optional[str]:
+    """
+    Reads a file without blocking the event loop.
+
+    Args:
+        filepath (str): The path to the file to be read.
+        reader (Optional[AsyncFileReader]): The reader to run on. Defaults to
+            a reader shared by all event loops.
+
+    Returns:
+        Optional[str]: The content of the file as a string, or None if an
+            unexpected error occurs.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        PermissionError: If the user does not have permissions to read the file.
+        IsADirectoryError: If the filepath points to a directory instead of a file.
+        UnicodeDecodeError: If the file is not UTF-8 encoded or contains invalid characters.
+    """
+    reader = reader or _default_async_reader()
+    return await reader.read_file_content(filepath)
+
+
+async def aiter_file_chunks(
+    filepath: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    reader: Optional[AsyncFileReader] = None,
+) -> AsyncIterator[str]:
+    """
+    Lazily reads a UTF-8 file in chunks without blocking the event loop.
+
+    Args:
+        filepath (str): The path to the file to be read.
+        chunk_size (int): Maximum number of bytes to read per chunk.
+        reader (Optional[AsyncFileReader]): The reader to run on. Defaults to
+            a reader shared by all event loops.
+
+    Yields:
+        str: Decoded, newline-translated text.
+
+    Raises:
+        ValueError: If chunk_size is not a positive integer.
+        FileNotFoundError: If the file does not exist.
+        PermissionError: If the user does not have permissions to read the file.
+        IsADirectoryError: If the filepath points to a directory instead of a file.
+        UnicodeDecodeError: If the file is not UTF-8 encoded or contains invalid characters.
+    """
+    reader = reader or _default_async_reader()
+    chunks = reader.iter_file_chunks(filepath, chunk_size)
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        await chunks.aclose()
+
+
+async def read_many_files_async(
+    filepaths: Iterable[str], reader: Optional[AsyncFileReader] = None
+) -> List[FileReadResult]:
+    """
+    Reads many files concurrently without blocking the event loop.
+
+    The returned coroutine can itself be passed to asyncio.gather alongside
+    other work. Per-file errors are recorded on the results.
+
+    Args:
+        filepaths (Iterable[str]): The paths of the files to be read.
+        reader (Optional[AsyncFileReader]): The reader to run on. Defaults to
+            a reader shared by all event loops.
+
+    Returns:
+        List[FileReadResult]: One result per path, in input order.
+    """
+    reader = reader or _default_async_reader()
+    return await reader.read_many_files(filepaths)
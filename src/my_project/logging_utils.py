@@ -0,0 +1,153 @@
+"""Logging configuration, including a non-blocking queue-based mode."""
+
+from __future__ import annotations
+
+import atexit
+import itertools
+import logging
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import logging.handlers
+    from typing import IO, Optional
+
+#: Format used by the command-line entry point.
+DEFAULT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+#: Logger that receives per-call records from hot paths such as file reads.
+HOT_PATH_LOGGER_NAME = "my_project.hotpath"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Passes one in every ``every`` records below WARNING.
+
+    Warnings and errors are never dropped.
+    """
+
+    def __init__(self, every: int) -> None:
+        """
+        Creates the filter.
+
+        Args:
+            every (int): Keep one record out of this many.
+
+        Raises:
+            ValueError: If every is not a positive integer.
+        """
+        if every <= 0:
+            raise ValueError("every must be a positive integer")
+        super().__init__()
+        self.every = every
+        self._counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        return next(self._counter) % self.every == 0
+
+
+def get_hot_path_logger() -> logging.Logger:
+    """
+    Returns the logger used for per-call records on hot paths.
+
+    Returns:
+        logging.Logger: The shared hot-path logger.
+    """
+    return logging.getLogger(HOT_PATH_LOGGER_NAME)
+
+
+def configure_hot_path_logging(
+    level: Optional[int] = None, sample_every: int = 1
+) -> None:
+    """
+    Adjusts the level and sampling of hot-path records.
+
+    Args:
+        level (Optional[int]): Minimum level for hot-path records, or None to
+            inherit from the parent loggers. Use logging.WARNING to silence
+            per-call INFO records entirely.
+        sample_every (int): Keep one in this many INFO/DEBUG records.
+
+    Raises:
+        ValueError: If sample_every is not a positive integer.
+    """
+    hot_path_logger = get_hot_path_logger()
+    hot_path_logger.setLevel(logging.NOTSET if level is None else level)
+    for existing in list(hot_path_logger.filters):
+        if isinstance(existing, SamplingFilter):
+            hot_path_logger.removeFilter(existing)
+    if sample_every != 1:
+        hot_path_logger.addFilter(SamplingFilter(sample_every))
+
+
+def configure_logging(
+    level: int = logging.INFO,
+    fmt: str = DEFAULT_FORMAT,
+    non_blocking: bool = False,
+    stream: Optional[IO[str]] = None,
+    force: bool = False,
+) -> Optional[logging.handlers.QueueListener]:
+    """
+    Configures the root logger for applications built on this package.
+
+    Library modules never call this on import; it is meant for entry points.
+    In non-blocking mode the calling thread only enqueues records, and a
+    QueueListener thread formats and writes them. The listener is stopped
+    (and the queue flushed) at interpreter exit or by stop_logging().
+
+    Args:
+        level (int): Level of the root logger.
+        fmt (str): Format string for emitted records.
+        non_blocking (bool): Route records through a QueueHandler.
+        stream (Optional[IO[str]]): Destination stream. Defaults to stderr.
+        force (bool): Replace existing root handlers. Without it, the call
+            does nothing if the root logger already has handlers, matching
+            logging.basicConfig.
+
+    Returns:
+        Optional[logging.handlers.QueueListener]: The started listener in
+            non-blocking mode, otherwise None.
+    """
+    global _listener, _queue_handler
+
+    root = logging.getLogger()
+    if root.handlers and not force:
+        return None
+    stop_logging()
+
+    handler: logging.Handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(fmt))
+    if non_blocking:
+        # Only the non-blocking mode pays for importing these.
+        import queue
+        from logging.handlers import QueueHandler, QueueListener
+
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        handler = _queue_handler = QueueHandler(log_queue)
+        # The listener's handler applies fmt; only merge message args here.
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+    logging.basicConfig(level=level, handlers=[handler], force=True)
+    return _listener
+
+
+def stop_logging() -> None:
+    """Stops the non-blocking listener, flushing queued records, if running."""
+    global _listener, _queue_handler
+
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+
+
+atexit.register(stop_logging)
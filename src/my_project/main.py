@@ -1,17 +1,42 @@
 """Main application entry point with improved error handling."""
 
-import argparse
+from __future__ import annotations
+
+import itertools
 import logging
 import sys
-from typing import NoReturn
+from collections import namedtuple
+
+from my_project.logging_utils import configure_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
+# Heavy modules (argparse, asyncio, concurrent.futures, file_utils, typing)
+# are imported inside the functions that need them to keep startup fast.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import argparse
+    from concurrent.futures import Future
+    from typing import (
+        IO,
+        Any,
+        Deque,
+        Iterable,
+        Iterator,
+        List,
+        NoReturn,
+        Optional,
+        Tuple,
+    )
 
 logger = logging.getLogger(__name__)
 
+#: Default number of names validated and formatted together in batch mode.
+DEFAULT_BATCH_SIZE = 10_000
+
+# Shared by sample_function and the bulk fast path of _greet_chunk.
+_GREETING_PREFIX = "Hello, "
+_GREETING_SUFFIX = "! Welcome to the template repository."
+_EMPTY_NAME_MESSAGE = "Name cannot be empty or contain only whitespace"
+
 
 def sample_function(name: str) -> str:
     """
@@ -31,9 +56,231 @@ def sample_function(name: str) -> str:
         raise TypeError(f"Expected string for name, got {type(name).__name__}")
 
     if not name or name.isspace():
-        raise ValueError("Name cannot be empty or contain only whitespace")
+        raise ValueError(_EMPTY_NAME_MESSAGE)
+
+    return f"{_GREETING_PREFIX}{name}{_GREETING_SUFFIX}"
+
+
+class GreetingBatch(namedtuple("GreetingBatch", ["start", "greetings", "errors"])):
+    """
+    Greetings for a contiguous run of names.
+
+    Attributes:
+        start (int): Index of the first name of this batch in the whole input.
+        greetings (List[Optional[str]]): One entry per name, None where the
+            name was invalid.
+        errors (List[Tuple[int, Exception]]): ``(index, error)`` for each
+            invalid name, with the index counted from the start of the input
+            and the error that sample_function would have raised.
+    """
+
+    __slots__ = ()
+
+    @property
+    def ok(self) -> bool:
+        """bool: True if every name in the batch was valid."""
+        return not self.errors
+
+
+def _greet_chunk(names: List[Any], start: int) -> GreetingBatch:
+    """Validates and formats one chunk of names in bulk."""
+    if not names or set(map(type, names)) == {str}:
+        # Fast path: one comprehension does validation and formatting, and
+        # errors are only looked for when a None was actually produced.
+        greetings: List[Optional[str]] = [
+            f"{_GREETING_PREFIX}{name}{_GREETING_SUFFIX}"
+            if name and not name.isspace()
+            else None
+            for name in names
+        ]
+        errors: List[Tuple[int, Exception]] = []
+        if None in greetings:
+            errors = [
+                (start + i, ValueError(_EMPTY_NAME_MESSAGE))
+                for i, greeting in enumerate(greetings)
+                if greeting is None
+            ]
+        return GreetingBatch(start, greetings, errors)
+
+    batch = GreetingBatch(start, [], [])
+    for i, name in enumerate(names, start):
+        try:
+            batch.greetings.append(sample_function(name))
+        except (TypeError, ValueError) as e:
+            batch.greetings.append(None)
+            batch.errors.append((i, e))
+    return batch
+
+
+def _iter_name_chunks(names: Any, batch_size: int) -> Iterator[List[Any]]:
+    """Splits names into lists of at most batch_size items."""
+    if hasattr(names, "to_pylist") and hasattr(names, "slice"):
+        # pyarrow Array or ChunkedArray; nulls become None.
+        for offset in range(0, len(names), batch_size):
+            yield names.slice(offset, batch_size).to_pylist()
+    elif hasattr(names, "tolist") and hasattr(names, "ndim"):
+        # NumPy array; tolist() turns numpy.str_ items into plain str.
+        for offset in range(0, len(names), batch_size):
+            yield names[offset : offset + batch_size].tolist()
+    else:
+        iterator = iter(names)
+        while True:
+            chunk = list(itertools.islice(iterator, batch_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_sample_function_batches(
+    names: Iterable[Any], batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[GreetingBatch]:
+    """
+    Greets a stream of names batch by batch with bounded memory.
+
+    Only one batch of names and greetings is held at a time. Invalid names
+    are reported on their batch instead of raising.
+
+    Args:
+        names (Iterable[Any]): Any iterable of names, a NumPy string array or
+            a pyarrow string array.
+        batch_size (int): Number of names processed per batch.
+
+    Yields:
+        GreetingBatch: The greetings and errors for each consecutive batch.
+
+    Raises:
+        ValueError: If batch_size is not a positive integer.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be a positive integer")
+    start = 0
+    for chunk in _iter_name_chunks(names, batch_size):
+        yield _greet_chunk(chunk, start)
+        start += len(chunk)
+
+
+def sample_function_batch(names: Iterable[Any]) -> GreetingBatch:
+    """
+    Greets many names at once, collecting invalid entries by index.
+
+    Args:
+        names (Iterable[Any]): Any iterable of names, a NumPy string array or
+            a pyarrow string array.
+
+    Returns:
+        GreetingBatch: One greeting per name (None where invalid) and the
+            errors sample_function would have raised, keyed by index.
+    """
+    if isinstance(names, list):
+        return _greet_chunk(names, 0)
+    batch = GreetingBatch(0, [], [])
+    for chunk in iter_sample_function_batches(names):
+        batch.greetings.extend(chunk.greetings)
+        batch.errors.extend(chunk.errors)
+    return batch
+
+
+def _read_names(input_path: str) -> Iterator[str]:
+    """Yields newline-stripped names from a file, or stdin for "-"."""
+    from my_project.file_utils import iter_file_lines
 
-    return f"Hello, {name}! Welcome to the template repository."
+    lines: Iterable[str] = (
+        sys.stdin if input_path == "-" else iter_file_lines(input_path)
+    )
+    for line in lines:
+        yield line.rstrip("\n")
+
+
+def _write_batch(out: IO[str], batch: GreetingBatch) -> None:
+    """Writes the valid greetings of a batch and logs its errors."""
+    greetings = [greeting for greeting in batch.greetings if greeting is not None]
+    if greetings:
+        out.write("\n".join(greetings))
+        out.write("\n")
+    for index, error in batch.errors:
+        logger.error("Line %d: %s", index + 1, error)
+
+
+def _greet_in_processes(
+    input_path: str, workers: int, batch_size: int
+) -> Iterator[GreetingBatch]:
+    """Formats name batches in a process pool, yielding them in order."""
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    pending: Deque["Future[GreetingBatch]"] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        start = 0
+        for chunk in _iter_name_chunks(_read_names(input_path), batch_size):
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+            pending.append(executor.submit(_greet_chunk, chunk, start))
+            start += len(chunk)
+        while pending:
+            yield pending.popleft().result()
+
+
+def greet_stream(
+    input_path: str,
+    output_path: str = "-",
+    workers: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Tuple[int, int]:
+    """
+    Greets newline-delimited names from a file or stdin.
+
+    Greetings are written one per line, in input order, through a buffered
+    writer. Invalid lines are skipped and logged with their line number. With
+    more than one worker, batches are formatted in a process pool; at most
+    two batches per worker are in flight, so memory stays bounded.
+
+    Args:
+        input_path (str): The file to read names from, or "-" for stdin.
+        output_path (str): The file to write greetings to, or "-" for stdout.
+        workers (int): Number of worker processes. 1 runs in-process.
+        batch_size (int): Number of names sent to a worker at once.
+
+    Returns:
+        Tuple[int, int]: The number of lines read and the number of invalid
+            lines.
+
+    Raises:
+        FileNotFoundError: If the input file does not exist.
+        PermissionError: If the input or output file cannot be opened.
+        IsADirectoryError: If the input path points to a directory.
+        UnicodeDecodeError: If the input is not valid UTF-8.
+    """
+    lines = 0
+    errors = 0
+    out: IO[str] = (
+        sys.stdout
+        if output_path == "-"
+        else open(output_path, "w", encoding="utf-8", buffering=1 << 20)
+    )
+    try:
+        if workers > 1:
+            batches = _greet_in_processes(input_path, workers, batch_size)
+        else:
+            batches = iter_sample_function_batches(_read_names(input_path), batch_size)
+        for batch in batches:
+            _write_batch(out, batch)
+            lines += len(batch.greetings)
+            errors += len(batch.errors)
+        out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return lines, errors
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for options that require an integer >= 1."""
+    import argparse
+
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
 
 
 def parse_args() -> argparse.Namespace:
@@ -41,13 +288,125 @@ def parse_args() -> argparse.Namespace:
     Parse command-line arguments.
 
     Returns:
-        argparse.Namespace: Parsed arguments containing the name parameter.
+        argparse.Namespace: Parsed arguments containing the name, input,
+            output, workers and profiling parameters, plus the options of
+            the serve command when it is given.
     """
+    import argparse
+
     parser = argparse.ArgumentParser(description="Template Python Application")
     parser.add_argument("--name", type=str, default="World", help="Name to greet")
+    parser.add_argument(
+        "--input",
+        metavar="FILE",
+        help="Greet newline-delimited names from FILE ('-' for stdin)",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        default="-",
+        help="Write greetings to FILE ('-' for stdout, the default)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=1,
+        help="Number of worker processes for --input (default: 1)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="Run under cProfile and write the profile to FILE",
+    )
+    parser.add_argument(
+        "--profile-format",
+        choices=["pstats", "collapsed"],
+        default="pstats",
+        help="Format of --profile output (default: pstats)",
+    )
+    parser.add_argument(
+        "--trace-malloc",
+        metavar="N",
+        type=_positive_int,
+        nargs="?",
+        const=10,
+        help="Run under tracemalloc and log peak memory and the top N "
+        "allocation sites (default N: 10)",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run a long-lived server answering greeting and read requests"
+    )
+    serve_parser.add_argument(
+        "--host", default="127.0.0.1", help="TCP host to bind (default: 127.0.0.1)"
+    )
+    serve_parser.add_argument(
+        "--port", type=int, default=8765, help="TCP port to bind (default: 8765)"
+    )
+    serve_parser.add_argument(
+        "--unix", metavar="PATH", help="Listen on a Unix socket instead of TCP"
+    )
+    serve_parser.add_argument(
+        "--max-connections",
+        type=_positive_int,
+        default=256,
+        help="Maximum simultaneous connections (default: 256)",
+    )
+    serve_parser.add_argument(
+        "--pipeline-depth",
+        type=_positive_int,
+        default=64,
+        help="Maximum in-flight requests per connection (default: 64)",
+    )
+    serve_parser.add_argument(
+        "--root",
+        metavar="DIR",
+        default=".",
+        help="Only allow read requests under DIR (default: the working directory)",
+    )
     return parser.parse_args()
 
 
+def _run(args: argparse.Namespace) -> int:
+    """
+    Runs the command selected by the parsed arguments.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments.
+
+    Returns:
+        int: The process exit status.
+    """
+    if args.command == "serve":
+        import asyncio
+
+        from my_project.server import serve
+
+        asyncio.run(
+            serve(
+                host=args.host,
+                port=args.port,
+                unix_path=args.unix,
+                max_connections=args.max_connections,
+                pipeline_depth=args.pipeline_depth,
+                root=args.root,
+            )
+        )
+        return 0
+
+    if args.input is not None:
+        lines, errors = greet_stream(args.input, args.output, args.workers)
+        if errors:
+            logger.error("%d of %d lines were invalid", errors, lines)
+            return 1
+        return 0
+
+    message = sample_function(args.name)
+    logger.info(message)
+    return 0
+
+
 def main() -> NoReturn:
     """
     Main function to run the script.
@@ -55,11 +414,22 @@ def main() -> NoReturn:
     Raises:
         SystemExit: Always exits with status 0 on success or 1 on error.
     """
+    configure_logging()
     try:
         args = parse_args()
-        message = sample_function(args.name)
-        logger.info(message)
-        sys.exit(0)
+        if args.profile is None and args.trace_malloc is None:
+            sys.exit(_run(args))
+
+        from my_project.profiling import run_profiled
+
+        sys.exit(
+            run_profiled(
+                lambda: _run(args),
+                profile_path=args.profile,
+                profile_format=args.profile_format,
+                trace_malloc_top=args.trace_malloc,
+            )
+        )
 
     except ValueError as e:
         logger.error("Invalid input value: %s", str(e))
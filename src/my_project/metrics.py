@@ -0,0 +1,377 @@
+"""Lock-cheap counters and latency histograms for file I/O.
+
+Each thread records into its own shard, so the hot path never takes a lock;
+the registry lock is only held when a thread records for the first time,
+when a thread exits and while a snapshot collects the shards. When a thread
+exits its counts are merged into a single retired total, so short-lived
+worker threads neither lose their counts nor accumulate shards.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+import weakref
+from collections import namedtuple
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from types import TracebackType
+    from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+#: Upper bounds, in seconds, of the default call-duration histogram buckets.
+DEFAULT_DURATION_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class OperationStats(
+    namedtuple(
+        "OperationStats",
+        [
+            "calls",
+            "bytes_read",
+            "files_opened",
+            "errors",
+            "duration_buckets",
+            "duration_counts",
+            "duration_sum",
+        ],
+    )
+):
+    """
+    Merged metrics of one operation in a snapshot.
+
+    Attributes:
+        calls (int): Completed calls, successful or not.
+        bytes_read (int): Bytes read from disk.
+        files_opened (int): Files successfully opened.
+        errors (Dict[str, int]): Failed calls by exception type name.
+        duration_buckets (Tuple[float, ...]): Histogram upper bounds, seconds.
+        duration_counts (Tuple[int, ...]): Calls per bucket (not cumulative);
+            the last entry counts calls slower than every bound.
+        duration_sum (float): Total duration of all calls, in seconds.
+    """
+
+    __slots__ = ()
+
+
+class _OperationShard:
+    """Mutable per-thread, per-operation accumulator."""
+
+    __slots__ = (
+        "calls",
+        "bytes_read",
+        "files_opened",
+        "errors",
+        "duration_counts",
+        "duration_sum",
+    )
+
+    def __init__(self, bucket_count: int) -> None:
+        self.calls = 0
+        self.bytes_read = 0
+        self.files_opened = 0
+        self.errors: Dict[str, int] = {}
+        self.duration_counts = [0] * (bucket_count + 1)
+        self.duration_sum = 0.0
+
+    def merged(self, other: _OperationShard) -> _OperationShard:
+        """Returns a new shard holding the sum of this shard and ``other``."""
+        total = _OperationShard(len(self.duration_counts) - 1)
+        total.calls = self.calls + other.calls
+        total.bytes_read = self.bytes_read + other.bytes_read
+        total.files_opened = self.files_opened + other.files_opened
+        total.errors = dict(self.errors)
+        for name, count in list(other.errors.items()):
+            total.errors[name] = total.errors.get(name, 0) + count
+        total.duration_counts = [
+            a + b for a, b in zip(self.duration_counts, other.duration_counts)
+        ]
+        total.duration_sum = self.duration_sum + other.duration_sum
+        return total
+
+
+class _ThreadToken:
+    """Lives in a thread's local storage; its finalizer retires the shards."""
+
+    __slots__ = ("__weakref__",)
+
+
+class CallObserver:
+    """
+    Context manager that records one call into a FileIOMetrics registry.
+
+    Created by FileIOMetrics.observe(). Code inside the ``with`` block adds
+    to ``bytes_read`` and ``files_opened``; on exit the duration and, if an
+    exception escapes, its type are recorded.
+    """
+
+    __slots__ = ("_metrics", "_operation", "_start", "bytes_read", "files_opened")
+
+    def __init__(self, metrics: FileIOMetrics, operation: str) -> None:
+        self._metrics = metrics
+        self._operation = operation
+        self._start = 0.0
+        self.bytes_read = 0
+        self.files_opened = 0
+
+    def __enter__(self) -> CallObserver:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        duration = time.perf_counter() - self._start
+        metrics = self._metrics
+        # Inlined FileIOMetrics.record(): this runs once per file I/O call.
+        shard = metrics._shard(self._operation)
+        shard.calls += 1
+        shard.bytes_read += self.bytes_read
+        shard.files_opened += self.files_opened
+        shard.duration_sum += duration
+        shard.duration_counts[bisect.bisect_left(metrics.buckets, duration)] += 1
+        if exc_type is not None and issubclass(exc_type, Exception):
+            error = exc_type.__name__
+            shard.errors[error] = shard.errors.get(error, 0) + 1
+
+
+class FileIOMetrics:
+    """Registry of per-operation file I/O counters and duration histograms."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_DURATION_BUCKETS) -> None:
+        """
+        Creates an empty registry.
+
+        Args:
+            buckets (Sequence[float]): Increasing histogram upper bounds, in
+                seconds.
+
+        Raises:
+            ValueError: If buckets is empty or not strictly increasing.
+        """
+        bounds = tuple(float(bound) for bound in buckets)
+        if not bounds or any(a >= b for a, b in zip(bounds, bounds[1:])):
+            raise ValueError("buckets must be a non-empty increasing sequence")
+        self.buckets = bounds
+        self._local = threading.local()
+        self._shards: Dict[int, Dict[str, _OperationShard]] = {}
+        # Replaced, never mutated, so a snapshot can read it without the lock.
+        self._retired: Dict[str, _OperationShard] = {}
+        self._lock = threading.Lock()
+
+    def _shard(self, operation: str) -> _OperationShard:
+        try:
+            shards: Dict[str, _OperationShard] = self._local.shards
+        except AttributeError:
+            shards = self._local.shards = {}
+            # Thread-local storage is cleared when the thread exits, which
+            # drops the token and runs the finalizer.
+            token = self._local.token = _ThreadToken()
+            weakref.finalize(token, _retire, weakref.ref(self), id(shards))
+            with self._lock:
+                self._shards[id(shards)] = shards
+        shard = shards.get(operation)
+        if shard is None:
+            # Published under the lock so a concurrent snapshot never sees
+            # the dictionary change size while iterating over it.
+            with self._lock:
+                shard = shards[operation] = _OperationShard(len(self.buckets))
+        return shard
+
+    def observe(self, operation: str) -> CallObserver:
+        """
+        Returns a context manager that times and records one call.
+
+        Args:
+            operation (str): Name of the operation, used as a metric label.
+
+        Returns:
+            CallObserver: The observer for the call.
+        """
+        return CallObserver(self, operation)
+
+    def record(
+        self,
+        operation: str,
+        duration: float,
+        bytes_read: int = 0,
+        files_opened: int = 0,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Records one completed call.
+
+        Args:
+            operation (str): Name of the operation.
+            duration (float): Call duration, in seconds.
+            bytes_read (int): Bytes read during the call.
+            files_opened (int): Files opened during the call.
+            error (Optional[str]): Exception type name if the call failed.
+        """
+        shard = self._shard(operation)
+        shard.calls += 1
+        shard.bytes_read += bytes_read
+        shard.files_opened += files_opened
+        shard.duration_sum += duration
+        shard.duration_counts[bisect.bisect_left(self.buckets, duration)] += 1
+        if error is not None:
+            shard.errors[error] = shard.errors.get(error, 0) + 1
+
+    def snapshot(self) -> Dict[str, OperationStats]:
+        """
+        Merges every thread's counters into a consistent-enough snapshot.
+
+        Counters are read without stopping writers, so a call being recorded
+        concurrently may be partially included.
+
+        Returns:
+            Dict[str, OperationStats]: Merged metrics keyed by operation.
+        """
+        merged: Dict[str, Tuple[int, int, int, Dict[str, int], List[int], float]] = {}
+        with self._lock:
+            shards = [
+                list(thread_shards.items()) for thread_shards in self._shards.values()
+            ]
+            shards.append(list(self._retired.items()))
+        for thread_shards in shards:
+            for operation, shard in thread_shards:
+                calls, read, opened, errors, counts, total = merged.get(
+                    operation, (0, 0, 0, {}, [0] * (len(self.buckets) + 1), 0.0)
+                )
+                for name, count in list(shard.errors.items()):
+                    errors[name] = errors.get(name, 0) + count
+                counts = [a + b for a, b in zip(counts, shard.duration_counts)]
+                merged[operation] = (
+                    calls + shard.calls,
+                    read + shard.bytes_read,
+                    opened + shard.files_opened,
+                    errors,
+                    counts,
+                    total + shard.duration_sum,
+                )
+        return {
+            operation: OperationStats(
+                calls, read, opened, errors, self.buckets, tuple(counts), total
+            )
+            for operation, (calls, read, opened, errors, counts, total) in sorted(
+                merged.items()
+            )
+        }
+
+    def reset(self) -> None:
+        """Clears every counter. Intended for tests and benchmarks."""
+        with self._lock:
+            for thread_shards in self._shards.values():
+                thread_shards.clear()
+            self._retired = {}
+
+    def _retire(self, key: int) -> None:
+        """Merges the shards of an exited thread into the retired totals."""
+        with self._lock:
+            thread_shards = self._shards.pop(key, None)
+            if not thread_shards:
+                return
+            retired = dict(self._retired)
+            for operation, shard in thread_shards.items():
+                previous = retired.get(operation)
+                retired[operation] = (
+                    shard if previous is None else previous.merged(shard)
+                )
+            self._retired = retired
+
+    def to_prometheus(self, prefix: str = "my_project_file") -> str:
+        """
+        Renders the current snapshot in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Prefix of every metric name.
+
+        Returns:
+            str: The metrics, ending with a newline.
+        """
+        snapshot = self.snapshot()
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> str:
+            metric = f"{prefix}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            return metric
+
+        metric = family("calls_total", "counter", "File I/O calls by operation.")
+        for operation, stats in snapshot.items():
+            lines.append(f"{metric}{_labels(operation=operation)} {stats.calls}")
+
+        metric = family("bytes_read_total", "counter", "Bytes read by operation.")
+        for operation, stats in snapshot.items():
+            lines.append(f"{metric}{_labels(operation=operation)} {stats.bytes_read}")
+
+        metric = family("opened_total", "counter", "Files opened by operation.")
+        for operation, stats in snapshot.items():
+            lines.append(f"{metric}{_labels(operation=operation)} {stats.files_opened}")
+
+        metric = family(
+            "errors_total", "counter", "Failed calls by operation and exception type."
+        )
+        for operation, stats in snapshot.items():
+            for error, count in sorted(stats.errors.items()):
+                lines.append(
+                    f"{metric}{_labels(operation=operation, type=error)} {count}"
+                )
+
+        metric = family(
+            "call_duration_seconds", "histogram", "Duration of file I/O calls."
+        )
+        for operation, stats in snapshot.items():
+            cumulative = 0
+            bounds = [repr(b) for b in stats.duration_buckets] + ["+Inf"]
+            for bound, count in zip(bounds, stats.duration_counts):
+                cumulative += count
+                labels = _labels(operation=operation, le=bound)
+                lines.append(f"{metric}_bucket{labels} {cumulative}")
+            labels = _labels(operation=operation)
+            lines.append(f"{metric}_sum{labels} {stats.duration_sum!r}")
+            lines.append(f"{metric}_count{labels} {stats.calls}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _retire(metrics_ref: weakref.ref[FileIOMetrics], key: int) -> None:
+    # Module-level so the finalizer does not keep the registry alive.
+    metrics = metrics_ref()
+    if metrics is not None:
+        metrics._retire(key)
+
+
+def _labels(**labels: str) -> str:
+    pairs = (f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+#: Registry that my_project.file_utils records into.
+file_io_metrics = FileIOMetrics()
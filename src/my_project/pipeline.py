@@ -0,0 +1,401 @@
+"""Streaming pipelines of stages connected by bounded queues.
+
+A pipeline pulls items from a source iterable, passes them through each
+stage in turn and hands the results to a sink, for example::
+
+    from my_project.file_utils import iter_file_lines
+    from my_project.main import sample_function
+
+    pipeline = Pipeline(
+        [
+            Stage("strip", str.strip),
+            Stage("greet", sample_function, workers=4, processes=True),
+        ]
+    )
+    with open("greetings.txt", "w", encoding="utf-8") as out:
+        pipeline.run(iter_file_lines("names.txt"), lambda g: out.write(g + "\\n"))
+
+Items travel between stages in batches of ``batch_size`` through queues that
+hold at most ``queue_size`` batches, so a slow stage blocks the stages
+before it and memory stays constant however large the input is. Each stage
+keeps item order, even with several workers.
+
+On an error or KeyboardInterrupt every thread notices within
+``_POLL_INTERVAL`` seconds: queued batches are dropped, pending work is
+cancelled, and thread stages stop between two items, so shutdown waits
+for at most one item per worker. Work already running in a process pool,
+and a source blocked inside its own iterator, are left to finish in the
+background.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
+from typing import Any, Callable, Deque, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+#: Default number of items passed between stages at once.
+DEFAULT_BATCH_SIZE = 256
+
+#: Default number of batches each queue between two stages can hold.
+DEFAULT_QUEUE_SIZE = 8
+
+#: Seconds between checks for a shutdown while blocked on a queue.
+_POLL_INTERVAL = 0.05
+
+#: Marks the end of the stream on a queue.
+_END = object()
+
+
+class Stage(
+    namedtuple(
+        "Stage",
+        ["name", "function", "workers", "processes", "flat"],
+        defaults=(1, False, False),
+    )
+):
+    """
+    One step of a Pipeline.
+
+    Attributes:
+        name (str): Name used in statistics and thread names.
+        function (Callable[[Any], Any]): Applied to every item. With
+            ``processes`` it must be picklable, i.e. a module-level function.
+        workers (int): Number of threads or processes running ``function``.
+        processes (bool): Run on a process pool instead of threads.
+        flat (bool): ``function`` returns an iterable of zero or more output
+            items instead of exactly one, which lets a stage filter or split.
+    """
+
+    __slots__ = ()
+
+
+class StageStats(
+    namedtuple(
+        "StageStats",
+        ["name", "items_in", "items_out", "seconds", "queue_depth", "max_queue_depth"],
+    )
+):
+    """
+    Counters of one stage.
+
+    Attributes:
+        name (str): The stage name.
+        items_in (int): Items received.
+        items_out (int): Items emitted.
+        seconds (float): Time since the stage started, until it finished.
+        queue_depth (int): Batches currently waiting in the stage's input queue.
+        max_queue_depth (int): Most batches ever waiting in that queue.
+    """
+
+    __slots__ = ()
+
+    @property
+    def throughput(self) -> float:
+        """float: Items emitted per second."""
+        return float(self.items_out / self.seconds) if self.seconds else 0.0
+
+
+class _Stopped(Exception):
+    """Raised inside pipeline threads once the pipeline is shutting down."""
+
+
+class _StageState:
+    """Mutable counters and queues of a running stage."""
+
+    __slots__ = (
+        "stage",
+        "inbox",
+        "outbox",
+        "items_in",
+        "items_out",
+        "started",
+        "finished",
+        "max_depth",
+    )
+
+    def __init__(self, stage: Stage, inbox: queue.Queue, outbox: queue.Queue) -> None:
+        self.stage = stage
+        self.inbox = inbox
+        self.outbox = outbox
+        self.items_in = 0
+        self.items_out = 0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.max_depth = 0
+
+
+def _apply(
+    function: Callable[[Any], Any],
+    flat: bool,
+    batch: List[Any],
+    stop: Optional[threading.Event] = None,
+) -> List[Any]:
+    """
+    Runs a stage function over a batch; module-level so it can be pickled.
+
+    Threads pass the pipeline's ``stop`` event so a batch is abandoned between
+    two items once the pipeline shuts down; it cannot be sent to processes.
+    """
+    if stop is None:
+        if flat:
+            return [output for item in batch for output in function(item)]
+        return [function(item) for item in batch]
+    stopped = stop.is_set
+    outputs: List[Any] = []
+    add = outputs.extend if flat else outputs.append
+    for item in batch:
+        if stopped():
+            raise _Stopped
+        add(function(item))
+    return outputs
+
+
+class Pipeline:
+    """
+    Runs a source through a chain of stages into a sink.
+
+    The source is consumed by a feeder thread, each stage runs on its own
+    dispatcher thread (plus a pool when it has several workers or uses
+    processes), and the sink is called on the thread that called run(). If
+    any part fails, or run() is interrupted with KeyboardInterrupt, every
+    thread and pool is stopped and the first error is re-raised from run().
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        """
+        Creates a pipeline; nothing runs until run() is called.
+
+        Args:
+            stages (Sequence[Stage]): The stages, in order.
+            batch_size (int): Items passed between stages at once.
+            queue_size (int): Batches each inter-stage queue can hold.
+
+        Raises:
+            ValueError: If batch_size, queue_size or any stage's workers is
+                not a positive integer.
+        """
+        if batch_size < 1 or queue_size < 1:
+            raise ValueError("batch_size and queue_size must be positive integers")
+        for stage in stages:
+            if stage.workers < 1:
+                raise ValueError(f"stage {stage.name!r} needs at least one worker")
+        self.stages = list(stages)
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self._states: List[_StageState] = []
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+
+    def stats(self) -> List[StageStats]:
+        """
+        Returns a snapshot of every stage's counters; safe to call while running.
+
+        Returns:
+            List[StageStats]: One entry per stage, in pipeline order.
+        """
+        now = time.perf_counter()
+        return [
+            StageStats(
+                state.stage.name,
+                state.items_in,
+                state.items_out,
+                0.0
+                if state.started is None
+                else (state.finished or now) - state.started,
+                state.inbox.qsize(),
+                state.max_depth,
+            )
+            for state in self._states
+        ]
+
+    def run(
+        self, source: Iterable[Any], sink: Callable[[Any], Any]
+    ) -> List[StageStats]:
+        """
+        Streams every item of ``source`` through the stages into ``sink``.
+
+        Args:
+            source (Iterable[Any]): The input items; consumed lazily.
+            sink (Callable[[Any], Any]): Called with each output item, in order.
+
+        Returns:
+            List[StageStats]: Final counters of each stage.
+
+        Raises:
+            Exception: The first exception raised by the source, a stage or
+                the sink.
+            KeyboardInterrupt: If interrupted; the pipeline is shut down first.
+        """
+        queues: List["queue.Queue[Any]"] = [
+            queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)
+        ]
+        self._states = [
+            _StageState(stage, inbox, outbox)
+            for stage, inbox, outbox in zip(self.stages, queues, queues[1:])
+        ]
+        self._stop.clear()
+        self._error = None
+
+        threads = [
+            threading.Thread(
+                target=self._feed,
+                args=(source, queues[0]),
+                name="pipeline-source",
+                daemon=True,
+            )
+        ]
+        threads.extend(
+            threading.Thread(
+                target=self._run_stage,
+                args=(state,),
+                name=f"pipeline-{state.stage.name}",
+                daemon=True,
+            )
+            for state in self._states
+        )
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                batch = self._get(queues[-1])
+                if batch is _END:
+                    break
+                for item in batch:
+                    sink(item)
+        except _Stopped:
+            pass
+        except BaseException as e:  # Including KeyboardInterrupt.
+            self._fail(e)
+        finally:
+            for thread in threads[1:]:
+                thread.join()
+            # The source thread is a daemon: when stopping it may be blocked
+            # inside the source, so it is only given time to notice the stop.
+            threads[0].join(2 * _POLL_INTERVAL if self._stop.is_set() else None)
+
+        if self._error is not None:
+            raise self._error
+        return self.stats()
+
+    def _fail(self, error: BaseException) -> None:
+        """Records the first error and tells every thread to stop."""
+        with self._lock:
+            if self._error is None:
+                self._error = error
+        self._stop.set()
+
+    def _get(self, inbox: "queue.Queue[Any]") -> Any:
+        while True:
+            try:
+                batch = inbox.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                batch = None
+            if self._stop.is_set():
+                raise _Stopped
+            if batch is not None:
+                return batch
+
+    def _result(self, future: "Future[List[Any]]") -> List[Any]:
+        """Waits for a batch from a pool, giving up once the pipeline stops."""
+        while not wait([future], timeout=_POLL_INTERVAL).done:
+            if self._stop.is_set():
+                raise _Stopped
+        return future.result()
+
+    def _put(self, outbox: "queue.Queue[Any]", batch: Any) -> None:
+        while True:
+            try:
+                outbox.put(batch, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                if self._stop.is_set():
+                    raise _Stopped from None
+
+    def _feed(self, source: Iterable[Any], outbox: "queue.Queue[Any]") -> None:
+        """Splits the source into batches for the first queue."""
+        try:
+            items = iter(source)
+            while True:
+                batch = list(islice(items, self.batch_size))
+                if not batch:
+                    break
+                self._put(outbox, batch)
+            self._put(outbox, _END)
+        except _Stopped:
+            pass
+        except BaseException as e:
+            self._fail(e)
+
+    def _emit(self, state: _StageState, batch: List[Any]) -> None:
+        if batch:
+            state.items_out += len(batch)
+            self._put(state.outbox, batch)
+
+    def _run_stage(self, state: _StageState) -> None:
+        """Dispatches batches to the stage's workers, emitting results in order."""
+        stage = state.stage
+        executor: Optional[Executor] = None
+        stop: Optional[threading.Event] = self._stop
+        if stage.processes:
+            executor = ProcessPoolExecutor(max_workers=stage.workers)
+            stop = None
+        elif stage.workers > 1:
+            executor = ThreadPoolExecutor(
+                max_workers=stage.workers, thread_name_prefix=f"pipeline-{stage.name}"
+            )
+        pending: Deque["Future[List[Any]]"] = deque()
+        state.started = time.perf_counter()
+        try:
+            while True:
+                batch = self._get(state.inbox)
+                if batch is _END:
+                    break
+                state.max_depth = max(state.max_depth, state.inbox.qsize() + 1)
+                state.items_in += len(batch)
+                if executor is None:
+                    self._emit(state, _apply(stage.function, stage.flat, batch, stop))
+                    continue
+                pending.append(
+                    executor.submit(_apply, stage.function, stage.flat, batch, stop)
+                )
+                # Two batches per worker keep the pool busy; beyond that the
+                # stage waits on its oldest batch, which is its backpressure.
+                while pending and (
+                    len(pending) > stage.workers * 2 or pending[0].done()
+                ):
+                    self._emit(state, self._result(pending.popleft()))
+            while pending:
+                self._emit(state, self._result(pending.popleft()))
+            self._put(state.outbox, _END)
+        except _Stopped:
+            pass
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            state.finished = time.perf_counter()
+            for future in pending:
+                future.cancel()
+            if executor is not None:
+                # Thread workers stop between items; running process work
+                # cannot be interrupted, so it is not waited for.
+                wait_for_workers = stop is not None or not self._stop.is_set()
+                executor.shutdown(wait=wait_for_workers, cancel_futures=True)
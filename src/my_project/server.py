@@ -0,0 +1,298 @@
+"""Long-running asyncio server for greeting and file-content requests.
+
+The protocol is newline-delimited JSON. Each request is an object with an
+``op`` of ``"greet"`` (with ``name``) or ``"read"`` (with ``path``) and an
+optional ``id`` that is echoed back. Read requests are confined to the
+server's root directory, and refused when no root is configured; relative
+paths are resolved against the root. Each response is one line::
+
+    {"id": 1, "ok": true, "result": "Hello, Alice! ..."}
+    {"id": 2, "ok": false, "error": {"type": "FileNotFoundError", "message": "..."}}
+
+Clients may pipeline requests: several can be sent without waiting, and the
+responses come back in request order on the same connection.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, cast
+
+from my_project.file_utils import AsyncFileReader
+from my_project.main import sample_function
+
+logger = logging.getLogger(__name__)
+
+#: Default TCP port of the server.
+DEFAULT_PORT = 8765
+
+#: Default number of simultaneous client connections.
+DEFAULT_MAX_CONNECTIONS = 256
+
+#: Default number of requests per connection processed ahead of the reply.
+DEFAULT_PIPELINE_DEPTH = 64
+
+#: Longest accepted request line, in bytes.
+MAX_REQUEST_BYTES = 1024 * 1024
+
+Response = Dict[str, Any]
+
+
+def _error_response(request_id: Any, error_type: str, message: str) -> Response:
+    return {
+        "id": request_id,
+        "ok": False,
+        "error": {"type": error_type, "message": message},
+    }
+
+
+def _encode(response: Response) -> bytes:
+    return json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+class RequestServer:
+    """
+    Serves requests over a Unix socket or a localhost TCP port.
+
+    Each connection gets a reader loop and a writer task joined by a bounded
+    queue of in-flight requests: up to ``pipeline_depth`` requests run
+    concurrently, responses are written in request order, and a client that
+    stops reading eventually stops being read from. Connections beyond
+    ``max_connections`` receive a ``ServerBusy`` error and are closed.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+        root: Optional[str] = None,
+        file_reader: Optional[AsyncFileReader] = None,
+    ) -> None:
+        """
+        Creates the server; call start() to begin listening.
+
+        Args:
+            max_connections (int): Maximum number of simultaneous connections.
+            pipeline_depth (int): Maximum in-flight requests per connection.
+            root (Optional[str]): "read" requests may only access files
+                under this directory. If None, "read" requests are refused.
+            file_reader (Optional[AsyncFileReader]): Reader used for "read"
+                requests. Defaults to a new reader owned by the server.
+
+        Raises:
+            ValueError: If max_connections or pipeline_depth is not positive.
+        """
+        if max_connections <= 0:
+            raise ValueError("max_connections must be a positive integer")
+        if pipeline_depth <= 0:
+            raise ValueError("pipeline_depth must be a positive integer")
+        self.max_connections = max_connections
+        self.pipeline_depth = pipeline_depth
+        self.root = os.path.realpath(root) if root is not None else None
+        self._owns_reader = file_reader is None
+        self._file_reader = file_reader or AsyncFileReader()
+        self._active_connections = 0
+        self._server: Optional[asyncio.Server] = None
+
+    @property
+    def active_connections(self) -> int:
+        """int: Number of connections currently being served."""
+        return self._active_connections
+
+    @property
+    def addresses(self) -> List[Any]:
+        """List[Any]: Socket addresses the server is listening on."""
+        if self._server is None:
+            return []
+        return [sock.getsockname() for sock in self._server.sockets]
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        unix_path: Optional[str] = None,
+    ) -> None:
+        """
+        Starts listening.
+
+        Args:
+            host (str): TCP host to bind. Ignored when unix_path is given.
+            port (int): TCP port to bind; 0 picks a free port.
+            unix_path (Optional[str]): Path of a Unix socket to listen on
+                instead of TCP.
+        """
+        if unix_path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, path=unix_path, limit=MAX_REQUEST_BYTES
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_connection, host, port, limit=MAX_REQUEST_BYTES
+            )
+        logger.info("Serving on %s", ", ".join(map(str, self.addresses)))
+
+    async def serve_forever(self) -> None:
+        """Serves until cancelled, then closes the server."""
+        if self._server is None:
+            raise RuntimeError("Server has not been started")
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stops listening and releases the file reader if the server owns it."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._owns_reader:
+            self._file_reader.close()
+
+    async def handle_request(self, line: bytes) -> Response:
+        """
+        Executes one request line and builds its response.
+
+        Args:
+            line (bytes): A UTF-8 encoded JSON request.
+
+        Returns:
+            Response: The response object; errors are reported in it rather
+                than raised.
+        """
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise TypeError("Request must be a JSON object")
+            request_id = request.get("id")
+            op = request.get("op")
+            if op == "greet":
+                # sample_function raises TypeError for anything but a string.
+                result = sample_function(cast(str, request.get("name")))
+            elif op == "read":
+                result = await self._read(request.get("path"))
+            else:
+                raise ValueError(f"Unknown op: {op!r}")
+
+        except Exception as e:
+            if not isinstance(e, (OSError, TypeError, ValueError)):
+                logger.exception("Unexpected error handling request: %s", str(e))
+            return _error_response(request_id, type(e).__name__, str(e))
+
+        return {"id": request_id, "ok": True, "result": result}
+
+    async def _read(self, path: Any) -> str:
+        if not isinstance(path, str):
+            raise TypeError(f"Expected string for path, got {type(path).__name__}")
+        if self.root is None:
+            raise PermissionError("Read requests are disabled: no root configured")
+        # Open the path that was checked, not the one that was requested.
+        resolved = os.path.realpath(os.path.join(self.root, path))
+        if os.path.commonpath([self.root, resolved]) != self.root:
+            raise PermissionError(f"Path is outside the served root: {path}")
+        content = await self._file_reader.read_file_content(resolved)
+        if content is None:
+            raise RuntimeError(f"Unexpected error reading file: {path}")
+        return content
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        if self._active_connections >= self.max_connections:
+            writer.write(
+                _encode(_error_response(None, "ServerBusy", "Too many connections"))
+            )
+            await self._close_writer(writer)
+            return
+
+        self._active_connections += 1
+        in_flight: "asyncio.Queue[Optional[asyncio.Future[Response]]]" = asyncio.Queue(
+            maxsize=self.pipeline_depth
+        )
+        sender = asyncio.ensure_future(self._send_responses(in_flight, writer))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # The line exceeded MAX_REQUEST_BYTES; the stream is unusable.
+                    message = f"Request exceeds {MAX_REQUEST_BYTES} bytes"
+                    await in_flight.put(
+                        _completed(_error_response(None, "ValueError", message))
+                    )
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(self.handle_request(line))
+                    await in_flight.put(task)
+        except ConnectionError:
+            pass
+        finally:
+            await in_flight.put(None)
+            await sender
+            self._active_connections -= 1
+            await self._close_writer(writer)
+
+    @staticmethod
+    async def _send_responses(
+        in_flight: "asyncio.Queue[Optional[asyncio.Future[Response]]]",
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        connected = True
+        while True:
+            pending = await in_flight.get()
+            if pending is None:
+                return
+            response = await pending
+            if not connected:
+                continue
+            try:
+                writer.write(_encode(response))
+                if in_flight.empty():
+                    # Flush once per burst of pipelined responses.
+                    await writer.drain()
+            except ConnectionError:
+                connected = False
+
+    @staticmethod
+    async def _close_writer(writer: asyncio.StreamWriter) -> None:
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def _completed(response: Response) -> "asyncio.Future[Response]":
+    future: "asyncio.Future[Response]" = asyncio.get_running_loop().create_future()
+    future.set_result(response)
+    return future
+
+
+async def serve(
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    unix_path: Optional[str] = None,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+    root: Optional[str] = None,
+) -> None:
+    """
+    Runs a RequestServer until cancelled.
+
+    Args:
+        host (str): TCP host to bind. Ignored when unix_path is given.
+        port (int): TCP port to bind.
+        unix_path (Optional[str]): Path of a Unix socket to listen on instead
+            of TCP.
+        max_connections (int): Maximum number of simultaneous connections.
+        pipeline_depth (int): Maximum in-flight requests per connection.
+        root (Optional[str]): Restricts "read" requests to files under this
+            directory. If None, "read" requests are refused.
+    """
+    server = RequestServer(max_connections, pipeline_depth, root)
+    await server.start(host, port, unix_path)
+    await server.serve_forever()
@@ -1,5 +1,6 @@
 """Pytest configuration and fixtures for test suite."""
 
+import os
 import sys
 from pathlib import Path
 
@@ -10,6 +11,17 @@ src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
 
 
+@pytest.fixture
+def bump_mtime():
+    """Return a function that moves a file's mtime forward, keeping its content."""
+
+    def bump(path, delta_ns=1_000_000_000):
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + delta_ns))
+
+    return bump
+
+
 @pytest.fixture(autouse=True)
 def reset_logging():
     """Reset logging configuration for each test."""
@@ -0,0 +1,165 @@
+"""Tests for the in-process content cache."""
+
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from my_project.content_cache import ContentCache
+
+
+class TestContentCache:
+    """Test suite for ContentCache."""
+
+    def test_hit_after_first_read(self, tmp_path):
+        """Test that the second read is served from the cache."""
+        test_file = tmp_path / "config.txt"
+        test_file.write_text("value = 1", encoding="utf-8")
+        cache = ContentCache()
+
+        assert cache.read_file_content(str(test_file)) == "value = 1"
+        with patch("my_project.content_cache.read_file_content") as mock_read:
+            assert cache.read_file_content(str(test_file)) == "value = 1"
+            mock_read.assert_not_called()
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+    def test_rewrite_same_size_is_reloaded(self, tmp_path, bump_mtime):
+        """Test that a same-size rewrite with a new mtime is reloaded."""
+        test_file = tmp_path / "config.txt"
+        test_file.write_text("value = 1", encoding="utf-8")
+        cache = ContentCache()
+        cache.read_file_content(str(test_file))
+
+        test_file.write_text("value = 2", encoding="utf-8")
+        bump_mtime(test_file)
+
+        assert cache.read_file_content(str(test_file)) == "value = 2"
+        assert cache.stats().misses == 2
+
+    def test_replaced_file_is_reloaded(self, tmp_path):
+        """Test that an atomically replaced file (new inode) is reloaded."""
+        test_file = tmp_path / "config.txt"
+        test_file.write_text("old", encoding="utf-8")
+        cache = ContentCache()
+        cache.read_file_content(str(test_file))
+
+        replacement = tmp_path / "config.txt.tmp"
+        replacement.write_text("new", encoding="utf-8")
+        os.utime(replacement, ns=(os.stat(test_file).st_atime_ns,) * 2)
+        os.replace(replacement, test_file)
+
+        assert cache.read_file_content(str(test_file)) == "new"
+
+    def test_size_change_is_reloaded(self, tmp_path):
+        """Test that a size change is detected."""
+        test_file = tmp_path / "config.txt"
+        test_file.write_text("short", encoding="utf-8")
+        cache = ContentCache()
+        cache.read_file_content(str(test_file))
+
+        test_file.write_text("much longer content", encoding="utf-8")
+        assert cache.read_file_content(str(test_file)) == "much longer content"
+
+    def test_deleted_file_raises_and_is_dropped(self, tmp_path):
+        """Test that a deleted file raises FileNotFoundError."""
+        test_file = tmp_path / "config.txt"
+        test_file.write_text("value", encoding="utf-8")
+        cache = ContentCache()
+        cache.read_file_content(str(test_file))
+
+        test_file.unlink()
+        with pytest.raises(FileNotFoundError):
+            cache.read_file_content(str(test_file))
+        assert len(cache) == 0
+
+    def test_errors_are_not_cached(self, tmp_path):
+        """Test that read errors propagate like read_file_content."""
+        cache = ContentCache()
+        with pytest.raises(IsADirectoryError):
+            cache.read_file_content(str(tmp_path))
+        assert len(cache) == 0
+
+    def test_unexpected_error_returns_none(self, tmp_path):
+        """Test that a None result is returned but not cached."""
+        test_file = tmp_path / "config.txt"
+        test_file.write_text("value", encoding="utf-8")
+        cache = ContentCache()
+
+        with patch("builtins.open", side_effect=RuntimeError("boom")):
+            assert cache.read_file_content(str(test_file)) is None
+        assert len(cache) == 0
+        assert cache.read_file_content(str(test_file)) == "value"
+
+    def test_lru_eviction_by_bytes(self, tmp_path):
+        """Test that least recently used entries are evicted first."""
+        paths = []
+        for name in "abc":
+            path = tmp_path / f"{name}.txt"
+            path.write_text(name * 1000, encoding="utf-8")
+            paths.append(str(path))
+        entry_size = sys.getsizeof("a" * 1000)
+        cache = ContentCache(max_bytes=entry_size * 2)
+
+        cache.read_file_content(paths[0])
+        cache.read_file_content(paths[1])
+        cache.read_file_content(paths[0])
+        cache.read_file_content(paths[2])
+
+        stats = cache.stats()
+        assert stats.evictions == 1
+        assert stats.entries == 2
+        assert stats.current_bytes <= stats.max_bytes
+        cache.read_file_content(paths[0])
+        assert cache.stats().hits == 2
+
+    def test_entry_larger_than_budget_not_cached(self, tmp_path):
+        """Test that oversized content is returned but not cached."""
+        test_file = tmp_path / "big.txt"
+        test_file.write_text("x" * 1000, encoding="utf-8")
+        cache = ContentCache(max_bytes=100)
+
+        assert cache.read_file_content(str(test_file)) == "x" * 1000
+        assert len(cache) == 0
+
+    def test_invalidate_and_clear(self, tmp_path):
+        """Test explicit invalidation."""
+        test_file = tmp_path / "config.txt"
+        test_file.write_text("value", encoding="utf-8")
+        cache = ContentCache()
+        cache.read_file_content(str(test_file))
+
+        cache.invalidate(str(test_file))
+        assert len(cache) == 0
+        cache.read_file_content(str(test_file))
+        cache.clear()
+        assert cache.stats().current_bytes == 0
+
+    def test_negative_budget_raises(self):
+        """Test that a negative budget raises ValueError."""
+        with pytest.raises(ValueError, match="max_bytes"):
+            ContentCache(max_bytes=-1)
+
+    def test_concurrent_reads(self, tmp_path):
+        """Test that concurrent readers see consistent content and counters."""
+        test_file = tmp_path / "config.txt"
+        test_file.write_text("shared", encoding="utf-8")
+        cache = ContentCache()
+        results = []
+
+        def worker():
+            for _ in range(50):
+                results.append(cache.read_file_content(str(test_file)))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["shared"] * 400
+        stats = cache.stats()
+        assert stats.hits + stats.misses == 400
@@ -0,0 +1,274 @@
+"""Tests for the persistent on-disk content cache."""
+
+import gzip
+import os
+import subprocess
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from my_project.disk_cache import DiskCache, default_cache_dir
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+
+
+def _entry_files(cache_dir, kind):
+    directory = os.path.join(cache_dir, kind)
+    return sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names
+    )
+
+
+def _blob_files(cache_dir):
+    return _entry_files(cache_dir, "blobs")
+
+
+class TestDiskCache:
+    """Test suite for DiskCache."""
+
+    def test_hit_after_first_read(self, tmp_path):
+        """Test that the second read is served from the cache directory."""
+        test_file = tmp_path / "config.txt"
+        test_file.write_text("value = 1", encoding="utf-8")
+        cache = DiskCache(str(tmp_path / "cache"))
+
+        assert cache.read_file_content(str(test_file)) == "value = 1"
+        with patch("my_project.disk_cache.read_file_content") as mock_read:
+            assert cache.read_file_content(str(test_file)) == "value = 1"
+            mock_read.assert_not_called()
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+        assert stats.current_bytes == len("value = 1")
+
+    def test_entries_survive_new_instances(self, tmp_path):
+        """Test that a new cache over the same directory starts warm."""
+        test_file = tmp_path / "config.txt"
+        test_file.write_text("value = 1", encoding="utf-8")
+        DiskCache(str(tmp_path / "cache")).read_file_content(str(test_file))
+
+        cache = DiskCache(str(tmp_path / "cache"))
+        with patch("my_project.disk_cache.read_file_content") as mock_read:
+            assert cache.read_file_content(str(test_file)) == "value = 1"
+            mock_read.assert_not_called()
+
+    def test_entries_are_shared_across_processes(self, tmp_path):
+        """Test that content cached by another process is a hit here."""
+        test_file = tmp_path / "reference.txt"
+        test_file.write_text("shared\n" * 100, encoding="utf-8")
+        cache_dir = str(tmp_path / "cache")
+        script = (
+            "import sys; sys.path.insert(0, sys.argv[1]);"
+            "from my_project.disk_cache import DiskCache;"
+            "DiskCache(sys.argv[2]).read_file_content(sys.argv[3])"
+        )
+        subprocess.run(
+            [sys.executable, "-c", script, SRC, cache_dir, str(test_file)], check=True
+        )
+
+        cache = DiskCache(cache_dir)
+        assert cache.read_file_content(str(test_file)) == "shared\n" * 100
+        assert (cache.stats().hits, cache.stats().misses) == (1, 0)
+
+    def test_rewrite_same_size_is_reloaded(self, tmp_path, bump_mtime):
+        """Test that a same-size rewrite with a new mtime is read again."""
+        test_file = tmp_path / "config.txt"
+        test_file.write_text("value = 1", encoding="utf-8")
+        cache = DiskCache(str(tmp_path / "cache"))
+        cache.read_file_content(str(test_file))
+
+        test_file.write_text("value = 2", encoding="utf-8")
+        bump_mtime(str(test_file))
+
+        assert cache.read_file_content(str(test_file)) == "value = 2"
+        assert cache.stats().misses == 2
+
+    def test_changed_signature_replaces_the_key(self, tmp_path, bump_mtime):
+        """Test that touching a file repeatedly keeps one key for it."""
+        test_file = tmp_path / "config.txt"
+        test_file.write_text("value = 1", encoding="utf-8")
+        cache_dir = str(tmp_path / "cache")
+        cache = DiskCache(cache_dir)
+
+        for _ in range(5):
+            bump_mtime(str(test_file))
+            assert cache.read_file_content(str(test_file)) == "value = 1"
+
+        assert cache.stats().misses == 5
+        assert len(_entry_files(cache_dir, "keys")) == 1
+        assert len(_blob_files(cache_dir)) == 1
+
+    def test_identical_contents_share_a_blob(self, tmp_path):
+        """Test that blobs are addressed by content, not by path."""
+        cache_dir = str(tmp_path / "cache")
+        cache = DiskCache(cache_dir)
+        for name in ("a.txt", "b.txt"):
+            (tmp_path / name).write_text("same", encoding="utf-8")
+            cache.read_file_content(str(tmp_path / name))
+
+        assert len(_blob_files(cache_dir)) == 1
+        assert len(_entry_files(cache_dir, "keys")) == 2
+
+    def test_blob_holds_translated_text(self, tmp_path):
+        """Test that blobs store the text read_file_content returns."""
+        test_file = tmp_path / "crlf.txt"
+        test_file.write_bytes("café\r\nline\r".encode("utf-8"))
+        cache = DiskCache(str(tmp_path / "cache"))
+
+        with cache.map_file(str(test_file)) as mapped:
+            assert bytes(mapped.read_bytes()) == "café\nline\n".encode("utf-8")
+        assert cache.read_file_content(str(test_file)) == "café\nline\n"
+        assert cache.stats().hits == 1
+
+    def test_decompressed_content_is_cached(self, tmp_path):
+        """Test that a decompressing cache stores the decompressed text."""
+        test_file = tmp_path / "data.txt.gz"
+        test_file.write_bytes(gzip.compress(b"row\n" * 1000))
+        cache_dir = str(tmp_path / "cache")
+
+        cache = DiskCache(cache_dir, decompress=True)
+        assert cache.read_file_content(str(test_file)) == "row\n" * 1000
+        assert cache.read_file_content(str(test_file)) == "row\n" * 1000
+        assert cache.stats().hits == 1
+
+        # The flag is part of the key, so raw and decompressed reads differ.
+        raw = DiskCache(cache_dir)
+        with pytest.raises(UnicodeDecodeError):
+            raw.read_file_content(str(test_file))
+
+    def test_least_recently_used_blob_is_evicted(self, tmp_path):
+        """Test that going over budget removes the least recently used blob."""
+        cache_dir = str(tmp_path / "cache")
+        cache = DiskCache(cache_dir, max_bytes=250)
+        files = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.txt"
+            path.write_text(name * 100, encoding="utf-8")
+            files.append(str(path))
+        cache.read_file_content(files[0])
+        cache.read_file_content(files[1])
+        # Age both entries, then make "a" the most recently used one.
+        for blob in _blob_files(cache_dir):
+            os.utime(blob, ns=(0, 1))
+        cache.read_file_content(files[0])
+        cache.read_file_content(files[2])
+
+        stats = cache.stats()
+        assert (stats.evictions, stats.entries, stats.current_bytes) == (1, 2, 200)
+        with patch("my_project.disk_cache.read_file_content") as mock_read:
+            cache.read_file_content(files[0])
+            mock_read.assert_not_called()
+        assert cache.read_file_content(files[1]) == "b" * 100
+        assert cache.stats().misses == 4
+
+    def test_entry_larger_than_budget_is_still_returned(self, tmp_path):
+        """Test that the blob just stored is usable even over budget."""
+        test_file = tmp_path / "big.txt"
+        test_file.write_text("x" * 100, encoding="utf-8")
+        cache = DiskCache(str(tmp_path / "cache"), max_bytes=10)
+
+        with cache.map_file(str(test_file)) as mapped:
+            assert len(mapped) == 100
+
+    def test_evicted_blob_is_a_miss(self, tmp_path):
+        """Test that a key whose blob was removed is treated as a miss."""
+        test_file = tmp_path / "config.txt"
+        test_file.write_text("value = 1", encoding="utf-8")
+        cache_dir = str(tmp_path / "cache")
+        cache = DiskCache(cache_dir)
+        cache.read_file_content(str(test_file))
+        for blob in _blob_files(cache_dir):
+            os.unlink(blob)
+
+        assert cache.read_file_content(str(test_file)) == "value = 1"
+        assert cache.stats().misses == 2
+
+    def test_concurrent_writers(self, tmp_path):
+        """Test that concurrent misses on the same files leave whole entries."""
+        paths = []
+        for i in range(8):
+            path = tmp_path / f"file{i}.txt"
+            path.write_text(f"content {i}\n" * 1000, encoding="utf-8")
+            paths.append(str(path))
+        cache_dir = str(tmp_path / "cache")
+        errors = []
+
+        def worker():
+            cache = DiskCache(cache_dir)
+            try:
+                for i, path in enumerate(paths):
+                    assert cache.read_file_content(path) == f"content {i}\n" * 1000
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(_blob_files(cache_dir)) == len(paths)
+        assert not any(
+            name.startswith(".tmp-")
+            for _, _, names in os.walk(cache_dir)
+            for name in names
+        )
+
+    def test_stale_temporary_files_are_removed(self, tmp_path):
+        """Test that temporary files of crashed writers are swept, not others."""
+        cache_dir = str(tmp_path / "cache")
+        cache = DiskCache(cache_dir)
+        bucket = os.path.join(cache_dir, "blobs", "00")
+        os.makedirs(bucket)
+        stale = os.path.join(bucket, ".tmp-crashed")
+        fresh = os.path.join(bucket, ".tmp-writing")
+        for path in (stale, fresh):
+            with open(path, "wb") as f:
+                f.write(b"x" * 100)
+        os.utime(stale, ns=(0, 0))
+        test_file = tmp_path / "config.txt"
+        test_file.write_text("value = 1", encoding="utf-8")
+
+        cache.read_file_content(str(test_file))
+
+        assert not os.path.exists(stale)
+        assert os.path.exists(fresh)
+
+    def test_missing_file_raises(self, tmp_path):
+        """Test that errors are raised like read_file_content raises them."""
+        cache = DiskCache(str(tmp_path / "cache"))
+
+        with pytest.raises(FileNotFoundError):
+            cache.read_file_content(str(tmp_path / "missing.txt"))
+        with pytest.raises(IsADirectoryError):
+            cache.read_file_content(str(tmp_path))
+
+    def test_clear(self, tmp_path):
+        """Test that clear() empties the cache directory."""
+        test_file = tmp_path / "config.txt"
+        test_file.write_text("value = 1", encoding="utf-8")
+        cache_dir = str(tmp_path / "cache")
+        cache = DiskCache(cache_dir)
+        cache.read_file_content(str(test_file))
+
+        cache.clear()
+
+        assert cache.stats().entries == 0
+        assert cache.read_file_content(str(test_file)) == "value = 1"
+        assert cache.stats().misses == 2
+
+    def test_negative_budget_rejected(self, tmp_path):
+        """Test that a negative max_bytes is rejected."""
+        with pytest.raises(ValueError):
+            DiskCache(str(tmp_path / "cache"), max_bytes=-1)
+
+    def test_default_cache_dir_follows_xdg(self, tmp_path, monkeypatch):
+        """Test that XDG_CACHE_HOME selects the default directory."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        assert default_cache_dir() == os.path.join(str(tmp_path), "my_project")
@@ -0,0 +1,142 @@
+"""Tests for the incremental directory index."""
+
+import hashlib
+import os
+from unittest.mock import patch
+
+import pytest
+
+from my_project import file_index
+from my_project.file_index import FileIndex, scan_directory
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """A small directory tree with a nested subdirectory."""
+    root = tmp_path / "root"
+    (root / "sub" / "deeper").mkdir(parents=True)
+    (root / "a.txt").write_bytes(b"alpha")
+    (root / "sub" / "b.txt").write_bytes(b"beta")
+    (root / "sub" / "deeper" / "c.bin").write_bytes(b"\xff\x00")
+    return root
+
+
+class TestScanDirectory:
+    """Test suite for scan_directory."""
+
+    def test_yields_every_file(self, tree):
+        """Test that nested files are found with their stat results."""
+        found = {
+            os.path.relpath(path, tree): st.st_size
+            for path, st in scan_directory(str(tree))
+        }
+        assert found == {
+            "a.txt": 5,
+            os.path.join("sub", "b.txt"): 4,
+            os.path.join("sub", "deeper", "c.bin"): 2,
+        }
+
+    def test_missing_root_raises(self, tmp_path):
+        """Test that a missing root is an error rather than an empty scan."""
+        with pytest.raises(FileNotFoundError):
+            list(scan_directory(str(tmp_path / "missing")))
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+    def test_symlinks_are_not_followed(self, tree, tmp_path):
+        """Test that symbolic links to directories are skipped."""
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / "secret.txt").write_text("x")
+        os.symlink(outside, tree / "link")
+
+        paths = [os.path.basename(p) for p, _ in scan_directory(str(tree))]
+        assert "secret.txt" not in paths
+
+
+class TestFileIndex:
+    """Test suite for FileIndex."""
+
+    def test_first_update_indexes_everything(self, tree, tmp_path):
+        """Test that the first update hashes every file."""
+        with FileIndex(str(tree), str(tmp_path / "index.db")) as index:
+            update = index.update()
+            assert sorted(update.added) == ["a.txt", "sub/b.txt", "sub/deeper/c.bin"]
+            assert update.unchanged == 0
+            entry = index.get("a.txt")
+
+        assert entry.size == 5
+        assert entry.digest == hashlib.sha256(b"alpha").hexdigest()
+
+    def test_unchanged_files_are_not_reread(self, tree, tmp_path):
+        """Test that a second update only stats files."""
+        index_path = str(tmp_path / "index.db")
+        with FileIndex(str(tree), index_path) as index:
+            index.update()
+
+        with FileIndex(str(tree), index_path) as index:
+            with patch.object(file_index, "_hash_file") as mock_hash:
+                update = index.update()
+            mock_hash.assert_not_called()
+            assert update.unchanged == 3
+            assert len(index) == 3
+
+    def test_detects_modified_added_and_removed(self, tree, tmp_path, bump_mtime):
+        """Test that only changed files are re-hashed."""
+        with FileIndex(str(tree), str(tmp_path / "index.db")) as index:
+            index.update()
+            (tree / "a.txt").write_bytes(b"ALPHA")
+            bump_mtime(tree / "a.txt")
+            (tree / "sub" / "b.txt").unlink()
+            (tree / "new.txt").write_bytes(b"new")
+
+            update = index.update()
+
+            assert update.modified == ["a.txt"]
+            assert update.added == ["new.txt"]
+            assert update.removed == ["sub/b.txt"]
+            assert update.unchanged == 1
+            assert index.get("sub/b.txt") is None
+            assert index.get("a.txt").digest == hashlib.sha256(b"ALPHA").hexdigest()
+
+    def test_index_inside_root_is_skipped(self, tree):
+        """Test that the database file never indexes itself."""
+        with FileIndex(str(tree), str(tree / ".index.db")) as index:
+            index.update()
+            update = index.update()
+            assert update.added == [] and update.modified == []
+            assert all(not e.path.startswith(".index.db") for e in index)
+
+    def test_unreadable_file_is_reported(self, tree, tmp_path):
+        """Test that read failures are collected instead of aborting the scan."""
+        real_hash = file_index._hash_file
+
+        def flaky(filepath, algorithm):
+            if filepath.endswith("b.txt"):
+                raise PermissionError("denied")
+            return real_hash(filepath, algorithm)
+
+        with FileIndex(str(tree), str(tmp_path / "index.db")) as index:
+            with patch.object(file_index, "_hash_file", side_effect=flaky):
+                update = index.update(max_workers=2)
+
+            assert list(update.errors) == ["sub/b.txt"]
+            assert isinstance(update.errors["sub/b.txt"], PermissionError)
+            assert index.get("sub/b.txt") is None
+            assert len(index) == 2
+
+    def test_changing_algorithm_discards_digests(self, tree, tmp_path):
+        """Test that reopening with another algorithm re-hashes everything."""
+        index_path = str(tmp_path / "index.db")
+        with FileIndex(str(tree), index_path) as index:
+            index.update()
+
+        with FileIndex(str(tree), index_path, algorithm="md5") as index:
+            assert len(index) == 0
+            update = index.update()
+            assert len(update.added) == 3
+            assert index.get("a.txt").digest == hashlib.md5(b"alpha").hexdigest()
+
+    def test_unknown_algorithm(self, tree, tmp_path):
+        """Test that an unsupported algorithm is rejected up front."""
+        with pytest.raises(ValueError):
+            FileIndex(str(tree), str(tmp_path / "index.db"), algorithm="nope")
@@ -1,14 +1,50 @@
 """Tests for file utility functions."""
 
+import asyncio
+import bz2
+import errno
+import gc
+import gzip
+import hashlib
 import logging
+import lzma
 import os
+import re
+import shutil
 import tempfile
+import threading
+import time
+import weakref
+import zlib
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from my_project.file_utils import read_file_content
+import my_project.file_utils as file_utils
+from my_project.file_utils import (
+    AsyncFileReader,
+    FileFollower,
+    LazyText,
+    aiter_file_chunks,
+    build_line_index,
+    copy_file,
+    decode_text,
+    detect_compression,
+    find_duplicate_files,
+    hash_file,
+    iter_file_chunks,
+    iter_file_lines,
+    iter_read_many_files,
+    map_file,
+    read_file_bytes,
+    read_file_content,
+    read_file_content_async,
+    read_file_range,
+    read_many_files,
+    read_many_files_async,
+    search_files,
+)
 
 
 class TestReadFileContent:
@@ -175,3 +211,1290 @@ class TestReadFileContent:
 
         result = read_file_content(str(test_file))
         assert result == test_content
+
+
+class TestIterFileChunks:
+    """Test suite for iter_file_chunks function."""
+
+    def test_chunks_join_to_full_content(self, tmp_path):
+        """Test that joined chunks equal read_file_content output."""
+        test_file = tmp_path / "chunks.txt"
+        test_file.write_bytes(b"line 1\r\nline 2\rline 3\n" * 100)
+
+        chunks = list(iter_file_chunks(str(test_file), chunk_size=7))
+        assert len(chunks) > 1
+        assert "".join(chunks) == read_file_content(str(test_file))
+
+    def test_multibyte_split_across_chunks(self, tmp_path):
+        """Test multibyte characters split across chunk boundaries."""
+        test_file = tmp_path / "unicode.txt"
+        test_content = "世界🌍é" * 50
+        test_file.write_text(test_content, encoding="utf-8")
+
+        for chunk_size in (1, 2, 3, 5):
+            chunks = list(iter_file_chunks(str(test_file), chunk_size=chunk_size))
+            assert "".join(chunks) == test_content
+
+    def test_chunks_are_bounded(self, tmp_path):
+        """Test that no chunk decodes more than chunk_size bytes."""
+        test_file = tmp_path / "large.txt"
+        test_file.write_text("x" * 10_000, encoding="utf-8")
+
+        chunks = list(iter_file_chunks(str(test_file), chunk_size=1024))
+        assert max(len(chunk) for chunk in chunks) <= 1024
+        assert len(chunks) == 10
+
+    def test_empty_file_yields_nothing(self, tmp_path):
+        """Test that an empty file yields no chunks."""
+        test_file = tmp_path / "empty.txt"
+        test_file.write_text("", encoding="utf-8")
+
+        assert list(iter_file_chunks(str(test_file))) == []
+
+    def test_invalid_chunk_size(self, tmp_path):
+        """Test that a non-positive chunk size raises ValueError."""
+        with pytest.raises(ValueError, match="chunk_size"):
+            list(iter_file_chunks(str(tmp_path / "any.txt"), chunk_size=0))
+
+    def test_file_not_found(self, caplog):
+        """Test FileNotFoundError is raised and logged."""
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(FileNotFoundError):
+                list(iter_file_chunks("/nonexistent/file.txt"))
+
+        assert "File not found" in caplog.text
+
+    def test_is_directory_error(self, tmp_path, caplog):
+        """Test IsADirectoryError is raised and logged."""
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(IsADirectoryError):
+                list(iter_file_chunks(str(tmp_path)))
+
+        assert "Expected a file but found a directory" in caplog.text
+
+    @pytest.mark.skipif(
+        os.getuid() == 0, reason="Skipping permission test when running as root"
+    )
+    def test_permission_error(self, tmp_path, caplog):
+        """Test PermissionError is raised and logged."""
+        test_file = tmp_path / "no_permission.txt"
+        test_file.write_text("test", encoding="utf-8")
+        os.chmod(test_file, 0o000)
+
+        try:
+            with caplog.at_level(logging.ERROR):
+                with pytest.raises(PermissionError):
+                    list(iter_file_chunks(str(test_file)))
+
+            assert "Permission denied" in caplog.text
+        finally:
+            os.chmod(test_file, 0o644)
+
+    def test_unicode_decode_error(self, tmp_path, caplog):
+        """Test UnicodeDecodeError is raised and logged."""
+        test_file = tmp_path / "binary.txt"
+        test_file.write_bytes(b"valid \x80\x81")
+
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(UnicodeDecodeError):
+                list(iter_file_chunks(str(test_file)))
+
+        assert "not UTF-8 encoded" in caplog.text
+
+    def test_truncated_multibyte_at_eof(self, tmp_path):
+        """Test that a truncated character at end of file is an error."""
+        test_file = tmp_path / "truncated.txt"
+        test_file.write_bytes("ok 世".encode("utf-8")[:-1])
+
+        with pytest.raises(UnicodeDecodeError):
+            list(iter_file_chunks(str(test_file), chunk_size=2))
+
+    def test_unexpected_error_is_reraised(self, caplog):
+        """Test that unexpected errors are logged and re-raised."""
+        with patch("builtins.open", side_effect=RuntimeError("Unexpected error")):
+            with caplog.at_level(logging.ERROR):
+                with pytest.raises(RuntimeError):
+                    list(iter_file_chunks("any_file.txt"))
+
+        assert "unexpected error occurred" in caplog.text
+
+    def test_early_close_is_not_an_error(self, tmp_path, caplog):
+        """Test that abandoning the iterator does not log an error."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("x" * 100, encoding="utf-8")
+
+        with caplog.at_level(logging.ERROR):
+            chunks = iter_file_chunks(str(test_file), chunk_size=10)
+            next(chunks)
+            chunks.close()
+
+        assert caplog.text == ""
+
+    def test_logging_on_success(self, tmp_path, caplog):
+        """Test that success is logged once the file is exhausted."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("test content", encoding="utf-8")
+
+        with caplog.at_level(logging.INFO):
+            list(iter_file_chunks(str(test_file)))
+
+        assert "Attempting to read file" in caplog.text
+        assert "Successfully read file" in caplog.text
+
+
+class TestIterFileLines:
+    """Test suite for iter_file_lines function."""
+
+    def test_lines_match_content(self, tmp_path):
+        """Test that lines keep their newlines and join to the full content."""
+        test_file = tmp_path / "lines.txt"
+        test_file.write_text("Line 1\nLine 2\nLine 3", encoding="utf-8")
+
+        lines = list(iter_file_lines(str(test_file)))
+        assert lines == ["Line 1\n", "Line 2\n", "Line 3"]
+
+    def test_crlf_translated(self, tmp_path):
+        """Test that Windows line endings are translated."""
+        test_file = tmp_path / "crlf.txt"
+        test_file.write_bytes(b"a\r\nb\r\n")
+
+        assert list(iter_file_lines(str(test_file))) == ["a\n", "b\n"]
+
+    def test_unicode_lines(self, tmp_path):
+        """Test reading unicode lines."""
+        test_file = tmp_path / "unicode.txt"
+        test_file.write_text("Hello\n世界 🌍\n", encoding="utf-8")
+
+        assert list(iter_file_lines(str(test_file))) == ["Hello\n", "世界 🌍\n"]
+
+    def test_file_not_found(self, caplog):
+        """Test FileNotFoundError is raised and logged."""
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(FileNotFoundError):
+                list(iter_file_lines("/nonexistent/file.txt"))
+
+        assert "File not found" in caplog.text
+
+    def test_is_directory_error(self, tmp_path):
+        """Test IsADirectoryError is raised for directories."""
+        with pytest.raises(IsADirectoryError):
+            list(iter_file_lines(str(tmp_path)))
+
+    def test_unicode_decode_error(self, tmp_path, caplog):
+        """Test UnicodeDecodeError is raised and logged."""
+        test_file = tmp_path / "binary.txt"
+        test_file.write_bytes(b"ok\n\x80\x81\n")
+
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(UnicodeDecodeError):
+                list(iter_file_lines(str(test_file)))
+
+        assert "not UTF-8 encoded" in caplog.text
+
+
+class TestBytesFirstReading:
+    """Test suite for read_file_bytes, decode_text and LazyText."""
+
+    MIXED = b"caf\xc3\xa9\r\nlatin-1 caf\xe9\n"
+
+    def test_read_file_bytes(self, tmp_path):
+        """Test that the raw bytes are returned undecoded."""
+        test_file = tmp_path / "mixed.txt"
+        test_file.write_bytes(self.MIXED)
+        assert read_file_bytes(str(test_file)) == self.MIXED
+
+    def test_read_file_bytes_decompress(self, tmp_path):
+        """Test that compressed files can be read as bytes too."""
+        test_file = tmp_path / "data.gz"
+        test_file.write_bytes(gzip.compress(self.MIXED))
+        assert read_file_bytes(str(test_file), decompress=True) == self.MIXED
+
+    def test_read_file_bytes_missing(self, caplog):
+        """Test that errors follow the file_utils error model."""
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(FileNotFoundError):
+                read_file_bytes("/nonexistent/file.txt")
+        assert "File not found" in caplog.text
+
+    def test_decode_strategies(self):
+        """Test strict, replace and surrogateescape on mixed encodings."""
+        with pytest.raises(UnicodeDecodeError):
+            decode_text(self.MIXED)
+        assert decode_text(self.MIXED, "replace") == "café\nlatin-1 caf�\n"
+
+        escaped = decode_text(self.MIXED, "surrogateescape")
+        assert escaped == "café\nlatin-1 caf\udce9\n"
+        assert escaped.encode("utf-8", "surrogateescape") == self.MIXED.replace(
+            b"\r\n", b"\n"
+        )
+
+    def test_decode_matches_read_file_content(self, tmp_path):
+        """Test that newline handling matches the text-mode reader."""
+        data = "a\r\nb\rc\n€".encode("utf-8")
+        test_file = tmp_path / "text.txt"
+        test_file.write_bytes(data)
+        assert decode_text(data) == read_file_content(str(test_file))
+
+    def test_lazy_ascii_slices_without_full_decode(self):
+        """Test that ASCII content is sliced on the bytes directly."""
+        text = LazyText(b"hello world\n" * 1000)
+
+        with patch.object(file_utils, "decode_text") as mock_decode:
+            assert text.ascii_only
+            assert len(text) == 12000
+            assert text[6:11] == "world"
+            assert text[-1] == "\n"
+        mock_decode.assert_not_called()
+
+    def test_lazy_non_ascii_decodes_once(self):
+        """Test that other content is decoded in full and cached."""
+        text = LazyText("héllo\r\nwörld".encode("utf-8"))
+
+        assert not text.ascii_only
+        assert len(text) == 11
+        assert text[1] == "é"
+        assert text == "héllo\nwörld"
+        assert str(text) is str(text)
+
+    def test_lazy_error_handler(self):
+        """Test that the chosen error handler is used on decode."""
+        assert str(LazyText(self.MIXED, "replace")).endswith("caf�\n")
+        with pytest.raises(UnicodeDecodeError):
+            str(LazyText(self.MIXED))
+
+    @pytest.mark.parametrize("decoded_first", [False, True])
+    def test_lazy_chunks(self, decoded_first):
+        """Test incremental decoding across split characters and CRLF."""
+        data = "é\r\n".encode("utf-8") * 100
+        text = LazyText(data)
+        if decoded_first:
+            str(text)
+
+        chunks = list(text.iter_chunks(chunk_size=3))
+        assert "".join(chunks) == "é\n" * 100
+        with pytest.raises(ValueError):
+            list(text.iter_chunks(chunk_size=0))
+
+
+class TestMapFile:
+    """Test suite for map_file and MappedFile."""
+
+    def test_map_file_bytes(self, tmp_path):
+        """Test that the mapping exposes the raw file bytes."""
+        test_file = tmp_path / "mapped.bin"
+        test_file.write_bytes(b"header\x00payload")
+
+        with map_file(str(test_file)) as mapped:
+            assert len(mapped) == 14
+            assert bytes(mapped.view) == b"header\x00payload"
+            view = mapped.read_bytes(0, 6)
+            assert isinstance(view, memoryview)
+            assert view.readonly
+            assert view == b"header"
+            view.release()
+
+    def test_read_text_range(self, tmp_path):
+        """Test decoding only a slice of the file."""
+        test_file = tmp_path / "mapped.txt"
+        test_file.write_text("Hello, 世界!", encoding="utf-8")
+
+        with map_file(str(test_file)) as mapped:
+            assert mapped.read_text() == "Hello, 世界!"
+            assert mapped.read_text(0, 5) == "Hello"
+            assert mapped.read_text(7, 13) == "世界"
+
+    def test_read_text_split_character(self, tmp_path, caplog):
+        """Test that a range splitting a multibyte character raises."""
+        test_file = tmp_path / "mapped.txt"
+        test_file.write_text("世界", encoding="utf-8")
+
+        with map_file(str(test_file)) as mapped:
+            with caplog.at_level(logging.ERROR):
+                with pytest.raises(UnicodeDecodeError):
+                    mapped.read_text(0, 2)
+
+        assert "not UTF-8 encoded" in caplog.text
+
+    def test_empty_file(self, tmp_path):
+        """Test mapping an empty file."""
+        test_file = tmp_path / "empty.txt"
+        test_file.write_bytes(b"")
+
+        with map_file(str(test_file)) as mapped:
+            assert len(mapped) == 0
+            assert mapped.read_text() == ""
+
+    def test_close_releases_mapping(self, tmp_path):
+        """Test that closing makes further access fail."""
+        test_file = tmp_path / "mapped.txt"
+        test_file.write_text("data", encoding="utf-8")
+
+        mapped = map_file(str(test_file))
+        assert not mapped.closed
+        mapped.close()
+        mapped.close()
+        assert mapped.closed
+        with pytest.raises(ValueError, match="closed"):
+            mapped.read_bytes()
+
+    def test_close_with_live_view_can_be_retried(self, tmp_path):
+        """Test that close refuses while views are exported, then succeeds."""
+        test_file = tmp_path / "mapped.txt"
+        test_file.write_text("data", encoding="utf-8")
+
+        mapped = map_file(str(test_file))
+        view = mapped.read_bytes(0, 2)
+        with pytest.raises(BufferError):
+            mapped.close()
+        view.release()
+        mapped.close()
+        assert mapped.closed
+
+    def test_file_not_found(self, caplog):
+        """Test FileNotFoundError is raised and logged."""
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(FileNotFoundError):
+                map_file("/nonexistent/file.bin")
+
+        assert "File not found" in caplog.text
+
+    def test_is_directory_error(self, tmp_path, caplog):
+        """Test IsADirectoryError is raised and logged."""
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(IsADirectoryError):
+                map_file(str(tmp_path))
+
+        assert "Expected a file but found a directory" in caplog.text
+
+    def test_logging_on_success(self, tmp_path, caplog):
+        """Test that mapping is logged."""
+        test_file = tmp_path / "mapped.txt"
+        test_file.write_text("data", encoding="utf-8")
+
+        with caplog.at_level(logging.INFO):
+            map_file(str(test_file)).close()
+
+        assert "Attempting to map file" in caplog.text
+        assert "Successfully mapped file" in caplog.text
+
+
+class TestReadFileRange:
+    """Test suite for read_file_range."""
+
+    def test_reads_requested_range(self, tmp_path):
+        """Test that exactly the requested bytes are returned."""
+        test_file = tmp_path / "data.bin"
+        test_file.write_bytes(bytes(range(256)))
+
+        assert read_file_range(str(test_file), 10, 5) == bytes(range(10, 15))
+        assert read_file_range(str(test_file), 0, 0) == b""
+
+    def test_range_past_end(self, tmp_path):
+        """Test that ranges are clipped at the end of the file."""
+        test_file = tmp_path / "data.bin"
+        test_file.write_bytes(b"abcdef")
+
+        assert read_file_range(str(test_file), 4, 100) == b"ef"
+        assert read_file_range(str(test_file), 100, 10) == b""
+
+    def test_short_reads_are_retried(self, tmp_path):
+        """Test that a pread returning fewer bytes is continued."""
+        test_file = tmp_path / "data.bin"
+        test_file.write_bytes(b"0123456789")
+        real_pread = file_utils._pread
+
+        def short_pread(f, length, offset):
+            return real_pread(f, min(length, 3), offset)
+
+        with patch.object(file_utils, "_pread", side_effect=short_pread):
+            assert read_file_range(str(test_file), 1, 8) == b"12345678"
+
+    def test_invalid_arguments(self, tmp_path):
+        """Test that negative offsets and lengths raise ValueError."""
+        with pytest.raises(ValueError):
+            read_file_range(str(tmp_path / "x"), -1, 1)
+        with pytest.raises(ValueError):
+            read_file_range(str(tmp_path / "x"), 0, -1)
+
+    def test_missing_file(self, caplog):
+        """Test that errors follow the file_utils error model."""
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(FileNotFoundError):
+                read_file_range("/nonexistent/file.bin", 0, 1)
+        assert "File not found" in caplog.text
+
+
+class TestCopyFile:
+    """Test suite for copy_file."""
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        """A source file larger than one fallback buffer."""
+        path = tmp_path / "source.bin"
+        path.write_bytes(os.urandom(200_000))
+        return path
+
+    def test_copies_content(self, source, tmp_path):
+        """Test that the copy is byte-identical."""
+        target = tmp_path / "copy.bin"
+        assert copy_file(str(source), str(target)) == 200_000
+        assert target.read_bytes() == source.read_bytes()
+
+    def test_overwrites_destination(self, source, tmp_path):
+        """Test that an existing, longer destination is truncated."""
+        target = tmp_path / "copy.bin"
+        target.write_bytes(b"x" * 300_000)
+        copy_file(str(source), str(target))
+        assert target.read_bytes() == source.read_bytes()
+
+    def test_empty_file(self, tmp_path):
+        """Test that an empty file copies to an empty file."""
+        source = tmp_path / "empty"
+        source.write_bytes(b"")
+        assert copy_file(str(source), str(tmp_path / "copy")) == 0
+        assert (tmp_path / "copy").read_bytes() == b""
+
+    @pytest.mark.parametrize("link", [None, os.link, os.symlink])
+    def test_same_file_is_rejected(self, source, tmp_path, link):
+        """Test that copying a file onto itself raises and keeps its content."""
+        content = source.read_bytes()
+        target = source
+        if link is not None:
+            target = tmp_path / "link.bin"
+            link(source, target)
+
+        with pytest.raises(shutil.SameFileError):
+            copy_file(str(source), str(target))
+        assert source.read_bytes() == content
+
+    def test_falls_back_when_syscalls_unsupported(self, source, tmp_path):
+        """Test the sendfile and buffered fallbacks."""
+        unsupported = OSError(errno.EXDEV, "Invalid cross-device link")
+        target = tmp_path / "copy.bin"
+
+        with patch("os.copy_file_range", side_effect=unsupported, create=True):
+            copy_file(str(source), str(target))
+        assert target.read_bytes() == source.read_bytes()
+
+        with patch("os.copy_file_range", side_effect=unsupported, create=True):
+            with patch("os.sendfile", side_effect=unsupported, create=True):
+                assert copy_file(str(source), str(target), chunk_size=4096) == 200_000
+        assert target.read_bytes() == source.read_bytes()
+
+    def test_real_errors_are_not_swallowed(self, source, tmp_path, caplog):
+        """Test that an I/O error mid-copy is raised, not retried."""
+        failure = OSError(errno.EIO, "Input/output error")
+        with patch("os.copy_file_range", side_effect=failure, create=True):
+            with caplog.at_level(logging.ERROR):
+                with pytest.raises(OSError) as excinfo:
+                    copy_file(str(source), str(tmp_path / "copy.bin"))
+        assert excinfo.value.errno == errno.EIO
+        assert "unexpected error" in caplog.text
+
+    def test_missing_destination_directory(self, source, tmp_path, caplog):
+        """Test that the failing destination path is the one logged."""
+        target = tmp_path / "missing" / "copy.bin"
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(FileNotFoundError):
+                copy_file(str(source), str(target))
+        assert f"File not found: {target}" in caplog.text
+
+
+class TestLineIndex:
+    """Test suite for build_line_index and LineIndex."""
+
+    @pytest.fixture
+    def lines_file(self, tmp_path):
+        """A file of numbered lines, one of them non-ASCII."""
+        test_file = tmp_path / "lines.txt"
+        test_file.write_bytes(b"zero\r\none\nt\xc3\xa9\xc3\xa9\n\nfour")
+        return test_file
+
+    def test_fetch_single_lines(self, lines_file):
+        """Test that lines match the text returned by read_file_content."""
+        index = build_line_index(str(lines_file))
+        expected = read_file_content(str(lines_file)).splitlines(keepends=True)
+
+        assert len(index) == 5
+        assert [index.get_line(n) for n in range(5)] == expected
+        assert index.get_line(-1) == "four"
+
+    def test_fetch_ranges(self, lines_file):
+        """Test that get_lines follows slice semantics."""
+        index = build_line_index(str(lines_file))
+
+        assert index.get_lines(1, 3) == ["one\n", "téé\n"]
+        assert index.get_lines(3) == ["\n", "four"]
+        assert index.get_lines(10, 20) == []
+
+    def test_out_of_range(self, lines_file):
+        """Test that a missing line raises IndexError."""
+        index = build_line_index(str(lines_file))
+        with pytest.raises(IndexError):
+            index.get_line(5)
+        with pytest.raises(IndexError):
+            index.get_line(-6)
+
+    def test_trailing_newline_and_empty_file(self, tmp_path):
+        """Test line counts at the edges."""
+        test_file = tmp_path / "trailing.txt"
+        test_file.write_bytes(b"a\nb\n")
+        assert len(build_line_index(str(test_file))) == 2
+
+        empty = tmp_path / "empty.txt"
+        empty.write_bytes(b"")
+        assert len(build_line_index(str(empty))) == 0
+        assert build_line_index(str(empty)).get_lines(0) == []
+
+    def test_lines_across_chunk_boundaries(self, tmp_path):
+        """Test that small build chunks give the same offsets."""
+        test_file = tmp_path / "many.txt"
+        lines = [f"line {i}\n" * (i % 3) for i in range(200)]
+        test_file.write_text("".join(lines), encoding="utf-8")
+
+        index = file_utils.LineIndex(str(test_file), chunk_size=7)
+        expected = read_file_content(str(test_file)).splitlines(keepends=True)
+        assert index.get_lines(0) == expected
+
+    def test_reads_only_requested_bytes(self, lines_file):
+        """Test that a fetch reads the line's bytes, not the whole file."""
+        index = build_line_index(str(lines_file))
+        with patch.object(file_utils, "_pread", wraps=file_utils._pread) as pread:
+            index.get_line(1)
+        pread.assert_called_once()
+        assert pread.call_args.args[1:] == (4, 6)
+
+    def test_rebuilds_after_change(self, lines_file):
+        """Test that a modified file is re-indexed on the next fetch."""
+        index = build_line_index(str(lines_file))
+        lines_file.write_bytes(b"new first\nnew second\n")
+        st = os.stat(lines_file)
+        os.utime(lines_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        assert index.get_line(1) == "new second\n"
+        assert len(index) == 2
+
+    def test_sidecar_reused_while_current(self, lines_file):
+        """Test that a second process loads the sidecar instead of rescanning."""
+        build_line_index(str(lines_file), sidecar=True)
+        sidecar = Path(str(lines_file) + file_utils.LINE_INDEX_SUFFIX)
+        assert sidecar.exists()
+
+        with patch.object(file_utils.LineIndex, "_build") as mock_build:
+            index = build_line_index(str(lines_file), sidecar=True)
+        mock_build.assert_not_called()
+        assert index.get_line(2) == "téé\n"
+
+    def test_stale_or_corrupt_sidecar_is_rebuilt(self, lines_file):
+        """Test that a sidecar for another version of the file is ignored."""
+        sidecar = Path(str(lines_file) + file_utils.LINE_INDEX_SUFFIX)
+        sidecar.write_bytes(b"garbage")
+
+        index = build_line_index(str(lines_file), sidecar=True)
+
+        assert index.get_line(1) == "one\n"
+        assert sidecar.read_bytes().startswith(b"MPLIDX1\n")
+
+    def test_missing_file(self, tmp_path, caplog):
+        """Test that errors follow the file_utils error model."""
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(FileNotFoundError):
+                build_line_index(str(tmp_path / "missing.txt"))
+        assert "File not found" in caplog.text
+
+    def test_invalid_utf8_line(self, tmp_path):
+        """Test that only the fetched line needs to be valid UTF-8."""
+        test_file = tmp_path / "mixed.txt"
+        test_file.write_bytes(b"good\n\xff\xfe\n")
+        index = build_line_index(str(test_file))
+
+        assert index.get_line(0) == "good\n"
+        with pytest.raises(UnicodeDecodeError):
+            index.get_line(1)
+
+
+class TestFileFollower:
+    """Test suite for FileFollower."""
+
+    def test_reads_only_appended_content(self, tmp_path):
+        """Test that each poll returns just the new text."""
+        log = tmp_path / "app.log"
+        log.write_text("first\n", encoding="utf-8")
+
+        with FileFollower(str(log)) as follower:
+            assert follower.read_new() == "first\n"
+            assert follower.read_new() == ""
+            with open(log, "a", encoding="utf-8") as f:
+                f.write("second\n")
+            assert follower.read_new() == "second\n"
+            assert follower.offset == 13
+
+    def test_from_end(self, tmp_path):
+        """Test that from_start=False skips existing content."""
+        log = tmp_path / "app.log"
+        log.write_text("old\n", encoding="utf-8")
+
+        with FileFollower(str(log), from_start=False) as follower:
+            assert follower.read_new() == ""
+            with open(log, "a", encoding="utf-8") as f:
+                f.write("new\n")
+            assert follower.read_new() == "new\n"
+
+    def test_split_multibyte_and_crlf(self, tmp_path):
+        """Test that characters split across polls are decoded once whole."""
+        log = tmp_path / "app.log"
+        encoded = "é\r\n".encode("utf-8")
+        log.write_bytes(encoded[:1])
+
+        with FileFollower(str(log)) as follower:
+            assert follower.read_new() == ""
+            with open(log, "ab") as f:
+                f.write(encoded[1:3])
+            assert follower.read_new() == "é"
+            with open(log, "ab") as f:
+                f.write(encoded[3:])
+            assert follower.read_new() == "\n"
+
+    def test_invalid_bytes_are_not_skipped(self, tmp_path):
+        """Test that a decode error neither loses data nor moves the offset."""
+        log = tmp_path / "app.log"
+        log.write_bytes(b"first\n")
+
+        with FileFollower(str(log)) as follower:
+            assert follower.read_new() == "first\n"
+            with open(log, "ab") as f:
+                f.write(b"bad \xff\n" + b"valid line\n")
+            for _ in range(2):
+                with pytest.raises(UnicodeDecodeError):
+                    follower.read_new()
+                assert follower.offset == len(b"first\n")
+
+        with FileFollower(str(log), errors="replace") as follower:
+            assert follower.read_new() == "first\nbad \ufffd\nvalid line\n"
+
+    def test_truncation_restarts(self, tmp_path):
+        """Test that a truncated file is read again from the start."""
+        log = tmp_path / "app.log"
+        log.write_text("a long first line\n", encoding="utf-8")
+
+        with FileFollower(str(log)) as follower:
+            follower.read_new()
+            log.write_text("short\n", encoding="utf-8")
+            assert follower.read_new() == "short\n"
+
+    def test_rotation_drains_then_switches(self, tmp_path):
+        """Test that a rotated file is finished before the new one is read."""
+        log = tmp_path / "app.log"
+        log.write_text("one\n", encoding="utf-8")
+
+        with FileFollower(str(log)) as follower:
+            assert follower.read_new() == "one\n"
+            with open(log, "a", encoding="utf-8") as f:
+                f.write("two\n")
+            os.rename(log, tmp_path / "app.log.1")
+            assert follower.read_new() == "two\n"
+            assert follower.read_new() == ""  # Not recreated yet.
+            log.write_text("three\n", encoding="utf-8")
+            assert follower.read_new() == "three\n"
+
+    def test_blocking_iterator_stops_on_close(self, tmp_path):
+        """Test that close() from another thread ends iteration."""
+        log = tmp_path / "app.log"
+        log.write_text("start\n", encoding="utf-8")
+        follower = FileFollower(str(log), poll_interval=0.01)
+        seen = []
+
+        def consume():
+            for text in follower:
+                seen.append(text)
+
+        thread = threading.Thread(target=consume)
+        thread.start()
+        time.sleep(0.05)
+        with open(log, "a", encoding="utf-8") as f:
+            f.write("more\n")
+        deadline = time.monotonic() + 2
+        while "".join(seen) != "start\nmore\n" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        follower.close()
+        thread.join(timeout=2)
+
+        assert not thread.is_alive()
+        assert "".join(seen) == "start\nmore\n"
+        assert follower.closed
+
+    def test_async_iterator(self, tmp_path):
+        """Test the asyncio iterator with a short poll interval."""
+        log = tmp_path / "app.log"
+        log.write_text("start\n", encoding="utf-8")
+
+        async def follow():
+            seen = []
+            with FileFollower(str(log), poll_interval=0.01) as follower:
+                async for text in follower:
+                    seen.append(text)
+                    if len(seen) == 1:
+                        with open(log, "a", encoding="utf-8") as f:
+                            f.write("more\n")
+                    else:
+                        follower.close()
+            return seen
+
+        assert asyncio.run(follow()) == ["start\n", "more\n"]
+
+    def test_closed_follower(self, tmp_path):
+        """Test that reading after close raises ValueError."""
+        log = tmp_path / "app.log"
+        log.write_text("x", encoding="utf-8")
+        follower = FileFollower(str(log))
+        follower.close()
+        follower.close()
+        with pytest.raises(ValueError):
+            follower.read_new()
+
+    def test_missing_file_and_bad_arguments(self, tmp_path, caplog):
+        """Test the error model and argument validation."""
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(FileNotFoundError):
+                FileFollower(str(tmp_path / "missing.log"))
+        assert "File not found" in caplog.text
+        with pytest.raises(ValueError):
+            FileFollower(str(tmp_path / "missing.log"), poll_interval=0)
+
+
+COMPRESSORS = {
+    "gzip": gzip.compress,
+    "bz2": bz2.compress,
+    "xz": lzma.compress,
+}
+
+
+class TestCompressedFiles:
+    """Test suite for reading with decompress=True."""
+
+    TEXT = "first line\r\nsecond line é\n" * 500
+
+    @pytest.fixture(params=sorted(COMPRESSORS))
+    def compressed_file(self, request, tmp_path):
+        """The same text compressed with each supported codec."""
+        path = tmp_path / f"data.{request.param}"
+        path.write_bytes(COMPRESSORS[request.param](self.TEXT.encode("utf-8")))
+        return path
+
+    def test_detect_compression(self):
+        """Test magic-byte detection."""
+        assert detect_compression(gzip.compress(b"x")) == "gzip"
+        assert detect_compression(bz2.compress(b"x")) == "bz2"
+        assert detect_compression(lzma.compress(b"x")) == "xz"
+        assert detect_compression(b"plain text") is None
+        assert detect_compression(b"") is None
+
+    def test_whole_content(self, compressed_file):
+        """Test that read_file_content returns the decompressed text."""
+        expected = self.TEXT.replace("\r\n", "\n")
+        assert read_file_content(str(compressed_file), decompress=True) == expected
+
+    def test_chunks_and_lines(self, compressed_file):
+        """Test that the streaming readers match the whole-content reader."""
+        expected = self.TEXT.replace("\r\n", "\n")
+        chunks = list(
+            iter_file_chunks(str(compressed_file), chunk_size=100, decompress=True)
+        )
+        lines = list(iter_file_lines(str(compressed_file), decompress=True))
+
+        assert "".join(chunks) == expected
+        assert max(len(chunk.encode("utf-8")) for chunk in chunks) <= 100
+        assert lines == expected.splitlines(keepends=True)
+
+    def test_plain_files_unchanged(self, tmp_path):
+        """Test that decompress=True reads uncompressed files as usual."""
+        test_file = tmp_path / "plain.txt"
+        test_file.write_text("plain\n", encoding="utf-8")
+
+        assert read_file_content(str(test_file), decompress=True) == "plain\n"
+        assert list(iter_file_lines(str(test_file), decompress=True)) == ["plain\n"]
+
+    def test_compressed_bytes_need_opt_in(self, tmp_path):
+        """Test that the default mode does not decompress."""
+        test_file = tmp_path / "data.gz"
+        test_file.write_bytes(gzip.compress(b"hello"))
+        with pytest.raises(UnicodeDecodeError):
+            read_file_content(str(test_file))
+
+    def test_corrupt_archive_is_logged(self, tmp_path, caplog):
+        """Test that a truncated archive is reported as an error."""
+        test_file = tmp_path / "broken.gz"
+        test_file.write_bytes(gzip.compress(b"hello world" * 100)[:20])
+
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(EOFError):
+                list(iter_file_chunks(str(test_file), decompress=True))
+        assert "unexpected error" in caplog.text
+
+    @pytest.mark.parametrize("processes", [False, True])
+    def test_bulk_decompression(self, tmp_path, processes):
+        """Test that bulk reads decompress on threads or processes."""
+        paths = []
+        for i, (name, compress) in enumerate(sorted(COMPRESSORS.items())):
+            path = tmp_path / f"{i}.{name}"
+            path.write_bytes(compress(f"file {i}\n".encode("utf-8")))
+            paths.append(str(path))
+        paths.append(str(tmp_path / "missing.gz"))
+
+        results = read_many_files(
+            paths, max_workers=2, decompress=True, processes=processes
+        )
+
+        assert [r.content for r in results[:3]] == ["file 0\n", "file 1\n", "file 2\n"]
+        assert isinstance(results[3].error, FileNotFoundError)
+
+
+class TestReadManyFiles:
+    """Test suite for read_many_files and iter_read_many_files."""
+
+    @pytest.fixture
+    def sample_files(self, tmp_path):
+        """Create a handful of small files and return their paths."""
+        paths = []
+        for i in range(20):
+            path = tmp_path / f"file_{i}.txt"
+            path.write_text(f"content {i}", encoding="utf-8")
+            paths.append(str(path))
+        return paths
+
+    def test_results_in_input_order(self, sample_files):
+        """Test that results match input order and content."""
+        results = read_many_files(sample_files, max_workers=4)
+
+        assert [r.filepath for r in results] == sample_files
+        assert [r.index for r in results] == list(range(20))
+        assert [r.content for r in results] == [f"content {i}" for i in range(20)]
+        assert all(r.ok for r in results)
+
+    def test_errors_collected_per_file(self, sample_files, tmp_path, caplog):
+        """Test that a failing file does not abort the batch."""
+        bad_utf8 = tmp_path / "binary.txt"
+        bad_utf8.write_bytes(b"\x80\x81")
+        paths = [sample_files[0], "/nonexistent/file.txt", str(tmp_path), str(bad_utf8)]
+
+        with caplog.at_level(logging.ERROR):
+            results = read_many_files(paths)
+
+        assert results[0].ok and results[0].content == "content 0"
+        assert isinstance(results[1].error, FileNotFoundError)
+        assert isinstance(results[2].error, IsADirectoryError)
+        assert isinstance(results[3].error, UnicodeDecodeError)
+        assert all(r.content is None for r in results[1:])
+        assert "File not found" in caplog.text
+
+    def test_accepts_generator_input(self, sample_files):
+        """Test that any iterable of paths is accepted."""
+        results = read_many_files(path for path in sample_files)
+        assert len(results) == 20
+
+    def test_empty_input(self):
+        """Test that an empty input returns an empty list."""
+        assert read_many_files([]) == []
+        assert list(iter_read_many_files([])) == []
+
+    def test_invalid_max_workers(self, sample_files):
+        """Test that a non-positive worker count raises ValueError."""
+        with pytest.raises(ValueError):
+            read_many_files(sample_files, max_workers=0)
+
+    def test_as_completed_yields_every_result(self, sample_files):
+        """Test that the streaming variant yields one result per path."""
+        results = list(iter_read_many_files(sample_files, max_workers=2))
+
+        assert sorted(r.index for r in results) == list(range(20))
+        for result in results:
+            assert result.content == f"content {result.index}"
+            assert result.filepath == sample_files[result.index]
+
+    def test_as_completed_collects_errors(self, sample_files):
+        """Test that the streaming variant records per-file errors."""
+        paths = sample_files[:3] + ["/nonexistent/file.txt"]
+        results = sorted(iter_read_many_files(paths), key=lambda r: r.index)
+
+        assert [r.ok for r in results] == [True, True, True, False]
+        assert isinstance(results[3].error, FileNotFoundError)
+
+
+class TestHashFile:
+    """Test suite for hash_file and new_hasher."""
+
+    def test_matches_hashlib(self, tmp_path):
+        """Test that chunked hashing equals a one-shot digest."""
+        data = os.urandom(10_000)
+        test_file = tmp_path / "data.bin"
+        test_file.write_bytes(data)
+
+        assert hash_file(str(test_file), chunk_size=333) == (
+            hashlib.sha256(data).hexdigest()
+        )
+        assert hash_file(str(test_file), "md5") == hashlib.md5(data).hexdigest()
+
+    def test_fast_checksum(self, tmp_path):
+        """Test the non-cryptographic crc32 option."""
+        data = b"hello world" * 1000
+        test_file = tmp_path / "data.bin"
+        test_file.write_bytes(data)
+
+        digest = hash_file(str(test_file), "crc32", chunk_size=7)
+        assert digest == f"{zlib.crc32(data):08x}"
+
+    def test_empty_file(self, tmp_path):
+        """Test that an empty file hashes to the empty digest."""
+        test_file = tmp_path / "empty.bin"
+        test_file.write_bytes(b"")
+        assert hash_file(str(test_file)) == hashlib.sha256(b"").hexdigest()
+
+    def test_missing_file_logged_and_raised(self, caplog):
+        """Test that read errors follow the file_utils error model."""
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(FileNotFoundError):
+                hash_file("/nonexistent/file.bin")
+        assert "File not found" in caplog.text
+
+    def test_invalid_arguments(self, tmp_path):
+        """Test that bad algorithms and chunk sizes raise ValueError."""
+        test_file = tmp_path / "data.bin"
+        test_file.write_bytes(b"x")
+        with pytest.raises(ValueError):
+            hash_file(str(test_file), "not-a-hash")
+        with pytest.raises(ValueError):
+            hash_file(str(test_file), chunk_size=0)
+
+
+class TestFindDuplicateFiles:
+    """Test suite for find_duplicate_files."""
+
+    def test_groups_identical_files(self, tmp_path):
+        """Test that equal files are grouped and distinct ones are not."""
+        contents = {
+            "a1": b"same" * 100,
+            "a2": b"same" * 100,
+            "b": b"diff" * 100,
+            "c1": b"x",
+            "c2": b"x",
+            "lonely": b"only one of this size",
+            "e1": b"",
+            "e2": b"",
+        }
+        for name, data in contents.items():
+            (tmp_path / name).write_bytes(data)
+        paths = [str(tmp_path / name) for name in contents]
+
+        groups = find_duplicate_files(paths, max_workers=2, block_size=16)
+
+        assert groups == [
+            [str(tmp_path / "a1"), str(tmp_path / "a2")],
+            [str(tmp_path / "c1"), str(tmp_path / "c2")],
+            [str(tmp_path / "e1"), str(tmp_path / "e2")],
+        ]
+
+    @pytest.mark.parametrize("size", [20, 200])
+    def test_crc32_collisions_are_confirmed(self, tmp_path, monkeypatch, size):
+        """Test that colliding checksums do not group different files."""
+        # Every file gets the same checksum, as if all of them collided.
+        monkeypatch.setattr(file_utils._Crc32, "hexdigest", lambda self: "0" * 8)
+        contents = {
+            "a1": b"a" * size,
+            "b1": b"b" * size,
+            "a2": b"a" * size,
+            "c": b"a" * (size - 1) + b"c",
+            "b2": b"b" * size,
+        }
+        for name, data in contents.items():
+            (tmp_path / name).write_bytes(data)
+        paths = [str(tmp_path / name) for name in contents]
+
+        groups = find_duplicate_files(paths, algorithm="crc32", block_size=16)
+
+        assert groups == [
+            [str(tmp_path / "a1"), str(tmp_path / "a2")],
+            [str(tmp_path / "b1"), str(tmp_path / "b2")],
+        ]
+
+    def test_equal_edges_need_full_hash(self, tmp_path):
+        """Test that files differing only in the middle are told apart."""
+        head, tail = b"H" * 64, b"T" * 64
+        (tmp_path / "one").write_bytes(head + b"1" * 100 + tail)
+        (tmp_path / "two").write_bytes(head + b"2" * 100 + tail)
+        (tmp_path / "three").write_bytes(head + b"1" * 100 + tail)
+        paths = [str(tmp_path / name) for name in ("one", "two", "three")]
+
+        with patch.object(
+            file_utils, "hash_file", wraps=file_utils.hash_file
+        ) as mock_full:
+            groups = find_duplicate_files(paths, block_size=64)
+
+        assert groups == [[str(tmp_path / "one"), str(tmp_path / "three")]]
+        assert mock_full.call_count == 3
+
+    def test_small_files_skip_full_hash(self, tmp_path):
+        """Test that files covered by the edge blocks are not hashed again."""
+        for name in ("a", "b"):
+            (tmp_path / name).write_bytes(b"z" * 100)
+
+        with patch.object(file_utils, "hash_file") as mock_full:
+            groups = find_duplicate_files(
+                [str(tmp_path / "a"), str(tmp_path / "b")], block_size=64
+            )
+
+        assert len(groups) == 1
+        mock_full.assert_not_called()
+
+    def test_unreadable_and_repeated_paths(self, tmp_path, caplog):
+        """Test that missing files are logged and repeated paths ignored."""
+        test_file = tmp_path / "a"
+        test_file.write_bytes(b"data")
+
+        with caplog.at_level(logging.ERROR):
+            groups = find_duplicate_files(
+                [str(test_file), str(test_file), str(tmp_path / "missing")]
+            )
+
+        assert groups == []
+        assert "File not found" in caplog.text
+
+
+class TestSearchFiles:
+    """Test suite for search_files."""
+
+    @pytest.fixture
+    def corpus(self, tmp_path):
+        """A small tree of text files."""
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "a.txt").write_bytes(b"alpha\nneedle one\r\nbeta needle\n")
+        (tmp_path / "sub" / "b.txt").write_bytes(b"nothing here\n\nneedle")
+        (tmp_path / "sub" / "c.bin").write_bytes(b"\xff\xfeneedle\xff\n")
+        (tmp_path / "empty.txt").write_bytes(b"")
+        return tmp_path
+
+    @staticmethod
+    def _sorted(matches):
+        return sorted(matches, key=lambda m: (m.filepath, m.offset))
+
+    @pytest.mark.parametrize("processes", [False, True])
+    def test_literal_over_tree(self, corpus, processes):
+        """Test that every match is found with line numbers and offsets."""
+        matches = self._sorted(
+            search_files("needle", str(corpus), max_workers=2, processes=processes)
+        )
+
+        found = [
+            (os.path.basename(m.filepath), m.line_number, m.offset) for m in matches
+        ]
+        assert found == [
+            ("a.txt", 2, 6),
+            ("a.txt", 3, 23),
+            ("b.txt", 3, 14),
+            ("c.bin", 1, 2),
+        ]
+        assert [m.line for m in matches] == [
+            "needle one",
+            "beta needle",
+            "needle",
+            "��needle�",
+        ]
+
+    def test_regex(self, corpus):
+        """Test that compiled bytes regexes are supported."""
+        pattern = re.compile(rb"^\w+ needle$", re.M)
+        matches = self._sorted(
+            search_files(pattern, str(corpus / "a.txt"), processes=False)
+        )
+        assert [(m.line_number, m.line) for m in matches] == [(3, "beta needle")]
+
+    def test_multiple_paths_and_errors(self, corpus, caplog):
+        """Test explicit file lists, with unreadable paths logged and skipped."""
+        paths = [str(corpus / "a.txt"), str(corpus / "missing.txt")]
+        with caplog.at_level(logging.ERROR):
+            matches = list(search_files(b"beta", paths, processes=False))
+
+        assert [m.line_number for m in matches] == [3]
+        assert "File not found" in caplog.text
+
+    def test_invalid_patterns(self, corpus):
+        """Test that empty literals and str regexes are rejected."""
+        with pytest.raises(ValueError):
+            list(search_files("", str(corpus)))
+        with pytest.raises(TypeError):
+            list(search_files(re.compile("needle"), str(corpus)))
+
+
+class TestAsyncReaders:
+    """Test suite for the asyncio file reading API."""
+
+    def test_read_file_content_async(self, tmp_path):
+        """Test reading a file from a coroutine."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("Hello, 世界!", encoding="utf-8")
+
+        result = asyncio.run(read_file_content_async(str(test_file)))
+        assert result == "Hello, 世界!"
+
+    def test_read_file_content_async_errors(self, tmp_path, caplog):
+        """Test that the async reader re-raises the same exceptions."""
+        with caplog.at_level(logging.ERROR):
+            with pytest.raises(FileNotFoundError):
+                asyncio.run(read_file_content_async("/nonexistent/file.txt"))
+            with pytest.raises(IsADirectoryError):
+                asyncio.run(read_file_content_async(str(tmp_path)))
+
+        assert "File not found" in caplog.text
+
+    def test_aiter_file_chunks(self, tmp_path):
+        """Test the async chunk iterator matches the sync one."""
+        test_file = tmp_path / "chunks.txt"
+        test_file.write_text("世界🌍\r\n" * 100, encoding="utf-8")
+
+        async def collect():
+            return [c async for c in aiter_file_chunks(str(test_file), 5)]
+
+        chunks = asyncio.run(collect())
+        assert chunks == list(iter_file_chunks(str(test_file), 5))
+
+    def test_aiter_file_chunks_early_exit(self, tmp_path):
+        """Test that leaving the iterator early releases the file slot."""
+        test_file = tmp_path / "chunks.txt"
+        test_file.write_text("x" * 100, encoding="utf-8")
+
+        async def run():
+            async with AsyncFileReader(max_open_files=1) as reader:
+                async for _ in aiter_file_chunks(str(test_file), 10, reader):
+                    break
+                # Would deadlock if the first iterator still held the slot.
+                return await reader.read_file_content(str(test_file))
+
+        assert asyncio.run(asyncio.wait_for(run(), timeout=5)) == "x" * 100
+
+    def test_aiter_file_chunks_error(self):
+        """Test that the async chunk iterator re-raises read errors."""
+
+        async def collect():
+            return [c async for c in aiter_file_chunks("/nonexistent/file.txt")]
+
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(collect())
+
+    def test_read_many_files_async(self, tmp_path):
+        """Test the gather-friendly bulk helper."""
+        paths = []
+        for i in range(10):
+            path = tmp_path / f"file_{i}.txt"
+            path.write_text(f"content {i}", encoding="utf-8")
+            paths.append(str(path))
+        paths.append("/nonexistent/file.txt")
+
+        async def run():
+            reader = AsyncFileReader(max_workers=2, max_open_files=3)
+            try:
+                return await asyncio.gather(
+                    read_many_files_async(paths, reader),
+                    read_file_content_async(paths[0], reader),
+                )
+            finally:
+                reader.close()
+
+        results, first = asyncio.run(run())
+        assert first == "content 0"
+        assert [r.content for r in results[:10]] == [f"content {i}" for i in range(10)]
+        assert isinstance(results[10].error, FileNotFoundError)
+
+    def test_open_files_are_capped(self, tmp_path, monkeypatch):
+        """Test that no more than max_open_files reads run at once."""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+        original = file_utils.read_file_content
+
+        def slow_read(filepath):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+            return original(filepath)
+
+        monkeypatch.setattr(file_utils, "read_file_content", slow_read)
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("data", encoding="utf-8")
+
+        async def run():
+            async with AsyncFileReader(max_workers=8, max_open_files=2) as reader:
+                return await asyncio.gather(
+                    *(reader.read_file_content(str(test_file)) for _ in range(10))
+                )
+
+        assert asyncio.run(run()) == ["data"] * 10
+        assert peak <= 2
+
+    def test_repeated_event_loops_do_not_leak(self, tmp_path):
+        """Test that the default reader keeps no loop, reader or thread alive."""
+        paths = []
+        for i in range(200):
+            path = tmp_path / f"file_{i}.txt"
+            path.write_text(f"content {i}", encoding="utf-8")
+            paths.append(str(path))
+        loops = []
+
+        async def run():
+            loops.append(weakref.ref(asyncio.get_running_loop()))
+            return await read_many_files_async(paths)
+
+        def readers():
+            gc.collect()
+            return sum(isinstance(o, AsyncFileReader) for o in gc.get_objects())
+
+        asyncio.run(run())
+        baseline = (readers(), threading.active_count())
+        for _ in range(5):
+            assert all(r.ok for r in asyncio.run(run()))
+
+        assert readers() <= baseline[0]
+        assert threading.active_count() <= baseline[1]
+        assert all(loop() is None for loop in loops)
+
+    def test_cancelled_chunk_read_closes_the_file(self, monkeypatch):
+        """Test that cancelling a consumer mid-read closes the source after it."""
+        started = threading.Event()
+        release = threading.Event()
+        closed = threading.Event()
+
+        def blocking_chunks(filepath, chunk_size):
+            try:
+                yield "first"
+                started.set()
+                release.wait(5)
+                yield "second"
+            finally:
+                closed.set()
+
+        monkeypatch.setattr(file_utils, "iter_file_chunks", blocking_chunks)
+
+        async def run():
+            async with AsyncFileReader(max_workers=2) as reader:
+
+                async def consume():
+                    async for _ in reader.iter_file_chunks("unused"):
+                        pass
+
+                task = asyncio.create_task(consume())
+                loop = asyncio.get_running_loop()
+                assert await loop.run_in_executor(None, started.wait, 5)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                release.set()
+
+        asyncio.run(run())
+        assert closed.wait(5)
+
+    def test_invalid_max_open_files(self):
+        """Test that a non-positive file cap raises ValueError."""
+        with pytest.raises(ValueError, match="max_open_files"):
+            AsyncFileReader(max_open_files=0)
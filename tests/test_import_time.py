@@ -0,0 +1,80 @@
+"""Import-time budget tests for fast command-line startup."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_PATH = Path(__file__).parent.parent / "src"
+
+#: Budget for the cumulative import time of my_project.main, in milliseconds.
+#: Override with MY_PROJECT_IMPORT_BUDGET_MS on unusually slow machines.
+IMPORT_BUDGET_MS = float(os.environ.get("MY_PROJECT_IMPORT_BUDGET_MS", "75"))
+
+#: Modules the plain greeting path must not import.
+HEAVY_MODULES = [
+    "argparse",
+    "asyncio",
+    "concurrent.futures",
+    "dataclasses",
+    "logging.handlers",
+    "my_project.file_utils",
+    "typing",
+]
+
+
+def _run_python(*args):
+    """Run a fresh interpreter with src on the path and return the result."""
+    env = dict(os.environ, PYTHONPATH=str(SRC_PATH))
+    return subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    )
+
+
+def _cumulative_import_ms(module):
+    """Return the cumulative -X importtime of ``module`` in milliseconds."""
+    stderr = _run_python("-X", "importtime", "-c", f"import {module}").stderr
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and line.split("|")[-1].strip() == module:
+            return int(line.split("|")[1]) / 1000
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+class TestImportTime:
+    """Test suite for startup cost of the package."""
+
+    @pytest.mark.parametrize("module", ["my_project", "my_project.main"])
+    def test_import_within_budget(self, module):
+        """Test that importing stays under the budget (best of three runs)."""
+        elapsed = min(_cumulative_import_ms(module) for _ in range(3))
+        assert elapsed < IMPORT_BUDGET_MS, (
+            f"import {module} took {elapsed:.1f} ms, "
+            f"budget is {IMPORT_BUDGET_MS:.1f} ms"
+        )
+
+    def test_heavy_modules_are_lazy(self):
+        """Test that importing main does not pull in heavy modules."""
+        code = (
+            "import sys, my_project.main; "
+            f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+        )
+        assert _run_python("-c", code).stdout.strip() == "[]"
+
+    def test_submodules_load_on_attribute_access(self):
+        """Test that my_project exposes submodules lazily."""
+        code = (
+            "import sys, my_project; "
+            "print('my_project.file_utils' in sys.modules); "
+            "print(callable(my_project.file_utils.read_file_content))"
+        )
+        assert _run_python("-c", code).stdout.split() == ["False", "True"]
+
+    def test_unknown_attribute_raises(self):
+        """Test that unknown attributes still raise AttributeError."""
+        import my_project
+
+        with pytest.raises(AttributeError, match="no_such_module"):
+            my_project.no_such_module  # noqa: B018
+        assert "file_utils" in dir(my_project)
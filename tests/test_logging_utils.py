@@ -0,0 +1,156 @@
+"""Tests for logging configuration helpers."""
+
+import io
+import logging
+import logging.handlers
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from my_project.file_utils import read_file_content
+from my_project.logging_utils import (
+    SamplingFilter,
+    configure_hot_path_logging,
+    configure_logging,
+    get_hot_path_logger,
+    stop_logging,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_hot_path_logging():
+    """Restore hot-path logging and stop any listener after each test."""
+    yield
+    stop_logging()
+    configure_hot_path_logging()
+
+
+class TestConfigureLogging:
+    """Test suite for configure_logging."""
+
+    def test_import_does_not_configure_root_logger(self):
+        """Test that importing the package leaves the root logger alone."""
+        src_path = Path(__file__).parent.parent / "src"
+        code = (
+            "import logging, sys; sys.path.insert(0, %r); "
+            "import my_project.main, my_project.file_utils; "
+            "print(len(logging.getLogger().handlers))" % str(src_path)
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        assert output.strip() == "0"
+
+    def test_noop_when_root_has_handlers(self):
+        """Test that existing handlers are kept unless force is given."""
+        handlers = logging.getLogger().handlers[:]
+        assert configure_logging(non_blocking=True) is None
+        assert logging.getLogger().handlers == handlers
+
+    def test_blocking_mode(self):
+        """Test the synchronous stream handler mode."""
+        stream = io.StringIO()
+        assert configure_logging(stream=stream, fmt="%(message)s", force=True) is None
+
+        logging.getLogger("test").info("hello")
+        assert stream.getvalue() == "hello\n"
+
+    def test_non_blocking_mode(self):
+        """Test that records are written by the listener thread."""
+        stream = io.StringIO()
+        writer_threads = []
+
+        class RecordingFormatter(logging.Formatter):
+            def format(self, record):
+                writer_threads.append(threading.current_thread())
+                return super().format(record)
+
+        fmt = "%(levelname)s %(message)s"
+        listener = configure_logging(
+            stream=stream, fmt=fmt, non_blocking=True, force=True
+        )
+        assert listener is not None
+        listener.handlers[0].setFormatter(RecordingFormatter(fmt))
+        root_handlers = logging.getLogger().handlers
+        assert len(root_handlers) == 1
+        assert isinstance(root_handlers[0], logging.handlers.QueueHandler)
+
+        logging.getLogger("test").warning("queued %s", "record")
+        stop_logging()
+
+        assert stream.getvalue() == "WARNING queued record\n"
+        assert writer_threads and writer_threads[0] is not threading.current_thread()
+        assert logging.getLogger().handlers == []
+
+    def test_stop_logging_without_listener(self):
+        """Test that stop_logging is a no-op when nothing is running."""
+        stop_logging()
+        stop_logging()
+
+
+class TestHotPathLogging:
+    """Test suite for hot-path level and sampling configuration."""
+
+    def test_file_reads_log_to_hot_path_logger(self, tmp_path, caplog):
+        """Test that per-call records use the hot-path logger."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("data", encoding="utf-8")
+
+        with caplog.at_level(logging.INFO):
+            read_file_content(str(test_file))
+
+        names = {record.name for record in caplog.records}
+        assert names == {get_hot_path_logger().name}
+
+    def test_hot_path_level_silences_per_call_records(self, tmp_path, caplog):
+        """Test that raising the hot-path level drops INFO but keeps errors."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("data", encoding="utf-8")
+        configure_hot_path_logging(level=logging.WARNING)
+
+        with caplog.at_level(logging.INFO):
+            read_file_content(str(test_file))
+            with pytest.raises(FileNotFoundError):
+                read_file_content("/nonexistent/file.txt")
+
+        assert "Successfully read file" not in caplog.text
+        assert "File not found" in caplog.text
+
+    def test_hot_path_sampling(self, tmp_path, caplog):
+        """Test that sampling keeps one in N per-call records."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("data", encoding="utf-8")
+        configure_hot_path_logging(sample_every=10)
+
+        with caplog.at_level(logging.INFO):
+            for _ in range(50):
+                read_file_content(str(test_file))
+
+        assert len(caplog.records) == 10
+
+    def test_reconfigure_replaces_sampling_filter(self):
+        """Test that reconfiguring does not stack sampling filters."""
+        configure_hot_path_logging(sample_every=5)
+        configure_hot_path_logging(sample_every=3)
+        filters = get_hot_path_logger().filters
+        assert [f.every for f in filters] == [3]
+        configure_hot_path_logging()
+        assert get_hot_path_logger().filters == []
+
+
+class TestSamplingFilter:
+    """Test suite for SamplingFilter."""
+
+    def test_warnings_always_pass(self):
+        """Test that WARNING and above are never sampled out."""
+        sampler = SamplingFilter(1000)
+        record = logging.LogRecord("x", logging.ERROR, __file__, 1, "m", None, None)
+        assert all(sampler.filter(record) for _ in range(10))
+
+    def test_invalid_rate(self):
+        """Test that a non-positive rate raises ValueError."""
+        with pytest.raises(ValueError, match="every"):
+            SamplingFilter(0)
@@ -1,12 +1,20 @@
 """Tests for main application module."""
 
+import io
 import logging
 import sys
 from unittest.mock import patch
 
 import pytest
 
-from my_project.main import main, parse_args, sample_function
+from my_project.main import (
+    greet_stream,
+    iter_sample_function_batches,
+    main,
+    parse_args,
+    sample_function,
+    sample_function_batch,
+)
 
 
 class TestSampleFunction:
@@ -75,6 +83,199 @@ class TestSampleFunction:
             sample_function(["Alice"])
 
 
+class _FakeArrowArray:
+    """Minimal stand-in for a pyarrow string array."""
+
+    def __init__(self, values):
+        self._values = values
+
+    def __len__(self):
+        return len(self._values)
+
+    def slice(self, offset, length):
+        return _FakeArrowArray(self._values[offset : offset + length])
+
+    def to_pylist(self):
+        return list(self._values)
+
+
+class _FakeNumpyArray:
+    """Minimal stand-in for a one-dimensional NumPy string array."""
+
+    ndim = 1
+
+    def __init__(self, values):
+        self._values = values
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, index):
+        return _FakeNumpyArray(self._values[index])
+
+    def tolist(self):
+        return list(self._values)
+
+
+class TestSampleFunctionBatch:
+    """Test suite for the batch greeting API."""
+
+    def test_batch_matches_sample_function(self):
+        """Test that batch output equals per-name output."""
+        names = ["Alice", "世界", "@User!", "x" * 1000]
+        batch = sample_function_batch(names)
+
+        assert batch.ok
+        assert batch.start == 0
+        assert batch.greetings == [sample_function(name) for name in names]
+
+    def test_invalid_names_reported_by_index(self):
+        """Test that invalid names are collected instead of raising."""
+        batch = sample_function_batch(["Alice", "", "   ", "Bob", "\t\n"])
+
+        assert not batch.ok
+        assert batch.greetings[0] == sample_function("Alice")
+        assert batch.greetings[1:3] == [None, None]
+        assert batch.greetings[3] == sample_function("Bob")
+        assert [index for index, _ in batch.errors] == [1, 2, 4]
+        assert all(isinstance(error, ValueError) for _, error in batch.errors)
+        assert "cannot be empty" in str(batch.errors[0][1])
+        with pytest.raises(ValueError) as single:
+            sample_function("")
+        assert {str(error) for _, error in batch.errors} == {str(single.value)}
+
+    def test_mixed_types_reported_by_index(self):
+        """Test that non-string entries produce TypeError entries."""
+        batch = sample_function_batch(["Alice", 123, None, ""])
+
+        assert batch.greetings[0] == sample_function("Alice")
+        assert batch.greetings[1:] == [None, None, None]
+        errors = dict(batch.errors)
+        assert isinstance(errors[1], TypeError)
+        assert "Expected string" in str(errors[2])
+        assert isinstance(errors[3], ValueError)
+
+    def test_empty_input(self):
+        """Test that an empty input yields an empty batch."""
+        batch = sample_function_batch([])
+        assert batch.greetings == []
+        assert batch.ok
+
+    def test_generator_mode_is_bounded(self):
+        """Test that batches are produced lazily from a generator."""
+        consumed = []
+
+        def names():
+            for i in range(25):
+                consumed.append(i)
+                yield "" if i == 12 else f"name{i}"
+
+        batches = iter_sample_function_batches(names(), batch_size=10)
+        first = next(batches)
+        assert len(consumed) == 10
+        assert first.start == 0 and len(first.greetings) == 10
+
+        rest = list(batches)
+        assert [b.start for b in rest] == [10, 20]
+        assert [len(b.greetings) for b in rest] == [10, 5]
+        assert [index for index, _ in rest[0].errors] == [12]
+
+    def test_invalid_batch_size(self):
+        """Test that a non-positive batch size raises ValueError."""
+        with pytest.raises(ValueError, match="batch_size"):
+            list(iter_sample_function_batches(["Alice"], batch_size=0))
+
+    def test_arrow_like_input(self):
+        """Test that pyarrow-style arrays are sliced per batch."""
+        array = _FakeArrowArray(["Alice", None, "Bob"])
+        batches = list(iter_sample_function_batches(array, batch_size=2))
+
+        assert [b.start for b in batches] == [0, 2]
+        assert batches[0].greetings == [sample_function("Alice"), None]
+        assert isinstance(batches[0].errors[0][1], TypeError)
+        assert batches[1].greetings == [sample_function("Bob")]
+
+    def test_numpy_like_input(self):
+        """Test that NumPy-style arrays are sliced per batch."""
+        array = _FakeNumpyArray(["Alice", " ", "Bob"])
+        batch = sample_function_batch(array)
+
+        assert batch.greetings == [
+            sample_function("Alice"),
+            None,
+            sample_function("Bob"),
+        ]
+        assert [index for index, _ in batch.errors] == [1]
+
+
+class TestGreetStream:
+    """Test suite for greet_stream."""
+
+    def test_file_to_file(self, tmp_path):
+        """Test greeting every line of a file into an output file."""
+        input_file = tmp_path / "names.txt"
+        input_file.write_text("Alice\nBob\n世界\n", encoding="utf-8")
+        output_file = tmp_path / "greetings.txt"
+
+        lines, errors = greet_stream(str(input_file), str(output_file))
+
+        assert (lines, errors) == (3, 0)
+        assert output_file.read_text(encoding="utf-8").splitlines() == [
+            sample_function("Alice"),
+            sample_function("Bob"),
+            sample_function("世界"),
+        ]
+
+    def test_invalid_lines_reported(self, tmp_path, caplog):
+        """Test that invalid lines are skipped and logged by line number."""
+        input_file = tmp_path / "names.txt"
+        input_file.write_text("Alice\n\n   \nBob", encoding="utf-8")
+        output_file = tmp_path / "greetings.txt"
+
+        with caplog.at_level(logging.ERROR):
+            lines, errors = greet_stream(
+                str(input_file), str(output_file), batch_size=2
+            )
+
+        assert (lines, errors) == (4, 2)
+        assert output_file.read_text(encoding="utf-8").splitlines() == [
+            sample_function("Alice"),
+            sample_function("Bob"),
+        ]
+        assert "Line 2: Name cannot be empty" in caplog.text
+        assert "Line 3: Name cannot be empty" in caplog.text
+
+    def test_stdin_to_stdout(self, capsys):
+        """Test streaming from stdin to stdout with '-'."""
+        with patch("sys.stdin", io.StringIO("Alice\nBob\n")):
+            assert greet_stream("-", "-") == (2, 0)
+
+        assert capsys.readouterr().out.splitlines() == [
+            sample_function("Alice"),
+            sample_function("Bob"),
+        ]
+
+    def test_workers_preserve_order(self, tmp_path):
+        """Test that process sharding keeps input order."""
+        names = [f"name{i}" if i % 7 else "" for i in range(1000)]
+        input_file = tmp_path / "names.txt"
+        input_file.write_text("\n".join(names), encoding="utf-8")
+        output_file = tmp_path / "greetings.txt"
+
+        lines, errors = greet_stream(
+            str(input_file), str(output_file), workers=2, batch_size=64
+        )
+
+        assert (lines, errors) == (1000, 143)
+        expected = [sample_function(name) for name in names if name]
+        assert output_file.read_text(encoding="utf-8").splitlines() == expected
+
+    def test_missing_input_raises(self, tmp_path):
+        """Test that a missing input file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            greet_stream(str(tmp_path / "missing.txt"), str(tmp_path / "out.txt"))
+
+
 class TestParseArgs:
     """Test suite for parse_args function."""
 
@@ -109,6 +310,28 @@ class TestParseArgs:
             args = parse_args()
             assert args.name == "世界"
 
+    def test_parse_args_stream_defaults(self):
+        """Test defaults of the streaming options."""
+        with patch("sys.argv", ["main.py"]):
+            args = parse_args()
+            assert args.input is None
+            assert args.output == "-"
+            assert args.workers == 1
+
+    def test_parse_args_stream_options(self):
+        """Test streaming options."""
+        argv = ["main.py", "--input", "in.txt", "--output", "-", "--workers", "4"]
+        with patch("sys.argv", argv):
+            args = parse_args()
+            assert (args.input, args.output, args.workers) == ("in.txt", "-", 4)
+
+    def test_parse_args_invalid_workers_exits(self):
+        """Test that a non-positive worker count is rejected."""
+        with patch("sys.argv", ["main.py", "--input", "-", "--workers", "0"]):
+            with pytest.raises(SystemExit) as exc_info:
+                parse_args()
+            assert exc_info.value.code == 2
+
     def test_parse_args_special_characters(self):
         """Test name with special characters."""
         with patch("sys.argv", ["main.py", "--name", "@User#123!"]):
@@ -206,3 +429,41 @@ class TestMain:
                     main()
                 assert exc_info.value.code == 0
                 assert "@User#123!" in caplog.text
+
+    def test_main_stream_success(self, tmp_path):
+        """Test main in streaming mode exits 0 when every line is valid."""
+        input_file = tmp_path / "names.txt"
+        input_file.write_text("Alice\nBob\n", encoding="utf-8")
+        output_file = tmp_path / "out.txt"
+
+        argv = ["main.py", "--input", str(input_file), "--output", str(output_file)]
+        with patch("sys.argv", argv):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 0
+        assert len(output_file.read_text(encoding="utf-8").splitlines()) == 2
+
+    def test_main_stream_invalid_lines(self, tmp_path, caplog):
+        """Test main in streaming mode exits 1 and summarizes errors."""
+        input_file = tmp_path / "names.txt"
+        input_file.write_text("Alice\n\nBob\n", encoding="utf-8")
+        output_file = tmp_path / "out.txt"
+
+        argv = ["main.py", "--input", str(input_file), "--output", str(output_file)]
+        with patch("sys.argv", argv):
+            with caplog.at_level(logging.ERROR):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+                assert exc_info.value.code == 1
+                assert "Line 2:" in caplog.text
+                assert "1 of 3 lines were invalid" in caplog.text
+
+    def test_main_stream_missing_input(self, tmp_path, caplog):
+        """Test main in streaming mode exits 1 when the input is missing."""
+        argv = ["main.py", "--input", str(tmp_path / "missing.txt")]
+        with patch("sys.argv", argv):
+            with caplog.at_level(logging.ERROR):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+                assert exc_info.value.code == 1
+                assert "File not found" in caplog.text
@@ -0,0 +1,143 @@
+"""Peak-memory regression tests for bulk file reads and greeting batches.
+
+Budgets are bytes of traced peak memory per item, on top of the payload
+(file contents or greetings) the caller asked for. They are several times
+the current measurements, so they catch per-item overhead creeping back
+in, such as a future, a dict or a copy per item, rather than small
+fluctuations between Python versions.
+"""
+
+import gc
+import logging
+import sys
+import tracemalloc
+
+import pytest
+
+from my_project.file_utils import (
+    FileReadResult,
+    iter_read_many_files,
+    read_file_content,
+    read_many_files,
+)
+from my_project.main import (
+    GreetingBatch,
+    iter_sample_function_batches,
+    sample_function,
+    sample_function_batch,
+)
+
+FILE_COUNT = 2000
+NAME_COUNT = 100_000
+
+#: Budget per file for read_many_files and plain read_file_content loops.
+READ_OVERHEAD_PER_FILE = 512
+
+#: Budget per name for sample_function_batch.
+GREETING_OVERHEAD_PER_NAME = 32
+
+#: Budget for the whole run of a streaming API, whatever the input length.
+STREAMING_PEAK = 1024 * 1024
+
+
+def _peak(function):
+    """Return the traced peak memory of a call and the call's result."""
+    # Captured per-call log records would be charged to the call.
+    logging.disable(logging.CRITICAL)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        logging.disable(logging.NOTSET)
+    return peak, result
+
+
+@pytest.fixture(scope="module")
+def small_files(tmp_path_factory):
+    """Many small files with distinct content."""
+    directory = tmp_path_factory.mktemp("memory")
+    paths = []
+    for i in range(FILE_COUNT):
+        path = directory / f"file{i}.txt"
+        path.write_text(f"line {i:08d}\n", encoding="utf-8")
+        paths.append(str(path))
+    # Warm up imports and caches so they are not charged to the first test.
+    read_many_files(paths[:8], max_workers=2)
+    return paths
+
+
+@pytest.fixture(scope="module")
+def names():
+    return [f"name{i}" for i in range(NAME_COUNT)]
+
+
+class TestResultRecords:
+    """Test suite for the size of result records."""
+
+    @pytest.mark.parametrize(
+        "record",
+        [
+            FileReadResult(0, "path", content="text"),
+            GreetingBatch(0, [], []),
+        ],
+    )
+    def test_records_have_no_instance_dict(self, record):
+        """Test that result records store their fields in slots only."""
+        assert not hasattr(record, "__dict__")
+        assert sys.getsizeof(record) <= sys.getsizeof(tuple(record))
+
+
+class TestBulkReadMemory:
+    """Test suite for the peak memory of bulk file reads."""
+
+    def test_read_file_content_loop(self, small_files):
+        """Test that reading files one by one only keeps their contents."""
+        peak, contents = _peak(lambda: [read_file_content(p) for p in small_files])
+
+        payload = sum(sys.getsizeof(content) for content in contents)
+        assert (peak - payload) / FILE_COUNT < READ_OVERHEAD_PER_FILE
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_read_many_files(self, small_files, max_workers):
+        """Test that bulk reads do not hold a future per file."""
+        peak, results = _peak(lambda: read_many_files(small_files, max_workers))
+
+        assert all(result.ok for result in results)
+        payload = sum(sys.getsizeof(result.content) for result in results)
+        assert (peak - payload) / FILE_COUNT < READ_OVERHEAD_PER_FILE
+
+    def test_iter_read_many_files_is_bounded(self, small_files):
+        """Test that streaming bulk reads use memory independent of the count."""
+        peak, count = _peak(
+            lambda: sum(1 for _ in iter_read_many_files(small_files, max_workers=4))
+        )
+
+        assert count == FILE_COUNT
+        assert peak < STREAMING_PEAK
+
+
+class TestGreetingBatchMemory:
+    """Test suite for the peak memory of greeting batches."""
+
+    def test_sample_function_batch(self, names):
+        """Test that a batch costs little more than its greeting strings."""
+        peak, batch = _peak(lambda: sample_function_batch(names))
+
+        assert batch.ok
+        payload = sys.getsizeof(sample_function(names[-1])) * NAME_COUNT
+        assert (peak - payload) / NAME_COUNT < GREETING_OVERHEAD_PER_NAME
+
+    def test_iter_sample_function_batches_is_bounded(self, names):
+        """Test that streaming greetings use memory independent of the count."""
+        peak, count = _peak(
+            lambda: sum(
+                len(batch.greetings)
+                for batch in iter_sample_function_batches(iter(names), batch_size=1000)
+            )
+        )
+
+        assert count == NAME_COUNT
+        assert peak < STREAMING_PEAK
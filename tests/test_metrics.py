@@ -0,0 +1,175 @@
+"""Tests for the file I/O metrics registry."""
+
+import threading
+
+import pytest
+
+from my_project import file_utils
+from my_project.metrics import FileIOMetrics, file_io_metrics
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    """Start every test from empty global counters."""
+    file_io_metrics.reset()
+    yield
+    file_io_metrics.reset()
+
+
+class TestFileIOMetrics:
+    """Test suite for FileIOMetrics."""
+
+    def test_record_updates_snapshot(self):
+        """Test that recorded calls are merged into the snapshot."""
+        metrics = FileIOMetrics(buckets=(0.01, 0.1))
+        metrics.record("read", 0.005, bytes_read=10, files_opened=1)
+        metrics.record("read", 0.05, bytes_read=5, files_opened=1)
+        metrics.record("read", 1.0, error="FileNotFoundError")
+
+        stats = metrics.snapshot()["read"]
+        assert (stats.calls, stats.bytes_read, stats.files_opened) == (3, 15, 2)
+        assert stats.errors == {"FileNotFoundError": 1}
+        assert stats.duration_counts == (1, 1, 1)
+        assert stats.duration_sum == pytest.approx(1.055)
+
+    def test_counts_from_finished_threads_are_kept(self):
+        """Test that every thread's shard is merged, even after it exits."""
+        metrics = FileIOMetrics()
+
+        def worker():
+            for _ in range(1000):
+                metrics.record("read", 0.0, bytes_read=1)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = metrics.snapshot()["read"]
+        assert (stats.calls, stats.bytes_read) == (8000, 8000)
+
+    def test_observe_records_exception_type(self):
+        """Test that an escaping exception is counted by type and re-raised."""
+        metrics = FileIOMetrics()
+        with pytest.raises(KeyError):
+            with metrics.observe("lookup"):
+                raise KeyError("missing")
+
+        assert metrics.snapshot()["lookup"].errors == {"KeyError": 1}
+
+    def test_reset_clears_counters(self):
+        """Test that reset() empties the snapshot."""
+        metrics = FileIOMetrics()
+        metrics.record("read", 0.0)
+        metrics.reset()
+        assert metrics.snapshot() == {}
+
+    def test_rejects_unsorted_buckets(self):
+        """Test that histogram bounds must increase."""
+        with pytest.raises(ValueError):
+            FileIOMetrics(buckets=(0.1, 0.01))
+
+    def test_prometheus_export(self):
+        """Test the text exposition format, including cumulative buckets."""
+        metrics = FileIOMetrics(buckets=(0.01, 0.1))
+        metrics.record("read", 0.005, bytes_read=3, files_opened=1)
+        metrics.record("read", 0.5, error='Bad"Error')
+
+        text = metrics.to_prometheus()
+        assert text.endswith("\n")
+        assert "# TYPE my_project_file_calls_total counter" in text
+        assert 'my_project_file_calls_total{operation="read"} 2' in text
+        assert 'my_project_file_bytes_read_total{operation="read"} 3' in text
+        assert 'my_project_file_opened_total{operation="read"} 1' in text
+        assert (
+            'my_project_file_errors_total{operation="read",type="Bad\\"Error"} 1'
+            in text
+        )
+        assert (
+            'my_project_file_call_duration_seconds_bucket{operation="read",le="0.01"} 1'
+            in text
+        )
+        assert (
+            'my_project_file_call_duration_seconds_bucket{operation="read",le="+Inf"} 2'
+            in text
+        )
+        assert 'my_project_file_call_duration_seconds_count{operation="read"} 2' in text
+
+
+class TestFileUtilsInstrumentation:
+    """Test that file_utils readers record into the global registry."""
+
+    def test_read_file_content(self, tmp_path):
+        """Test bytes, opens and calls for a whole-file read."""
+        test_file = tmp_path / "data.txt"
+        test_file.write_bytes("héllo\r\n".encode("utf-8"))
+
+        file_utils.read_file_content(str(test_file))
+
+        stats = file_io_metrics.snapshot()["read_file_content"]
+        assert (stats.calls, stats.files_opened, stats.bytes_read) == (1, 1, 8)
+        assert stats.errors == {}
+
+    def test_missing_file_counts_error(self, tmp_path):
+        """Test that a failed open is counted as an error, not an open."""
+        with pytest.raises(FileNotFoundError):
+            file_utils.read_file_content(str(tmp_path / "missing.txt"))
+
+        stats = file_io_metrics.snapshot()["read_file_content"]
+        assert stats.files_opened == 0
+        assert stats.errors == {"FileNotFoundError": 1}
+
+    def test_streaming_readers(self, tmp_path):
+        """Test that chunk and line readers count the bytes they consumed."""
+        test_file = tmp_path / "data.txt"
+        test_file.write_text("a\nb\nc\n", encoding="utf-8")
+
+        list(file_utils.iter_file_chunks(str(test_file), chunk_size=2))
+        list(file_utils.iter_file_lines(str(test_file)))
+
+        snapshot = file_io_metrics.snapshot()
+        assert snapshot["iter_file_chunks"].bytes_read == 6
+        assert snapshot["iter_file_lines"].bytes_read == 6
+
+    def test_abandoned_generator_is_not_an_error(self, tmp_path):
+        """Test that closing a chunk generator early is recorded as a call."""
+        test_file = tmp_path / "data.txt"
+        test_file.write_text("abcdef", encoding="utf-8")
+
+        chunks = file_utils.iter_file_chunks(str(test_file), chunk_size=2)
+        next(chunks)
+        chunks.close()
+
+        stats = file_io_metrics.snapshot()["iter_file_chunks"]
+        assert (stats.calls, stats.bytes_read, stats.errors) == (1, 2, {})
+
+    def test_bulk_reads(self, tmp_path):
+        """Test that each file of a bulk read is counted."""
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"{i}.txt"
+            path.write_text("x" * i, encoding="utf-8")
+            paths.append(str(path))
+        paths.append(str(tmp_path / "missing.txt"))
+
+        file_utils.read_many_files(paths, max_workers=2)
+
+        stats = file_io_metrics.snapshot()["read_many_files"]
+        assert (stats.calls, stats.files_opened, stats.bytes_read) == (4, 3, 3)
+        assert stats.errors == {"FileNotFoundError": 1}
+
+    def test_shards_of_exited_threads_are_retired(self, tmp_path):
+        """Test that repeated bulk reads keep the shard count bounded."""
+        paths = []
+        for i in range(20):
+            path = tmp_path / f"{i}.txt"
+            path.write_text("x", encoding="utf-8")
+            paths.append(str(path))
+
+        for _ in range(50):
+            file_utils.read_many_files(paths, max_workers=4)
+
+        assert len(file_io_metrics._shards) <= threading.active_count()
+        stats = file_io_metrics.snapshot()["read_many_files"]
+        assert (stats.calls, stats.bytes_read) == (1000, 1000)
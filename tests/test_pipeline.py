@@ -0,0 +1,175 @@
+"""Tests for the streaming pipeline."""
+
+import threading
+import time
+
+import pytest
+
+from my_project.file_utils import iter_file_lines
+from my_project.main import sample_function
+from my_project.pipeline import Pipeline, Stage
+
+
+def _double(value):
+    """Module-level so process pools can pickle it."""
+    return value * 2
+
+
+def _fail_on_three(value):
+    if value == 3:
+        raise ValueError("three")
+    return value
+
+
+class TestPipeline:
+    """Test suite for Pipeline."""
+
+    def test_single_threaded_stages(self):
+        """Test that items flow through every stage in order."""
+        out = []
+        stats = Pipeline(
+            [Stage("double", _double), Stage("str", str)], batch_size=3
+        ).run(range(10), out.append)
+
+        assert out == [str(i * 2) for i in range(10)]
+        assert [(s.name, s.items_in, s.items_out) for s in stats] == [
+            ("double", 10, 10),
+            ("str", 10, 10),
+        ]
+
+    @pytest.mark.parametrize("processes", [False, True])
+    def test_parallel_stage_keeps_order(self, processes):
+        """Test that several workers still emit results in input order."""
+        out = []
+        Pipeline(
+            [Stage("double", _double, workers=3, processes=processes)], batch_size=7
+        ).run(range(1000), out.append)
+
+        assert out == [i * 2 for i in range(1000)]
+
+    def test_flat_stage_filters_and_splits(self):
+        """Test that flat stages may emit zero or several items per input."""
+        out = []
+        stage = Stage("split", lambda line: line.split(), flat=True)
+        Pipeline([stage]).run(["a b", "", "c"], out.append)
+
+        assert out == ["a", "b", "c"]
+
+    def test_names_file_to_greetings(self, tmp_path):
+        """Test the read, greet and write job end to end."""
+        names = tmp_path / "names.txt"
+        names.write_text("Alice\nBob\n", encoding="utf-8")
+        output = tmp_path / "greetings.txt"
+
+        with open(output, "w", encoding="utf-8") as out:
+            Pipeline(
+                [
+                    Stage("strip", str.strip),
+                    Stage("greet", sample_function, workers=2, processes=True),
+                ]
+            ).run(iter_file_lines(str(names)), lambda g: out.write(g + "\n"))
+
+        assert output.read_text(encoding="utf-8").splitlines() == [
+            sample_function("Alice"),
+            sample_function("Bob"),
+        ]
+
+    def test_stage_error_stops_pipeline(self):
+        """Test that a failing stage shuts everything down and re-raises."""
+        consumed = []
+
+        def source():
+            for i in range(100_000):
+                consumed.append(i)
+                yield i
+
+        with pytest.raises(ValueError, match="three"):
+            Pipeline(
+                [Stage("check", _fail_on_three, workers=2)],
+                batch_size=1,
+                queue_size=2,
+            ).run(source(), lambda item: None)
+
+        assert len(consumed) < 100
+        assert not [t for t in threading.enumerate() if t.name.startswith("pipeline")]
+
+    def test_source_and_sink_errors(self):
+        """Test that errors outside the stages are re-raised too."""
+
+        def broken_source():
+            yield 1
+            raise OSError("disk gone")
+
+        with pytest.raises(OSError, match="disk gone"):
+            Pipeline([Stage("double", _double)]).run(broken_source(), print)
+
+        def broken_sink(item):
+            raise RuntimeError("sink")
+
+        with pytest.raises(RuntimeError, match="sink"):
+            Pipeline([Stage("double", _double)]).run(range(10), broken_sink)
+
+    def test_keyboard_interrupt_shuts_down(self):
+        """Test that an interrupt in the sink stops all threads and propagates."""
+
+        def interrupt(item):
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            Pipeline([Stage("double", _double, workers=2)]).run(
+                iter(range(10**9)), interrupt
+            )
+        assert not [t for t in threading.enumerate() if t.name.startswith("pipeline")]
+
+        # A source blocked inside its iterator and a slow stage with batches
+        # queued and in flight must not delay the shutdown.
+        release = threading.Event()
+
+        def blocking_source():
+            yield from range(64)
+            release.wait(10)
+
+        def slow(item):
+            time.sleep(0.05)
+            return item
+
+        start = time.perf_counter()
+        try:
+            with pytest.raises(KeyboardInterrupt):
+                Pipeline([Stage("slow", slow, workers=2)], batch_size=8).run(
+                    blocking_source(), interrupt
+                )
+            # One batch takes 0.4 s; finishing the queued ones would take 1.6 s.
+            assert time.perf_counter() - start < 1.5
+        finally:
+            release.set()
+
+    def test_backpressure_bounds_queues(self):
+        """Test that a slow sink limits how far the source runs ahead."""
+        produced = []
+
+        def source():
+            for i in range(200):
+                produced.append(i)
+                yield i
+
+        def slow_sink(item):
+            if item == 0:
+                time.sleep(0.2)
+                slow_sink.ahead = len(produced)
+
+        pipeline = Pipeline([Stage("a", _double), Stage("b", _double)], 1, 2)
+        stats = pipeline.run(source(), slow_sink)
+
+        # Two queues of two batches, one batch per thread, plus one in hand.
+        assert slow_sink.ahead <= 12
+        assert all(s.max_queue_depth <= 2 for s in stats)
+        assert all(s.items_out == 200 for s in stats)
+        assert all(s.throughput > 0 for s in stats)
+
+    def test_invalid_arguments(self):
+        """Test that sizes and worker counts are validated."""
+        with pytest.raises(ValueError):
+            Pipeline([], batch_size=0)
+        with pytest.raises(ValueError):
+            Pipeline([Stage("x", str, workers=0)])
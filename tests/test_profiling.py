@@ -0,0 +1,119 @@
+"""Tests for the profiling hooks and their command-line options."""
+
+import logging
+import pstats
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from my_project.main import main
+from my_project.profiling import run_profiled
+
+
+def _workload():
+    return sum(len(str(i)) for i in range(1000)) and 0
+
+
+class TestRunProfiled:
+    """Test suite for run_profiled."""
+
+    def test_pstats_output(self, tmp_path):
+        """Test that a loadable pstats file is written."""
+        out = tmp_path / "run.pstats"
+        assert run_profiled(_workload, profile_path=str(out)) == 0
+
+        stats = pstats.Stats(str(out))
+        assert any(func[2] == "_workload" for func in stats.stats)
+
+    def test_collapsed_output(self, tmp_path):
+        """Test the collapsed-stack output format."""
+        out = tmp_path / "run.folded"
+        run_profiled(_workload, profile_path=str(out), profile_format="collapsed")
+
+        lines = out.read_text(encoding="utf-8").splitlines()
+        assert lines
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) >= 0
+            assert 1 <= len(stack.split(";")) <= 2
+        assert any("_workload" in line and ";" in line for line in lines)
+
+    def test_trace_malloc_report(self, caplog):
+        """Test that tracemalloc reports peak memory and top sites."""
+
+        retained = []
+
+        def allocate():
+            retained.extend(bytearray(1024) for _ in range(200))
+            return 0
+
+        with caplog.at_level(logging.INFO):
+            assert run_profiled(allocate, trace_malloc_top=3) == 0
+
+        assert "Peak traced memory" in caplog.text
+        assert "#1 " in caplog.text
+        assert "#4 " not in caplog.text
+
+    def test_exit_status_passed_through(self):
+        """Test that the workload's status is returned unchanged."""
+        assert run_profiled(lambda: 1, trace_malloc_top=1) == 1
+
+    def test_exception_still_writes_profile(self, tmp_path):
+        """Test that the profile is written when the workload raises."""
+        out = tmp_path / "run.pstats"
+
+        def failing():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            run_profiled(failing, profile_path=str(out))
+        assert out.exists()
+
+    def test_unknown_format(self):
+        """Test that an unknown format is rejected."""
+        with pytest.raises(ValueError, match="format"):
+            run_profiled(_workload, profile_path="x", profile_format="svg")
+
+
+class TestProfilingOptions:
+    """Test suite for --profile and --trace-malloc in main."""
+
+    def test_profile_flag(self, tmp_path):
+        """Test that --profile writes a profile and keeps exit status 0."""
+        out = tmp_path / "main.pstats"
+        with patch("sys.argv", ["main.py", "--name", "Alice", "--profile", str(out)]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 0
+
+        stats = pstats.Stats(str(out))
+        assert any(func[2] == "sample_function" for func in stats.stats)
+
+    def test_profile_keeps_error_exit_status(self, tmp_path, caplog):
+        """Test that errors under --profile still exit 1."""
+        out = tmp_path / "main.pstats"
+        with patch("sys.argv", ["main.py", "--name", "", "--profile", str(out)]):
+            with caplog.at_level(logging.ERROR):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+                assert exc_info.value.code == 1
+                assert "Invalid input value" in caplog.text
+        assert out.exists()
+
+    def test_trace_malloc_flag(self, caplog):
+        """Test that --trace-malloc logs a report."""
+        with patch("sys.argv", ["main.py", "--trace-malloc", "2"]):
+            with caplog.at_level(logging.INFO):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+                assert exc_info.value.code == 0
+                assert "Peak traced memory" in caplog.text
+
+    def test_no_flags_does_not_load_profiler(self):
+        """Test that profiling code is not imported without the flags."""
+        sys.modules.pop("my_project.profiling", None)
+        with patch("sys.argv", ["main.py"]):
+            with pytest.raises(SystemExit):
+                main()
+        assert "my_project.profiling" not in sys.modules
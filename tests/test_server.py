@@ -0,0 +1,257 @@
+"""Tests for the asyncio request server."""
+
+import asyncio
+import json
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from my_project.main import main, sample_function
+from my_project.server import MAX_REQUEST_BYTES, RequestServer
+
+
+async def _exchange(reader, writer, requests):
+    """Send pipelined requests and read one response per request."""
+    for request in requests:
+        line = request if isinstance(request, bytes) else json.dumps(request).encode()
+        writer.write(line + b"\n")
+    await writer.drain()
+    return [json.loads(await reader.readline()) for _ in requests]
+
+
+def _run_with_server(scenario, **server_kwargs):
+    """Start a TCP server on a free port, run scenario(server, port), close."""
+
+    async def run():
+        server = RequestServer(**server_kwargs)
+        await server.start(port=0)
+        try:
+            port = server.addresses[0][1]
+            return await asyncio.wait_for(scenario(server, port), timeout=10)
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+class TestRequestServer:
+    """Test suite for RequestServer."""
+
+    def test_greet_and_read(self, tmp_path):
+        """Test greeting and file-read requests over TCP."""
+        test_file = tmp_path / "data.txt"
+        test_file.write_text("Hello, 世界!", encoding="utf-8")
+
+        async def scenario(server, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = await _exchange(
+                reader,
+                writer,
+                [
+                    {"id": 1, "op": "greet", "name": "Alice"},
+                    {"id": 2, "op": "read", "path": str(test_file)},
+                ],
+            )
+            writer.close()
+            return responses
+
+        responses = _run_with_server(scenario, root=str(tmp_path))
+        assert responses == [
+            {"id": 1, "ok": True, "result": sample_function("Alice")},
+            {"id": 2, "ok": True, "result": "Hello, 世界!"},
+        ]
+
+    def test_pipelined_responses_keep_order(self):
+        """Test that many pipelined requests are answered in order."""
+
+        async def scenario(server, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            requests = [{"id": i, "op": "greet", "name": f"n{i}"} for i in range(200)]
+            responses = await _exchange(reader, writer, requests)
+            writer.close()
+            return responses
+
+        responses = _run_with_server(scenario, pipeline_depth=4)
+        assert [r["id"] for r in responses] == list(range(200))
+        assert responses[7]["result"] == sample_function("n7")
+
+    def test_errors_are_reported(self, tmp_path):
+        """Test that bad requests produce error responses, not disconnects."""
+
+        async def scenario(server, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = await _exchange(
+                reader,
+                writer,
+                [
+                    {"id": 1, "op": "greet", "name": "   "},
+                    {"id": 2, "op": "greet", "name": 5},
+                    {"id": 3, "op": "read", "path": str(tmp_path / "missing")},
+                    {"id": 4, "op": "read", "path": str(tmp_path)},
+                    {"id": 5, "op": "launch"},
+                    b"not json",
+                    b"[1, 2]",
+                    {"id": 6, "op": "greet", "name": "Bob"},
+                ],
+            )
+            writer.close()
+            return responses
+
+        responses = _run_with_server(scenario, root=str(tmp_path))
+        types = [r["error"]["type"] if not r["ok"] else None for r in responses]
+        assert types == [
+            "ValueError",
+            "TypeError",
+            "FileNotFoundError",
+            "IsADirectoryError",
+            "ValueError",
+            "JSONDecodeError",
+            "TypeError",
+            None,
+        ]
+        assert "Unknown op" in responses[4]["error"]["message"]
+
+    def test_root_restricts_reads(self, tmp_path):
+        """Test that reads outside the served root are refused."""
+        served = tmp_path / "served"
+        served.mkdir()
+        (served / "ok.txt").write_text("ok", encoding="utf-8")
+        (tmp_path / "secret.txt").write_text("secret", encoding="utf-8")
+
+        async def scenario(server, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = await _exchange(
+                reader,
+                writer,
+                [
+                    {"op": "read", "path": str(served / "ok.txt")},
+                    {"op": "read", "path": str(served / ".." / "secret.txt")},
+                ],
+            )
+            writer.close()
+            return responses
+
+        responses = _run_with_server(scenario, root=str(served))
+        assert responses[0]["result"] == "ok"
+        assert responses[1]["error"]["type"] == "PermissionError"
+
+    def test_reads_are_refused_without_root(self, tmp_path):
+        """Test that a server without a root does not serve files."""
+        test_file = tmp_path / "data.txt"
+        test_file.write_text("data", encoding="utf-8")
+
+        async def scenario(server, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = await _exchange(
+                reader, writer, [{"op": "read", "path": str(test_file)}]
+            )
+            writer.close()
+            return responses
+
+        responses = _run_with_server(scenario)
+        assert responses[0]["error"]["type"] == "PermissionError"
+
+    def test_relative_paths_resolve_under_root(self, tmp_path):
+        """Test that relative paths are read from the root, not the cwd."""
+        (tmp_path / "data.txt").write_text("data", encoding="utf-8")
+
+        async def scenario(server, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = await _exchange(
+                reader,
+                writer,
+                [
+                    {"op": "read", "path": "data.txt"},
+                    {"op": "read", "path": "../data.txt"},
+                ],
+            )
+            writer.close()
+            return responses
+
+        responses = _run_with_server(scenario, root=str(tmp_path))
+        assert responses[0]["result"] == "data"
+        assert responses[1]["error"]["type"] == "PermissionError"
+
+    def test_connection_limit(self):
+        """Test that connections over the limit get ServerBusy."""
+
+        async def scenario(server, port):
+            first = await asyncio.open_connection("127.0.0.1", port)
+            await _exchange(*first, [{"op": "greet", "name": "a"}])
+            assert server.active_connections == 1
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            busy = json.loads(await reader.readline())
+            assert await reader.read() == b""
+            writer.close()
+            first[1].close()
+            return busy
+
+        busy = _run_with_server(scenario, max_connections=1)
+        assert busy["error"]["type"] == "ServerBusy"
+
+    def test_oversized_request(self):
+        """Test that an oversized request line gets an error and a close."""
+
+        async def scenario(server, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"x" * (MAX_REQUEST_BYTES + 10) + b"\n")
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            writer.close()
+            return response
+
+        response = _run_with_server(scenario)
+        assert "exceeds" in response["error"]["message"]
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets only")
+    def test_unix_socket(self, tmp_path):
+        """Test serving over a Unix socket."""
+        socket_path = str(tmp_path / "server.sock")
+
+        async def run():
+            server = RequestServer()
+            await server.start(unix_path=socket_path)
+            try:
+                reader, writer = await asyncio.open_unix_connection(socket_path)
+                responses = await _exchange(
+                    reader, writer, [{"op": "greet", "name": "Unix"}]
+                )
+                writer.close()
+                return responses
+            finally:
+                await server.close()
+
+        responses = asyncio.run(asyncio.wait_for(run(), timeout=10))
+        assert responses[0]["result"] == sample_function("Unix")
+
+    def test_invalid_limits(self):
+        """Test that non-positive limits raise ValueError."""
+        with pytest.raises(ValueError, match="max_connections"):
+            RequestServer(max_connections=0)
+        with pytest.raises(ValueError, match="pipeline_depth"):
+            RequestServer(pipeline_depth=0)
+
+    def test_serve_forever_requires_start(self):
+        """Test that serve_forever refuses to run before start."""
+        with pytest.raises(RuntimeError, match="not been started"):
+            asyncio.run(RequestServer().serve_forever())
+
+
+class TestServeCommand:
+    """Test suite for the serve subcommand."""
+
+    def test_serve_command_runs_server(self):
+        """Test that main passes serve options through and exits 0."""
+        argv = ["main.py", "serve", "--port", "0", "--max-connections", "2"]
+        with patch("sys.argv", argv):
+            with patch("my_project.server.serve", new_callable=AsyncMock) as mock_serve:
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+                assert exc_info.value.code == 0
+
+        kwargs = mock_serve.call_args.kwargs
+        assert kwargs["port"] == 0
+        assert kwargs["max_connections"] == 2
+        assert kwargs["unix_path"] is None